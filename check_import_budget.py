@@ -0,0 +1,84 @@
+"""
+Kiểm tra thời gian khởi động của các CLI không cần browser (chặn regression import nặng)
+
+Ví dụ sử dụng:
+  python check_import_budget.py               # Kiểm tra với IMPORT_TIME_BUDGET_MS
+  python check_import_budget.py --budget 500  # Budget tùy chỉnh (ms)
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from config.settings import IMPORT_TIME_BUDGET_MS, IMPORT_FORBIDDEN_MODULES
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Các lệnh không được phép import selenium/webdriver_manager/psutil/PIL
+COMMANDS = [
+    ["run_single_test.py", "--list"],
+    ["run_single_test.py", "--help"],
+    ["run_all_tests.py", "--help"],
+    ["run_bva_complete.py", "--help"]
+]
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(command):
+    """
+    Chạy lệnh với `python -X importtime` và đọc thời gian import
+    
+    Args:
+        command: Script và arguments
+    
+    Returns:
+        dict: command, total_ms (tổng self time), modules (tên module top-level đã import), returncode
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *command],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, encoding="utf-8", errors="replace"
+    )
+    total_us = 0
+    modules = set()
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            total_us += int(match.group(1))
+            modules.add(match.group(4).split(".")[0])
+    return {
+        "command": " ".join(command),
+        "total_ms": round(total_us / 1000, 1),
+        "modules": modules,
+        "returncode": completed.returncode
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Kiểm tra import-time budget của các CLI')
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=IMPORT_TIME_BUDGET_MS,
+        help=f'Thời gian import tối đa (ms, mặc định: {IMPORT_TIME_BUDGET_MS})'
+    )
+    args = parser.parse_args()
+    
+    failures = 0
+    for command in COMMANDS:
+        result = measure(command)
+        forbidden = sorted(module for module in IMPORT_FORBIDDEN_MODULES if module in result["modules"])
+        ok = result["returncode"] == 0 and not forbidden and result["total_ms"] <= args.budget
+        
+        icon = "✅" if ok else "❌"
+        print(f"{icon} {result['command']}: {result['total_ms']:.1f}ms imports (budget {args.budget:.0f}ms)")
+        if forbidden:
+            print(f"   Forbidden modules imported: {', '.join(forbidden)}")
+        if result["returncode"] != 0:
+            print(f"   Command exited with code {result['returncode']}")
+        failures += 0 if ok else 1
+    
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
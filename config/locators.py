@@ -124,6 +124,38 @@ class ProductPageLocators:
         "div[class*='success']"
     ]
     
+    # Alert / notification / toast
+    ALERT_MESSAGE = [
+        ".alert",
+        ".notification",
+        ".message",
+        "[role='alert']",
+        ".toast"
+    ]
+    
+    # Badge số lượng trong giỏ hàng
+    CART_INDICATOR = [
+        ".cart-count",
+        ".cart-total",
+        "[class*='cart-count']",
+        "[class*='cart_count']",
+        "[class*='cart_qty']"
+    ]
+    
+    # Các vùng đọc trong một lần snapshot sau action (TestHelpers.snapshot_state)
+    STATE_SNAPSHOT = {
+        "quantity": QUANTITY_INPUT,
+        "errors": ERROR_MESSAGE,
+        "alerts": ALERT_MESSAGE,
+        "cart": CART_INDICATOR
+    }
+    
+    # Điều kiện sẵn sàng: quantity input và button "Thêm vào giỏ hàng" có thể thao tác
+    PRODUCT_FORM_READY = {
+        "quantity_input": QUANTITY_INPUT,
+        "add_to_cart_button": ADD_TO_CART_BUTTON
+    }
+    
     # Container chứa form quantity
     QUANTITY_CONTAINER = [
         ".styles_qty_pd_box__JONgL",
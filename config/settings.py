@@ -7,33 +7,135 @@ Date: 2025-08-20
 import os
 from datetime import datetime
 
+# Target: live (trang production) hoặc local (stand-in server chạy trên máy)
+TARGET_ENV = os.environ.get("QA_TARGET", "live")
+LOCAL_SERVER_HOST = "127.0.0.1"
+LOCAL_SERVER_PORT = int(os.environ.get("QA_LOCAL_PORT", "8765"))
+LOCAL_SERVER_LATENCY_MS = int(os.environ.get("QA_LOCAL_LATENCY_MS", "0"))
+
 # URLs
-BASE_URL = "https://atd.ueh.edu.vn"
-PRODUCT_URL = "https://atd.ueh.edu.vn/business-analyst-in-practices-p16.html"
+PRODUCT_PATH = "/business-analyst-in-practices-p16.html"
+if TARGET_ENV == "local":
+    BASE_URL = f"http://{LOCAL_SERVER_HOST}:{LOCAL_SERVER_PORT}"
+else:
+    BASE_URL = "https://atd.ueh.edu.vn"
+PRODUCT_URL = f"{BASE_URL}{PRODUCT_PATH}"
 
-# Timeouts (seconds)
-IMPLICIT_WAIT = 10
+# Timeouts (seconds) - mọi chờ đợi đi qua utils/wait_policy.py
+IMPLICIT_WAIT = 0  # Tắt implicit wait để không cộng dồn với explicit wait
 EXPLICIT_WAIT = 15
 PAGE_LOAD_TIMEOUT = 30
+PAGE_LOAD_STRATEGY = "eager"  # normal, eager, none - eager/none không chờ tài nguyên bên thứ ba
+LOOKUP_TIMEOUT = 10     # Tìm element
+CLICKABLE_TIMEOUT = 5   # Chờ element có thể click
+
+TEST_DEADLINE = int(os.environ.get("QA_TEST_DEADLINE", "180"))  # Thời gian tối đa cho một test case, mọi wait dùng chung
+
+# Wait polling: interval ban đầu, hệ số backoff và interval tối đa (seconds)
+WAIT_POLL_INTERVAL = 0.1
+WAIT_BACKOFF = 1.5
+WAIT_MAX_POLL_INTERVAL = 1.0
+
+# Chờ theo điều kiện thay cho sleep cố định
+STATE_TIMEOUT = 3  # Chờ trạng thái mong đợi khi đọc snapshot sau action
+ABSENT_WINDOW = 3  # Kiểm tra "không xuất hiện": chờ tối đa khoảng này, dừng sớm khi trang đã ổn định
+SETTLE_TIMEOUT = 10  # Chờ trang ổn định sau action (request xong + DOM yên lặng)
+SETTLE_QUIET_WINDOW = 0.3  # DOM không đổi trong khoảng này (seconds) thì coi là đã ổn định
+ADD_TO_CART_REQUEST_PATTERN = "cart"  # Request add to cart: URL chứa chuỗi này
+QUANTITY_INPUT_METHOD = "native"  # native: set value một roundtrip qua native setter; keyboard: gõ phím như người dùng
+OBSERVATION_PAUSE = float(os.environ.get("QA_OBSERVATION_PAUSE", "0"))  # Pause để quan sát trước khi đóng browser
 
 # Browser settings
 BROWSER = "chrome"  # chrome, firefox, edge
 HEADLESS = True    # True để chạy không hiển thị browser
 WINDOW_SIZE = "1920,1080"
 
+# Driver pool settings (tái sử dụng browser giữa các test cases)
+DRIVER_POOL_ENABLED = True
+DRIVER_POOL_SIZE = 2        # Số session tối đa được giữ trong pool
+DRIVER_POOL_MAX_USES = 10   # Recycle session sau N lần sử dụng
+DRIVER_POOL_LEASE_TIMEOUT = 120
+DRIVER_POOL_VERIFY_CART = True  # Mở PRODUCT_URL sau reset, chỉ trả session về pool khi giỏ hàng trống
+
+# ChromeDriver resolution (cache offline, không cần network sau lần đầu)
+DRIVER_CACHE_DIR = ".cache/drivers"
+DRIVER_MANIFEST_FILE = f"{DRIVER_CACHE_DIR}/manifest.json"
+CHROMEDRIVER_VERSION = None  # Pin version, ví dụ "120.0.6099.109"; None = khớp với Chrome đã cài
+CHROME_BINARY = None         # None = tự tìm Chrome trên máy
+
+# Resource policy: chặn tài nguyên không cần cho các kiểm tra quantity/category (CDP Network.setBlockedURLs)
+RESOURCE_POLICY = "product_checks"  # None hoặc "full" để load đầy đủ
+RESOURCE_POLICIES = {
+    "full": {
+        "block_types": [],
+        "block_patterns": []
+    },
+    "product_checks": {
+        "block_types": ["image", "font", "media"],
+        "block_patterns": [
+            "*google-analytics.com*",
+            "*googletagmanager.com*",
+            "*connect.facebook.net*",
+            "*facebook.com/tr*",
+            "*doubleclick.net*",
+            "*hotjar.com*",
+            "*tiktok.com*",
+            "*zalo.me*"
+        ]
+    }
+}
+RESOURCE_BASELINE_FILE = ".cache/resource_baseline.json"
+
+# Network mode: live, record (ghi response vào archive), replay (trả response từ archive qua CDP Fetch)
+NETWORK_MODE = os.environ.get("QA_NETWORK_MODE", "live")
+NETWORK_ARCHIVE_FILE = "performance/network_archive/product_page.json"
+REPLAY_LATENCY_MS = int(os.environ.get("QA_REPLAY_LATENCY_MS", "0"))
+REPLAY_UNMATCHED = "fail"  # fail: request không có trong archive bị chặn (offline); passthrough: gửi ra network
+
+# Locator cache: nhớ selector thắng cho từng locator list theo page fingerprint
+LOCATOR_CACHE_ENABLED = True
+LOCATOR_CACHE_FILE = ".cache/locator_cache.json"
+RESULT_CACHE_FILE = ".cache/result_cache.json"
+RESULT_CACHE_SOURCES = ["config/*.py", "utils/*.py"]  # Glob các file ngoài source test có trong key của result cache (helpers, settings, data, locators)
+RESULT_CACHE_FETCH_TIMEOUT = 10
+
 # Screenshot settings
 SCREENSHOT_ON_FAILURE = True
 SCREENSHOT_DIR = "reports/screenshots"
+SCREENSHOT_MODE = os.environ.get("QA_SCREENSHOT_MODE", "ring")  # "ring": giữ frame trong bộ nhớ, chỉ ghi khi FAILED/ERROR; "always": ghi mọi ảnh
+SCREENSHOT_RING_SIZE = 10  # Số frame gần nhất giữ lại cho mỗi test
+SCREENSHOT_RING_SCALE = 0.5  # Tỉ lệ thu nhỏ frame (CDP Page.captureScreenshot)
+SCREENSHOT_RING_QUALITY = 50  # JPEG quality của frame trong ring buffer
+SCREENSHOT_FORMAT = os.environ.get("QA_SCREENSHOT_FORMAT", "webp")  # "webp" hoặc "jpeg"
+SCREENSHOT_QUALITY = 75
+SCREENSHOT_MAX_WIDTH = 1280
+SCREENSHOT_DEDUP_DISTANCE = 4  # Hamming distance tối đa giữa hai dHash để coi là trùng
+SCREENSHOT_DEDUP_HISTORY = 8  # Số ảnh gần nhất dùng để so trùng
+SCREENSHOT_FLUSH_TIMEOUT = 30
 
 # Test execution settings
 MAX_RETRIES = 2
 RETRY_DELAY = 3
 
+# Test history (dùng để chia shard theo thời gian chạy)
+TEST_HISTORY_DIR = "reports/test_results"
+TEST_HISTORY_RUNS = 5  # Số report gần nhất dùng để ước tính thời gian chạy
+SHARD_DEFAULT_DURATION = 60  # Thời gian ước tính (seconds) cho test chưa có lịch sử
+MERGED_REPORT_DIR = "reports/merged"  # Report gộp từ các shard (không nằm trong lịch sử để tránh đếm hai lần)
+
+# Tên suite trong report (lịch sử được lọc theo suite)
+TEST_SUITE_NAME = "E-Commerce Product Testing - Complete Suite"
+BVA_SUITE_NAME = "E-Commerce Product Testing - Comprehensive BVA"
+
 # Current test info
 CURRENT_USER = "quynh2204"
 TEST_DATE = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-# Create directories if not exist
-os.makedirs("reports/screenshots", exist_ok=True)
-os.makedirs("reports/test_results", exist_ok=True)
-os.makedirs("reports/logs", exist_ok=True)
\ No newline at end of file
+# Import budget cho CLI (check_import_budget.py)
+IMPORT_TIME_BUDGET_MS = 300
+IMPORT_FORBIDDEN_MODULES = ["selenium", "webdriver_manager", "psutil", "PIL"]
+
+def ensure_report_dirs():
+    """Tạo thư mục report khi bắt đầu chạy test (không tạo lúc import settings)"""
+    for directory in (SCREENSHOT_DIR, TEST_HISTORY_DIR, "reports/logs"):
+        os.makedirs(directory, exist_ok=True)
@@ -0,0 +1,95 @@
+"""
+Registry các test case: metadata khai báo, module test chỉ được import khi test được chọn chạy
+"""
+
+import importlib
+
+class TestRegistry:
+    """Danh sách test case dùng chung cho run_all_tests.py và run_single_test.py"""
+    
+    TEST_CASES = [
+        {
+            "id": "TC05",
+            "module": "tests.test_case_05",
+            "function": "run_test_case_05",
+            "description": "Input Validation - Không chọn phân loại",
+            "techniques": "Input Validation, Decision Table",
+            "dynamic_testing": "Input Validation",
+            "input": "Không chọn phân loại đối tượng",
+            "expected": "Hiển thị thông báo lỗi 'Vui lòng chọn một khóa học'"
+        },
+        {
+            "id": "TC06",
+            "module": "tests.test_case_06",
+            "function": "run_test_case_06",
+            "description": "Boundary Value Analysis - Số lượng = 0",
+            "techniques": "Boundary Value Analysis, Validation Testing",
+            "dynamic_testing": "Boundary Condition Testing",
+            "input": "Số lượng = 0",
+            "expected": "Không thêm khóa học vào giỏ hàng, số lượng reset về 1"
+        },
+        {
+            "id": "TC07",
+            "module": "tests.test_case_07",
+            "function": "run_test_case_07",
+            "description": "Error Handling - Số lượng = -1",
+            "techniques": "Equivalence Partitioning, Error Guessing",
+            "dynamic_testing": "Error Handling",
+            "input": "Số lượng = -1",
+            "expected": "Không cho phép nhập số âm, số lượng reset về 1"
+        },
+        {
+            "id": "TC08",
+            "module": "tests.test_case_08",
+            "function": "run_test_case_08",
+            "description": "Input Validation - Nhập chữ 'e'",
+            "techniques": "Equivalence Partitioning, Error Guessing",
+            "dynamic_testing": "Input Validation",
+            "input": "Số lượng = 'e'",
+            "expected": "Hiển thị lỗi 'Hãy nhập số hợp lệ', không thêm sản phẩm vào giỏ hàng"
+        },
+        {
+            "id": "TC09",
+            "module": "tests.test_case_09",
+            "function": "run_test_case_09",
+            "description": "Stress Testing - Số lượng = 999999",
+            "techniques": "Boundary Value Analysis, Stress/Load Testing",
+            "dynamic_testing": "Stress/Load Testing",
+            "input": "Số lượng = 999999",
+            "expected": "Hiển thị thông báo 'Số lượng không hợp lệ', không thêm khóa học"
+        },
+        {
+            "id": "TC10",
+            "module": "tests.test_case_10",
+            "function": "run_test_case_10",
+            "description": "Error Handling - Ký tự đặc biệt '!@#'",
+            "techniques": "Equivalence Partitioning, Error Guessing",
+            "dynamic_testing": "Error Handling",
+            "input": "Số lượng = !@#",
+            "expected": "Hiển thị lỗi 'Hãy nhập số hợp lệ', không thêm sản phẩm vào giỏ hàng"
+        }
+    ]
+    
+    @staticmethod
+    def all():
+        """
+        Metadata của tất cả test case (bản sao, theo thứ tự mặc định)
+        
+        Returns:
+            list: Dict id, module, function, description, techniques, dynamic_testing, input, expected
+        """
+        return [dict(test_case) for test_case in TestRegistry.TEST_CASES]
+    
+    @staticmethod
+    def load(test_case):
+        """
+        Import module của test case (lần đầu được chọn chạy) và trả về entry point
+        
+        Args:
+            test_case: Metadata từ all()
+        
+        Returns:
+            callable: Hàm run_test_case_XX
+        """
+        module = importlib.import_module(test_case["module"])
+        return getattr(module, test_case["function"])
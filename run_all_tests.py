@@ -9,23 +9,45 @@ from datetime import datetime
 import json
 import os
 import sys
+import argparse
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import CURRENT_USER, TEST_DATE
-from utils.error_handlers import ErrorHandlers
+from config.settings import (CURRENT_USER, TEST_DATE, TARGET_ENV, PRODUCT_URL, TEST_DEADLINE, TEST_HISTORY_DIR,
+                             MERGED_REPORT_DIR, TEST_SUITE_NAME, ensure_report_dirs)
+from config.test_registry import TestRegistry
+from utils.test_history import TestHistory
+from utils.test_scheduler import TestScheduler
+# Các module cần browser (selenium, PIL, psutil) chỉ được import trong hàm chạy test,
+# để --help, --merge và lập kế hoạch shard không phải trả chi phí import đó
 
-# Import all test cases
-from tests.test_case_05 import run_test_case_05
-from tests.test_case_06 import run_test_case_06  
-from tests.test_case_07 import run_test_case_07
-from tests.test_case_08 import run_test_case_08
-from tests.test_case_09 import run_test_case_09
-from tests.test_case_10 import run_test_case_10
 
-def run_all_tests():
-    """Chạy tất cả test cases và tạo báo cáo"""
+def run_all_tests(pipeline=False, workers=1, shard=None, order="default", cache=False, refresh_cache=False,
+                  durations=None):
+    """
+    Chạy tất cả test cases và tạo báo cáo
+    
+    Args:
+        pipeline: Khởi động browser cho test kế tiếp trong lúc test hiện tại đang chạy
+        workers: Số test case chạy song song (mỗi test một WebDriver), 1 để chạy tuần tự
+        shard: Chỉ chạy phần việc của shard "i/n"
+        order: Thứ tự chạy: "default", "lpt" (dài nhất trước) hoặc "failures-first"
+        cache: Bỏ qua test đã PASSED khi source, test data, locators và trang đích không đổi
+        refresh_cache: Chạy lại tất cả và ghi đè result cache
+        durations: Thời gian chạy dùng chung cho mọi shard (đọc từ --history); None thì
+                   chia shard theo vị trí và sắp xếp theo lịch sử local
+    """
+    from utils.error_handlers import ErrorHandlers
+    from utils.driver_resolver import DriverResolver
+    from utils.driver_manager import DriverManager
+    from utils.locator_cache import LocatorCache
+    from utils.result_cache import ResultCache
+    from utils.screenshot_pipeline import ScreenshotPipeline
+    from utils.stand_in_server import StandInServer
+    from utils.parallel_runner import ParallelRunner
+    
+    ensure_report_dirs()
     
     # Setup logging
     log_file = ErrorHandlers.setup_logging()
@@ -35,135 +57,74 @@ def run_all_tests():
     print("=" * 80)
     print(f"User: {CURRENT_USER}")
     print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Target: {PRODUCT_URL}")
+    if StandInServer.ensure_started():
+        print("🏠 Local stand-in server started (QA_TARGET=local)")
+    if pipeline and workers > 1:
+        print("⚠️ Pipeline mode is ignored when running with multiple workers")
+        pipeline = False
+    if pipeline:
+        print("⚡ Pipeline mode: next browser is prespawned while the current test runs")
     print("=" * 80)
     
-    test_cases = [
-        {
-            "id": "TC05", 
-            "function": run_test_case_05, 
-            "description": "Input Validation - Không chọn phân loại",
-            "techniques": "Input Validation, Decision Table",
-            "dynamic_testing": "Input Validation",
-            "input": "Không chọn phân loại đối tượng",
-            "expected": "Hiển thị thông báo lỗi 'Vui lòng chọn một khóa học'"
-        },
-        {
-            "id": "TC06", 
-            "function": run_test_case_06, 
-            "description": "Boundary Value Analysis - Số lượng = 0",
-            "techniques": "Boundary Value Analysis, Validation Testing",
-            "dynamic_testing": "Boundary Condition Testing",
-            "input": "Số lượng = 0",
-            "expected": "Không thêm khóa học vào giỏ hàng, số lượng reset về 1"
-        },
-        {
-            "id": "TC07", 
-            "function": run_test_case_07, 
-            "description": "Error Handling - Số lượng = -1",
-            "techniques": "Equivalence Partitioning, Error Guessing",
-            "dynamic_testing": "Error Handling",
-            "input": "Số lượng = -1",
-            "expected": "Không cho phép nhập số âm, số lượng reset về 1"
-        },
-        {
-            "id": "TC08", 
-            "function": run_test_case_08, 
-            "description": "Input Validation - Nhập chữ 'e'",
-            "techniques": "Equivalence Partitioning, Error Guessing",
-            "dynamic_testing": "Input Validation",
-            "input": "Số lượng = 'e'",
-            "expected": "Hiển thị lỗi 'Hãy nhập số hợp lệ', không thêm sản phẩm vào giỏ hàng"
-        },
-        {
-            "id": "TC09", 
-            "function": run_test_case_09, 
-            "description": "Stress Testing - Số lượng = 999999",
-            "techniques": "Boundary Value Analysis, Stress/Load Testing",
-            "dynamic_testing": "Stress/Load Testing",
-            "input": "Số lượng = 999999",
-            "expected": "Hiển thị thông báo 'Số lượng không hợp lệ', không thêm khóa học"
-        },
-        {
-            "id": "TC10", 
-            "function": run_test_case_10, 
-            "description": "Error Handling - Ký tự đặc biệt '!@#'",
-            "techniques": "Equivalence Partitioning, Error Guessing",
-            "dynamic_testing": "Error Handling",
-            "input": "Số lượng = !@#",
-            "expected": "Hiển thị lỗi 'Hãy nhập số hợp lệ', không thêm sản phẩm vào giỏ hàng"
-        }
-    ]
+    test_cases = TestRegistry.all()
+    
+    if shard:
+        test_cases, shard_loads = TestScheduler.select_shard(test_cases, shard, durations=durations)
+        shard_index = TestScheduler.parse_shard(shard)[0]
+        print(f"🧩 Shard {shard}: {', '.join(test_case['id'] for test_case in test_cases) or 'no tests'}"
+              f" (expected {shard_loads[shard_index - 1]:.0f}s, all shards: {shard_loads})")
+    
+    test_cases = TestScheduler.order(test_cases, order, durations=durations, test_suite=TEST_SUITE_NAME)
+    expected_makespan = TestScheduler.expected_makespan(test_cases, workers, durations=durations, test_suite=TEST_SUITE_NAME)
+    print(f"📅 Order ({order}): {' → '.join(test_case['id'] for test_case in test_cases)}, expected makespan {expected_makespan:.0f}s")
     
-    results = []
-    passed = 0
-    failed = 0
-    errors = 0
-    total_execution_time = 0
+    page_fingerprint = None
+    if cache or refresh_cache:
+        page_fingerprint = ResultCache.page_fingerprint(PRODUCT_URL)
+        if page_fingerprint:
+            print(f"♻️ Result cache {'refresh' if refresh_cache else 'enabled'} (page {page_fingerprint[:20]})")
+    
+    def run_one(test_case):
+        return execute_test_case(test_case, page_fingerprint, use_cache=cache and not refresh_cache)
     
     suite_start_time = time.time()
     
-    for test_case in test_cases:
-        print(f"\n{'='*25} {test_case['id']} {'='*25}")
-        print(f"📋 Description: {test_case['description']}")
-        print(f"🔧 Techniques: {test_case['techniques']}")
-        print(f"⚡ Dynamic Testing: {test_case['dynamic_testing']}")
-        print(f"📥 Input: {test_case['input']}")
-        print(f"📤 Expected: {test_case['expected']}")
-        print("-" * 70)
-        
-        start_time = time.time()
-        
-        try:
-            result = test_case['function']()
-            execution_time = time.time() - start_time
-            total_execution_time += execution_time
-            
-            # Enrich result with test case metadata
-            result['test_id'] = test_case['id']
-            result['description'] = test_case['description']
-            result['techniques'] = test_case['techniques']
-            result['dynamic_testing'] = test_case['dynamic_testing']
-            result['input'] = test_case['input']
-            result['expected'] = test_case['expected']
-            result['execution_time'] = round(execution_time, 2)
-            result['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            results.append(result)
-            
-            if result['status'] == 'PASSED':
-                passed += 1
-                print(f"✅ {test_case['id']}: PASSED ({execution_time:.2f}s)")
-            elif result['status'] == 'FAILED':
-                failed += 1
-                print(f"❌ {test_case['id']}: FAILED ({execution_time:.2f}s)")
-            else:
-                errors += 1
-                print(f"💥 {test_case['id']}: ERROR ({execution_time:.2f}s)")
-                
-        except Exception as e:
-            execution_time = time.time() - start_time
-            total_execution_time += execution_time
-            error_result = {
-                'test_id': test_case['id'],
-                'description': test_case['description'],
-                'techniques': test_case['techniques'],
-                'dynamic_testing': test_case['dynamic_testing'],
-                'input': test_case['input'],
-                'expected': test_case['expected'],
-                'status': 'ERROR',
-                'message': f'Exception during execution: {str(e)}',
-                'execution_time': round(execution_time, 2),
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            results.append(error_result)
-            errors += 1
-            print(f"💥 {test_case['id']}: ERROR - {str(e)} ({execution_time:.2f}s)")
+    if workers > 1:
+        print(f"🧵 Running {len(test_cases)} test cases on {workers} workers")
+        DriverManager.reserve_sessions(workers)
+        results = ParallelRunner.run(test_cases, run_one, workers)
+    else:
+        results = []
+        for index, test_case in enumerate(test_cases):
+            if pipeline:
+                DriverManager.plan_prespawn(1 if index < len(test_cases) - 1 else 0)
+            results.append(run_one(test_case))
+    
+    passed = sum(1 for result in results if result['status'] == 'PASSED')
+    failed = sum(1 for result in results if result['status'] == 'FAILED')
+    errors = len(results) - passed - failed
+    total_execution_time = sum(result['execution_time'] for result in results)
+    total_hidden_launch = sum(result['metrics'].get('driver_launch', {}).get('hidden_seconds', 0.0) for result in results)
+    schedule = {
+        'order': order,
+        'workers': workers,
+        'expected_makespan': expected_makespan,
+        'actual_makespan': round(time.time() - suite_start_time, 2)
+    }
+    
+    if pipeline:
+        DriverManager.discard_prespawned()
+    LocatorCache.save()
+    ResultCache.save()
+    # Ảnh chụp được encode nền: chờ xong để path có trong report
+    ScreenshotPipeline.flush()
     
     suite_end_time = time.time()
     suite_duration = suite_end_time - suite_start_time
     
     # Tạo báo cáo
-    report_files = generate_test_report(results, passed, failed, errors, suite_duration)
+    report_files = generate_test_report(results, passed, failed, errors, suite_duration, shard=shard, schedule=schedule)
     
     print("\n" + "=" * 80)
     print("🏁 TEST SUITE COMPLETED")
@@ -173,9 +134,21 @@ def run_all_tests():
     print(f"   ❌ Failed: {failed}")
     print(f"   💥 Errors: {errors}")
     print(f"   📈 Total: {len(results)}")
-    print(f"   🎯 Pass Rate: {round((passed / len(results)) * 100, 2)}%" if results else "0%")
+    print(f"   🎯 Pass Rate: {round((passed / len(results)) * 100, 2)}%" if results else "   🎯 Pass Rate: 100% (no tests to run)")
     print(f"   ⏱️ Total Execution Time: {suite_duration:.2f} seconds")
     print(f"   ⏱️ Average Test Time: {total_execution_time/len(results):.2f} seconds" if results else "N/A")
+    print(f"   📅 Makespan ({schedule['order']}, {workers} workers): expected {schedule['expected_makespan']:.2f}s, actual {schedule['actual_makespan']:.2f}s")
+    if pipeline:
+        print(f"   ⚡ Browser Launch Latency Hidden: {total_hidden_launch:.2f} seconds")
+    driver_stats = DriverResolver.get_summary()
+    print(f"   🚗 ChromeDriver cache: {driver_stats['cache_hits']} hits, {driver_stats['cache_misses']} misses, saved {driver_stats['saved_seconds']}s")
+    locator_stats = LocatorCache.stats
+    print(f"   🎯 Locator cache: {locator_stats['hits']} hits, {locator_stats['misses']} misses, {locator_stats['invalidated']} invalidated")
+    if page_fingerprint:
+        result_stats = ResultCache.stats
+        print(f"   ♻️ Result cache: {result_stats['hits']} hits, {result_stats['misses']} misses, {result_stats['stored']} stored")
+    shot_stats = ScreenshotPipeline.stats
+    print(f"   📸 Screenshots: {shot_stats['written']} written ({shot_stats['bytes_written'] // 1024} KB), {shot_stats['duplicates']} duplicates skipped, {shot_stats['frames_discarded']} frames of passing tests discarded")
     print(f"📄 Reports Generated:")
     for report_file in report_files:
         print(f"   📋 {report_file}")
@@ -184,15 +157,192 @@ def run_all_tests():
     
     return results
 
-def generate_test_report(results, passed, failed, errors, suite_duration):
-    """Tạo báo cáo test dạng JSON, HTML và CSV"""
+def execute_test_case(test_case, page_fingerprint=None, use_cache=False):
+    """
+    Chạy một test case với metrics, deadline và screenshot ring buffer riêng
+    
+    Args:
+        test_case: Metadata test case từ TestRegistry
+        page_fingerprint: Fingerprint trang đích; có giá trị thì kết quả PASSED được lưu vào result cache
+        use_cache: Trả kết quả đã lưu nếu key còn khớp thay vì chạy test
+    
+    Returns:
+        dict: Kết quả test đã gắn metadata, metrics và deadline
+    """
+    from utils.driver_manager import DriverManager
+    from utils.run_metrics import RunMetrics
+    from utils.deadline import Deadline
+    from utils.result_cache import ResultCache
+    from utils.screenshot_pipeline import ScreenshotPipeline
+    from utils.wait_policy import WaitPolicy
+    
+    print(f"\n{'='*25} {test_case['id']} {'='*25}")
+    print(f"📋 Description: {test_case['description']}")
+    print(f"🔧 Techniques: {test_case['techniques']}")
+    print(f"⚡ Dynamic Testing: {test_case['dynamic_testing']}")
+    print(f"📥 Input: {test_case['input']}")
+    print(f"📤 Expected: {test_case['expected']}")
+    print("-" * 70)
+    
+    if page_fingerprint and use_cache:
+        cached = ResultCache.lookup(test_case, page_fingerprint)
+        if cached:
+            print(f"♻️ {test_case['id']}: PASSED (cached from {cached['cached_at']}, unchanged since)")
+            return cached
+    
+    start_time = time.time()
+    RunMetrics.begin(test_case['id'])
+    Deadline.begin(test_case['id'], TEST_DEADLINE)
+    DriverManager.begin_test()
+    
+    try:
+        # Module test chỉ được import khi test được chạy
+        result = TestRegistry.load(test_case)()
+        execution_time = time.time() - start_time
+        # Session hỏng (test bắt exception và trả ERROR) thì không trả lại pool
+        DriverManager.end_test(crashed=result.get('status') == 'ERROR'
+                               and DriverManager.is_session_error(result.get('message')))
+        
+        # Enrich result with test case metadata
+        result['test_id'] = test_case['id']
+        result['description'] = test_case['description']
+        result['techniques'] = test_case['techniques']
+        result['dynamic_testing'] = test_case['dynamic_testing']
+        result['input'] = test_case['input']
+        result['expected'] = test_case['expected']
+        result['execution_time'] = round(execution_time, 2)
+        result['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        result['metrics'] = WaitPolicy.summarize(RunMetrics.end(), execution_time)
+        result['deadline'] = Deadline.end()
+        
+        if result['deadline']['expired']:
+            # Hết deadline: fail nhanh với bước đã dùng hết thời gian
+            result['status'] = 'ERROR'
+            result['message'] = f"{Deadline.describe(result['deadline'])}. {result.get('message', '')}"
+            print(f"⏰ {Deadline.describe(result['deadline'])}")
+        
+        # Frame trong ring buffer chỉ ghi ra đĩa khi test không PASSED
+        if result['status'] in ('FAILED', 'ERROR'):
+            result['screenshots'] = ScreenshotPipeline.persist_frames(test_case['id'], result['metrics'])
+        else:
+            ScreenshotPipeline.discard_frames()
+        
+        print(f"⏳ Wait: {result['metrics']['wait_seconds']:.2f}s | Sleep: {result['metrics']['sleep_seconds']:.2f}s | Act: {result['metrics']['act_seconds']:.2f}s")
+        for settle in result['metrics'].get('settle', []):
+            print(f"🛒 {settle['label']}: server {settle['server_ms']}ms, render {settle['render_ms']}ms, settled in {settle['elapsed']:.2f}s")
+        
+        hidden_launch = result['metrics'].get('driver_launch', {}).get('hidden_seconds')
+        if hidden_launch is not None:
+            print(f"⚡ Browser launch latency hidden: {hidden_launch:.2f}s")
+        
+        if page_fingerprint:
+            ResultCache.store(test_case, page_fingerprint, result)
+        
+        if result['status'] == 'PASSED':
+            print(f"✅ {test_case['id']}: PASSED ({execution_time:.2f}s)")
+        elif result['status'] == 'FAILED':
+            print(f"❌ {test_case['id']}: FAILED ({execution_time:.2f}s)")
+        else:
+            print(f"💥 {test_case['id']}: ERROR ({execution_time:.2f}s)")
+        return result
+        
+    except Exception as e:
+        execution_time = time.time() - start_time
+        DriverManager.end_test(crashed=DriverManager.is_session_error(e))
+        error_result = {
+            'test_id': test_case['id'],
+            'description': test_case['description'],
+            'techniques': test_case['techniques'],
+            'dynamic_testing': test_case['dynamic_testing'],
+            'input': test_case['input'],
+            'expected': test_case['expected'],
+            'status': 'ERROR',
+            'message': f'Exception during execution: {str(e)}',
+            'execution_time': round(execution_time, 2),
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'metrics': WaitPolicy.summarize(RunMetrics.end(), execution_time),
+            'deadline': Deadline.end()
+        }
+        error_result['screenshots'] = ScreenshotPipeline.persist_frames(test_case['id'], error_result['metrics'])
+        print(f"💥 {test_case['id']}: ERROR - {str(e)} ({execution_time:.2f}s)")
+        return error_result
+
+def summarize_timing(results):
+    """Tổng thời gian chờ, thao tác và sleep có chủ ý (sleep ledger) của các test"""
+    timing = {'wait_seconds': 0.0, 'act_seconds': 0.0, 'deliberate_sleep_seconds': 0.0, 'deliberate_sleeps': {}}
+    
+    for result in results:
+        metrics = result.get('metrics', {})
+        timing['wait_seconds'] += metrics.get('wait_seconds', 0.0)
+        timing['act_seconds'] += metrics.get('act_seconds', 0.0)
+        timing['deliberate_sleep_seconds'] += metrics.get('sleep_seconds', 0.0)
+        for reason, entry in metrics.get('sleep_ledger', {}).items():
+            total = timing['deliberate_sleeps'].setdefault(reason, {'count': 0, 'seconds': 0.0})
+            total['count'] += entry['count']
+            total['seconds'] = round(total['seconds'] + entry['seconds'], 2)
+    
+    for key in ('wait_seconds', 'act_seconds', 'deliberate_sleep_seconds'):
+        timing[key] = round(timing[key], 2)
+    return timing
+
+def merge_reports(report_paths):
+    """
+    Gộp JSON report của các shard thành một báo cáo trong MERGED_REPORT_DIR
+    
+    Report gộp không ghi vào TEST_HISTORY_DIR để kết quả không bị đếm hai lần trong lịch sử.
+    
+    Args:
+        report_paths: Danh sách file JSON report của từng shard
+    
+    Returns:
+        list: Các file báo cáo đã tạo
+    """
+    reports = []
+    for path in report_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            reports.append(json.load(f))
+    if not reports:
+        print("⚠️ No shard reports to merge")
+        return []
+    
+    results = [result for report in reports for result in report['test_results']]
+    passed = sum(1 for result in results if result['status'] == 'PASSED')
+    failed = sum(1 for result in results if result['status'] == 'FAILED')
+    errors = len(results) - passed - failed
+    # Các shard chạy song song: thời gian suite là shard chậm nhất
+    suite_duration = max(report.get('suite_duration', 0) for report in reports)
+    
+    shards = [report.get('metadata', {}).get('shard') for report in reports]
+    print(f"🧩 Merging {len(reports)} reports ({', '.join(shard or 'unsharded' for shard in shards)}), {len(results)} results")
+    report_files = generate_test_report(results, passed, failed, errors, suite_duration,
+                                        test_suite=reports[0].get('test_suite', TEST_SUITE_NAME),
+                                        merged_from=[os.path.basename(path) for path in report_paths],
+                                        report_dir=MERGED_REPORT_DIR)
+    for report_file in report_files:
+        print(f"   📋 {report_file}")
+    return report_files
+
+def generate_test_report(results, passed, failed, errors, suite_duration,
+                         test_suite=TEST_SUITE_NAME, shard=None, merged_from=None,
+                         schedule=None, report_dir=TEST_HISTORY_DIR):
+    """
+    Tạo báo cáo test dạng JSON, HTML và CSV
+    
+    Args:
+        shard: Shard "i/n" đã chạy (thêm vào metadata và tên file)
+        merged_from: Danh sách report shard đã gộp (xem merge_reports)
+        schedule: Thứ tự chạy và makespan dự kiến/thực tế
+        report_dir: Thư mục ghi report (mặc định TEST_HISTORY_DIR)
+    """
+    from utils.driver_resolver import DriverResolver
     
     timestamp = int(time.time())
+    report_name = f"test_report_{timestamp}_shard{shard.replace('/', 'of')}" if shard else f"test_report_{timestamp}"
     report_files = []
     
     # Summary data
     summary_data = {
-        'test_suite': 'E-Commerce Product Testing - Complete Suite',
+        'test_suite': test_suite,
         'user': CURRENT_USER,
         'execution_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'suite_duration': round(suite_duration, 2),
@@ -201,20 +351,31 @@ def generate_test_report(results, passed, failed, errors, suite_duration):
             'passed': passed,
             'failed': failed,
             'errors': errors,
-            'pass_rate': round((passed / len(results)) * 100, 2) if results else 0
+            # Shard không có test nào vẫn là PASSED
+            'pass_rate': round((passed / len(results)) * 100, 2) if results else 100
         },
+        'timing': summarize_timing(results),
         'test_results': results,
         'metadata': {
             'framework': 'Selenium WebDriver',
             'python_version': sys.version,
             'platform': os.name,
             'techniques_used': list(set([r.get('techniques', '') for r in results])),
-            'dynamic_testing_types': list(set([r.get('dynamic_testing', '') for r in results]))
+            'dynamic_testing_types': list(set([r.get('dynamic_testing', '') for r in results])),
+            'driver_resolution': DriverResolver.get_summary(),
+            'target_env': TARGET_ENV,
+            'product_url': PRODUCT_URL
         }
     }
+    if shard:
+        summary_data['metadata']['shard'] = shard
+    if merged_from:
+        summary_data['metadata']['merged_from'] = merged_from
+    if schedule:
+        summary_data['schedule'] = schedule
     
     # 1. JSON Report
-    json_file = f"reports/test_results/test_report_{timestamp}.json"
+    json_file = os.path.join(report_dir, f"{report_name}.json")
     os.makedirs(os.path.dirname(json_file), exist_ok=True)
     
     with open(json_file, 'w', encoding='utf-8') as f:
@@ -224,7 +385,7 @@ def generate_test_report(results, passed, failed, errors, suite_duration):
     
     # 2. HTML Report
     html_report = generate_html_report(summary_data)
-    html_file = f"reports/test_results/test_report_{timestamp}.html"
+    html_file = os.path.join(report_dir, f"{report_name}.html")
     
     with open(html_file, 'w', encoding='utf-8') as f:
         f.write(html_report)
@@ -232,7 +393,7 @@ def generate_test_report(results, passed, failed, errors, suite_duration):
     report_files.append(html_file)
     
     # 3. CSV Report
-    csv_file = generate_csv_report(results, timestamp)
+    csv_file = generate_csv_report(results, report_name, report_dir)
     report_files.append(csv_file)
     
     return report_files
@@ -477,7 +638,7 @@ def generate_html_report(report_data):
                 <p><strong>Framework:</strong> {report_data['metadata']['framework']}</p>
                 <p><strong>Python Version:</strong> {report_data['metadata']['python_version']}</p>
                 <p><strong>Platform:</strong> {report_data['metadata']['platform']}</p>
-                <p><strong>Test URL:</strong> https://atd.ueh.edu.vn/business-analyst-in-practices-p16.html</p>
+                <p><strong>Test URL:</strong> {PRODUCT_URL}</p>
             </div>
         </div>
         
@@ -492,11 +653,11 @@ def generate_html_report(report_data):
     
     return html
 
-def generate_csv_report(results, timestamp):
+def generate_csv_report(results, report_name, report_dir=TEST_HISTORY_DIR):
     """Tạo báo cáo CSV"""
     import csv
     
-    csv_file = f"reports/test_results/test_report_{timestamp}.csv"
+    csv_file = os.path.join(report_dir, f"{report_name}.csv")
     
     with open(csv_file, 'w', newline='', encoding='utf-8') as f:
         fieldnames = [
@@ -522,5 +683,70 @@ def generate_csv_report(results, timestamp):
     
     return csv_file
 
+def main():
+    """Main function với argument parsing"""
+    parser = argparse.ArgumentParser(
+        description='Chạy tất cả test cases cho E-Commerce Product Testing'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Khởi động browser cho test kế tiếp trong background'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Số test case chạy song song, mỗi test một WebDriver (mặc định: 1)'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        help='Chỉ chạy shard i/n (ví dụ 1/3); chia theo --history nếu có, không thì theo vị trí test'
+    )
+    parser.add_argument(
+        '--history',
+        metavar='PATH',
+        help='Lịch sử dùng chung cho mọi shard: thư mục JSON report, một JSON report (ví dụ report gộp) '
+             'hoặc JSON {test_id: seconds}'
+    )
+    parser.add_argument(
+        '--order',
+        choices=TestScheduler.ORDERS,
+        default='default',
+        help='Thứ tự chạy theo lịch sử: lpt = dài nhất trước, failures-first = test lỗi lần trước lên đầu'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Bỏ qua test đã PASSED nếu source test, test data, locators và trang đích không đổi'
+    )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Chạy lại tất cả test và ghi đè result cache'
+    )
+    parser.add_argument(
+        '--merge',
+        nargs='+',
+        metavar='REPORT_JSON',
+        help=f'Gộp JSON report của các shard thành một báo cáo trong {MERGED_REPORT_DIR} rồi thoát'
+    )
+    
+    args = parser.parse_args()
+    if args.merge:
+        merge_reports(args.merge)
+        return
+    durations = None
+    try:
+        if args.shard:
+            TestScheduler.parse_shard(args.shard)
+        if args.history:
+            durations = TestHistory.shared_durations(args.history, test_suite=TEST_SUITE_NAME)
+    except ValueError as e:
+        parser.error(str(e))
+    run_all_tests(pipeline=args.pipeline, workers=max(args.workers, 1), shard=args.shard, order=args.order,
+                  cache=args.cache, refresh_cache=args.refresh_cache, durations=durations)
+
 if __name__ == "__main__":
-    run_all_tests()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -2,24 +2,113 @@
 Script chạy Complete BVA Testing
 """
 
-from tests.test_case_bva_comprehensive import run_comprehensive_bva_test
+import argparse
+import time
+from datetime import datetime
+from config.settings import BVA_SUITE_NAME, ensure_report_dirs
 from config.boundary_value_table import BoundaryValueTable
+from utils.test_history import TestHistory
+from utils.test_scheduler import TestScheduler
+
+def to_report_result(result):
+    """Chuyển kết quả một boundary value sang định dạng của generate_test_report"""
+    return {
+        'test_id': result['test_id'],
+        'description': f"BVA {result['boundary_type']}",
+        'techniques': 'Boundary Value Analysis',
+        'dynamic_testing': 'Boundary Condition Testing',
+        'input': result['input'],
+        'expected': result['expected'],
+        'status': result['status'],
+        'message': result['actual'],
+        'execution_time': result.get('execution_time', 0),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
 
 def main():
+    parser = argparse.ArgumentParser(description='Chạy Complete BVA Testing')
+    parser.add_argument(
+        '--shard',
+        help='Chỉ chạy shard i/n của BVA matrix (ví dụ 1/3); chia theo --history nếu có, không thì theo vị trí'
+    )
+    parser.add_argument(
+        '--history',
+        metavar='PATH',
+        help='Lịch sử dùng chung cho mọi shard: thư mục JSON report, một JSON report (ví dụ report gộp) '
+             'hoặc JSON {test_id: seconds}'
+    )
+    parser.add_argument(
+        '--yes',
+        action='store_true',
+        help='Không chờ Enter trước khi chạy (tự bật khi dùng --shard)'
+    )
+    args = parser.parse_args()
+    
+    test_ids = None
+    if args.shard:
+        try:
+            shard_index = TestScheduler.parse_shard(args.shard)[0]
+            durations = TestHistory.shared_durations(args.history, test_suite=BVA_SUITE_NAME) if args.history else None
+        except ValueError as e:
+            parser.error(str(e))
+        matrix = BoundaryValueTable.get_test_data_matrix()
+        cases = matrix['quantity_valid_boundaries'] + matrix['quantity_invalid_boundaries']
+        selected, shard_loads = TestScheduler.select_shard(cases, args.shard, key=lambda case: case['test_id'],
+                                                           durations=durations)
+        test_ids = [case['test_id'] for case in selected]
+        print(f"🧩 Shard {args.shard}: {', '.join(test_ids) or 'no values'}"
+              f" (expected {shard_loads[shard_index - 1]:.0f}s, all shards: {shard_loads})")
+    
     print("📊 BOUNDARY VALUE ANALYSIS - COMPLETE TESTING")
     print("=" * 60)
     
     # Show BVA table
     BoundaryValueTable.print_bva_table()
     
-    print(f"\nPress Enter to start comprehensive BVA test...")
-    input()
+    if not (args.yes or args.shard):
+        print(f"\nPress Enter to start comprehensive BVA test...")
+        input()
     
-    # Run comprehensive test
-    result = run_comprehensive_bva_test()
+    ensure_report_dirs()
+    start_time = time.time()
+    
+    if test_ids == []:
+        # Shard không có boundary value nào: không cần mở browser, kết quả là PASSED
+        result = {"status": "PASSED", "message": "No boundary values in this shard", "detailed_results": []}
+    else:
+        # Module cần browser chỉ import khi thật sự chạy test (--help không phải trả chi phí này)
+        from tests.test_case_bva_comprehensive import run_comprehensive_bva_test
+        from utils.screenshot_pipeline import ScreenshotPipeline
+        from utils.stand_in_server import StandInServer
+        
+        # Local stand-in server khi QA_TARGET=local
+        StandInServer.ensure_started()
+        
+        # Run comprehensive test
+        result = run_comprehensive_bva_test(test_ids)
+        
+        # Ring buffer: chỉ ghi frame ra đĩa khi FAILED/ERROR
+        if result['status'] in ('FAILED', 'ERROR'):
+            ScreenshotPipeline.persist_frames("BVA")
+        else:
+            ScreenshotPipeline.discard_frames()
+        ScreenshotPipeline.flush()
     
     print(f"\n🎯 FINAL RESULT: {result['status']}")
     print(f"📝 MESSAGE: {result['message']}")
+    
+    if args.shard:
+        # Report của shard, gộp lại bằng: python run_all_tests.py --merge <report shard>...
+        from run_all_tests import generate_test_report
+        results = [to_report_result(item) for item in result.get('detailed_results', [])]
+        passed = sum(1 for item in results if item['status'] == 'PASSED')
+        failed = sum(1 for item in results if item['status'] == 'FAILED')
+        report_files = generate_test_report(results, passed, failed, len(results) - passed - failed,
+                                            time.time() - start_time,
+                                            test_suite=BVA_SUITE_NAME,
+                                            shard=args.shard)
+        for report_file in report_files:
+            print(f"📋 {report_file}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
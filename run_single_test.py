@@ -12,50 +12,11 @@ from datetime import datetime
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import CURRENT_USER
-from utils.error_handlers import ErrorHandlers
-
-# Import all test cases
-from tests.test_case_05 import run_test_case_05
-from tests.test_case_06 import run_test_case_06  
-from tests.test_case_07 import run_test_case_07
-from tests.test_case_08 import run_test_case_08
-from tests.test_case_09 import run_test_case_09
-from tests.test_case_10 import run_test_case_10
+# Chỉ import metadata; module test và selenium được import khi chạy test
+from config.test_registry import TestRegistry
 
 # Test case mapping
-TEST_CASES = {
-    '05': {
-        'function': run_test_case_05,
-        'description': 'Input Validation - Không chọn phân loại',
-        'techniques': 'Input Validation, Decision Table'
-    },
-    '06': {
-        'function': run_test_case_06,
-        'description': 'Boundary Value Analysis - Số lượng = 0',
-        'techniques': 'Boundary Value Analysis, Validation Testing'
-    },
-    '07': {
-        'function': run_test_case_07,
-        'description': 'Error Handling - Số lượng = -1',
-        'techniques': 'Equivalence Partitioning, Error Guessing'
-    },
-    '08': {
-        'function': run_test_case_08,
-        'description': 'Input Validation - Nhập chữ e',
-        'techniques': 'Equivalence Partitioning, Error Guessing'
-    },
-    '09': {
-        'function': run_test_case_09,
-        'description': 'Stress Testing - Số lượng = 999999',
-        'techniques': 'Boundary Value Analysis, Stress/Load Testing'
-    },
-    '10': {
-        'function': run_test_case_10,
-        'description': 'Error Handling - Ký tự đặc biệt',
-        'techniques': 'Equivalence Partitioning, Error Guessing'
-    }
-}
+TEST_CASES = {test_case['id'][2:]: test_case for test_case in TestRegistry.all()}
 
 def list_available_tests():
     """Hiển thị danh sách test cases có sẵn"""
@@ -81,8 +42,19 @@ def run_specific_test(test_id):
             print(f"   TC{tid}")
         return False
     
+    from config.settings import CURRENT_USER, TEST_DEADLINE, ensure_report_dirs
+    from utils.error_handlers import ErrorHandlers
+    from utils.run_metrics import RunMetrics
+    from utils.deadline import Deadline
+    from utils.wait_policy import WaitPolicy
+    from utils.screenshot_pipeline import ScreenshotPipeline
+    from utils.stand_in_server import StandInServer
+    
+    ensure_report_dirs()
+    
     # Setup logging
     log_file = ErrorHandlers.setup_logging()
+    StandInServer.ensure_started()
     
     test_info = TEST_CASES[test_id]
     
@@ -98,9 +70,24 @@ def run_specific_test(test_id):
     
     try:
         start_time = datetime.now()
-        result = test_info['function']()
+        RunMetrics.begin(f"TC{test_id}")
+        Deadline.begin(f"TC{test_id}", TEST_DEADLINE)
+        try:
+            result = TestRegistry.load(test_info)()
+        finally:
+            metrics = RunMetrics.end()
+            deadline = Deadline.end()
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
+        metrics = WaitPolicy.summarize(metrics, duration)
+        if deadline['expired']:
+            result['status'] = 'ERROR'
+            result['message'] = f"{Deadline.describe(deadline)}. {result.get('message', '')}"
+        if result['status'] in ('FAILED', 'ERROR'):
+            ScreenshotPipeline.persist_frames(f"TC{test_id}", metrics)
+        else:
+            ScreenshotPipeline.discard_frames()
+        ScreenshotPipeline.flush()
         
         print("\n" + "=" * 50)
         print("🏁 TEST EXECUTION COMPLETED")
@@ -108,6 +95,12 @@ def run_specific_test(test_id):
         print(f"📊 Result: {result['status']}")
         print(f"📝 Message: {result['message']}")
         print(f"⏱️ Duration: {duration:.2f} seconds")
+        print(f"⏳ Wait: {metrics['wait_seconds']:.2f}s | Sleep: {metrics['sleep_seconds']:.2f}s | Act: {metrics['act_seconds']:.2f}s ({metrics['wait_count']} waits)")
+        resource_stats = metrics.get('resource_policy')
+        if resource_stats:
+            print(f"🚫 Blocked: {resource_stats['requests_blocked']} requests, ~{resource_stats['bytes_avoided'] // 1024} KB avoided")
+        for shot in metrics.get('screenshots', []):
+            print(f"📸 {shot['path']}" + (" (duplicate)" if shot['duplicate'] else f" ({shot['bytes'] // 1024} KB)"))
         print(f"🕐 End time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 50)
         
@@ -22,6 +22,7 @@ from config.locators import ProductPageLocators
 from config.test_data import TestData
 from utils.driver_manager import DriverManager
 from utils.test_helpers import TestHelpers
+from utils.wait_policy import WaitPolicy
 
 class TestCase05:
     """Test Case 5: Input Validation - Không chọn phân loại"""
@@ -35,7 +36,7 @@ class TestCase05:
     def setup(self):
         """Thiết lập test environment"""
         print("🔧 Setting up Test Case #5: Input Validation")
-        self.driver = DriverManager.get_driver()
+        self.driver = DriverManager.acquire_driver()
         self.wait = WebDriverWait(self.driver, EXPLICIT_WAIT)
         
     def teardown(self):
@@ -44,8 +45,8 @@ class TestCase05:
             self.test_helpers.take_screenshot(self.driver, "TC05_final_state")
         
         if self.driver:
-            time.sleep(3)  # Pause để quan sát
-            self.driver.quit()
+            WaitPolicy.sleep(OBSERVATION_PAUSE, "observation pause")
+            DriverManager.release_driver(self.driver)
         print("🧹 Test Case #5 cleanup completed")
         
     def execute_input_validation_test(self):
@@ -60,7 +61,7 @@ class TestCase05:
             
             # Bước 1: Truy cập trang
             self.driver.get(PRODUCT_URL)
-            TestHelpers.wait_for_page_load(self.driver)
+            TestHelpers.wait_until_ready(self.driver, ProductPageLocators.PRODUCT_FORM_READY)
             print(f"✓ Accessed: {PRODUCT_URL}")
             
             # Bước 2: Kiểm tra form validation
@@ -97,6 +98,7 @@ class TestCase05:
             
             # Click button để trigger validation using safe_click
             print("🖱️ Clicking 'Thêm vào giỏ hàng' button...")
+            TestHelpers.arm_settle_tracker(self.driver)
             success = TestHelpers.safe_click(self.driver, add_to_cart_btn, use_javascript=True)
             if not success:
                 return {"status": "FAILED", "message": "Không thể click button sau nhiều lần thử"}
@@ -105,50 +107,28 @@ class TestCase05:
             
             # Bước 4: Kiểm tra validation message
             print("\n🔍 Checking validation result...")
-            time.sleep(3)  # Đợi response
-            
-            # Try multiple approaches to find error message
-            error_found = False
-            actual_message = ""
-            
-            # Approach 1: Standard error selectors
-            error_element = TestHelpers.find_element_by_multiple_selectors(
-                self.driver, self.wait, ProductPageLocators.ERROR_MESSAGE, timeout=8
+            TestHelpers.wait_until_settled(self.driver, "add_to_cart", ADD_TO_CART_REQUEST_PATTERN)  # Đợi response
+            
+            # Đọc error / alert / text mong đợi trong một snapshot
+            expected_message = self.test_data['expected_message']
+            state = TestHelpers.snapshot_state(
+                self.driver,
+                expected_text=expected_message,
+                until=lambda state: state["errors"] or state["alerts"] or state["expected_text"]
             )
+            if state is None:
+                return {"status": "ERROR", "message": "Không đọc được trạng thái trang sau khi click 'Thêm vào giỏ hàng' (snapshot_state thất bại)"}
             
-            if error_element and error_element.is_displayed():
-                actual_message = error_element.text
-                error_found = True
-            else:
-                # Approach 2: Search by expected text content
-                try:
-                    error_element = self.wait.until(
-                        EC.presence_of_element_located((By.XPATH, 
-                            f"//*[contains(text(), '{self.test_data['expected_message']}')]"))
-                    )
-                    if error_element.is_displayed():
-                        actual_message = error_element.text
-                        error_found = True
-                except:
-                    pass
-                
-                # Approach 3: Look for any alert or notification
-                if not error_found:
-                    try:
-                        alert_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                            ".alert, .notification, .message, [role='alert'], .toast")
-                        for alert in alert_elements:
-                            if alert.is_displayed() and alert.text.strip():
-                                actual_message = alert.text
-                                error_found = True
-                                break
-                    except:
-                        pass
+            # Ưu tiên: error selectors, text mong đợi, alert/notification
+            messages = list(state.get("errors", []))
+            if state.get("expected_text"):
+                messages.append(state["expected_text"])
+            messages += state.get("alerts", [])
+            error_found = bool(messages)
+            actual_message = messages[0] if messages else ""
             
             # Evaluate results
             if error_found and actual_message:
-                expected_message = self.test_data['expected_message']
-                
                 print(f"Expected: '{expected_message}'")
                 print(f"Actual: '{actual_message}'")
                 
@@ -166,17 +146,11 @@ class TestCase05:
                     }
             else:
                 # Check if item was actually added to cart (validation failed)
-                try:
-                    # Look for cart update or success indicators
-                    success_indicators = self.driver.find_elements(By.CSS_SELECTOR, 
-                        ".cart-count, .success, [class*='added'], .cart-item")
-                    if success_indicators:
-                        return {
-                            "status": "FAILED",
-                            "message": "Validation không hoạt động - sản phẩm đã được thêm vào giỏ hàng mà không chọn phân loại"
-                        }
-                except:
-                    pass
+                if state.get("cart_count"):
+                    return {
+                        "status": "FAILED",
+                        "message": "Validation không hoạt động - sản phẩm đã được thêm vào giỏ hàng mà không chọn phân loại"
+                    }
                 
                 return {
                     "status": "WARNING", 
@@ -23,6 +23,8 @@ from config.locators import ProductPageLocators
 from config.test_data import TestData
 from utils.driver_manager import DriverManager
 from utils.test_helpers import TestHelpers
+from utils.wait_policy import WaitPolicy
+from utils.action_batch import ActionBatch
 
 class TestCase06:
     """Test Case 6: Boundary Value Analysis - Số lượng = 0"""
@@ -36,7 +38,7 @@ class TestCase06:
     def setup(self):
         """Thiết lập test environment"""
         print("🔧 Setting up Test Case #6: Boundary Value Analysis")
-        self.driver = DriverManager.get_driver()
+        self.driver = DriverManager.acquire_driver()
         self.wait = WebDriverWait(self.driver, EXPLICIT_WAIT)
         
     def teardown(self):
@@ -45,8 +47,8 @@ class TestCase06:
             self.test_helpers.take_screenshot(self.driver, "TC06_final_state")
         
         if self.driver:
-            time.sleep(3)
-            self.driver.quit()
+            WaitPolicy.sleep(OBSERVATION_PAUSE, "observation pause")
+            DriverManager.release_driver(self.driver)
         print("🧹 Test Case #6 cleanup completed")
     
     def execute_boundary_value_analysis(self):
@@ -92,70 +94,41 @@ class TestCase06:
         
         # Bước 1: Truy cập trang
         self.driver.get(PRODUCT_URL)
-        TestHelpers.wait_for_page_load(self.driver)
+        TestHelpers.wait_until_ready(self.driver, ProductPageLocators.PRODUCT_FORM_READY)
         print(f"✓ Accessed: {PRODUCT_URL}")
         
-        # Bước 2: Chọn phân loại (để focus vào quantity testing) - Updated to use new radio button approach
-        print("🔍 Looking for category selection...")
-        category_selected = TestHelpers.select_category_option(self.driver, "khac")
-        
-        if category_selected:
-            print("✓ Đã chọn phân loại đối tượng")
-        else:
-            print("⚠️ Không thể chọn phân loại, tiếp tục test")
-        
-        # Bước 3: Tìm và modify quantity field
-        quantity_input = TestHelpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.QUANTITY_INPUT
-        )
-        
-        if not quantity_input:
-            return {"status": "FAILED", "message": "Không tìm thấy quantity input field"}
-        
-        print(f"✓ Found quantity input field")
-        
-        # Get initial value before modification
-        initial_value = quantity_input.get_attribute("value")
-        print(f"📊 Initial quantity value: {initial_value}")
-        
-        # Sử dụng safe_input_quantity helper với improved error handling
-        print(f"📝 Inputting quantity value: {quantity_value}")
-        input_result = TestHelpers.safe_input_quantity(self.driver, quantity_input, quantity_value)
-        
-        if not input_result["success"]:
-            return {"status": "FAILED", "message": f"Không thể nhập giá trị {quantity_value}: {input_result.get('error', '')}"}
-        
-        print(f"✓ Input result: {input_result['input_value']} → {input_result['final_value']}")
-        
-        # Check if the value was modified by the system (validation)
-        if input_result["was_modified"]:
-            print(f"⚠️ System modified input: {input_result['input_value']} → {input_result['final_value']}")
-        
-        # Bước 4: Click "Thêm vào giỏ hàng" using safe_click
-        add_to_cart_btn = TestHelpers.find_clickable_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.ADD_TO_CART_BUTTON
-        )
-        
-        if not add_to_cart_btn:
-            return {"status": "FAILED", "message": "Không tìm thấy button 'Thêm vào giỏ hàng'"}
-        
-        print("🖱️ Clicking 'Thêm vào giỏ hàng' button...")
-        success = TestHelpers.safe_click(self.driver, add_to_cart_btn, use_javascript=True)
-        if not success:
-            return {"status": "FAILED", "message": "Không thể click button sau nhiều lần thử"}
-        
-        print("✓ Đã click 'Thêm vào giỏ hàng'")
-        
-        # Bước 5: Kiểm tra behavior
-        time.sleep(3)  # Đợi response và DOM updates
-        
-        # Re-find quantity input in case DOM was updated
-        quantity_input_after = TestHelpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.QUANTITY_INPUT
-        )
-        
-        if quantity_input_after:
-            current_value = quantity_input_after.get_attribute("value")
+        # Bước 2-5: Chọn phân loại, nhập quantity, click "Thêm vào giỏ hàng", chờ ổn định và đọc
+        # trạng thái - cả chuỗi chạy trong một roundtrip
+        print(f"📝 Selecting category, inputting quantity {quantity_value} and adding to cart...")
+        batch = (ActionBatch(self.driver)
+                 .click([ProductPageLocators.CATEGORY_LABELS["khac"]] + ProductPageLocators.CATEGORY_SELECTION[2:5],
+                        name="select_category", optional=True)
+                 .set_value(ProductPageLocators.QUANTITY_INPUT, quantity_value, name="quantity")
+                 .click(ProductPageLocators.ADD_TO_CART_BUTTON, name="add_to_cart")
+                 .settle(name="add_to_cart_settle")
+                 .read_state()
+                 .run())
+        
+        for step in batch["steps"]:
+            print(f"   {'✓' if step['ok'] else '⚠️'} {step['name']}: {step['ms']:.0f}ms{' - ' + step['error'] if step['error'] else ''}")
+        
+        if not batch["ok"]:
+            if batch["failed_step"] == "quantity":
+                return {"status": "FAILED", "message": f"Không thể nhập giá trị {quantity_value}: {batch['error']}"}
+            if batch["failed_step"] == "add_to_cart":
+                return {"status": "FAILED", "message": f"Không thể click button 'Thêm vào giỏ hàng': {batch['error']}"}
+            return {"status": "ERROR", "message": f"Action batch failed: {batch['error']}"}
+        
+        input_result = ActionBatch.step(batch, "quantity")["data"]
+        print(f"✓ Input result: {quantity_value} → {input_result['committedValue']}")
+        if input_result["committedValue"] != str(quantity_value):
+            print(f"⚠️ System modified input: {quantity_value} → {input_result['committedValue']}")
+        
+        # Bước 5: Kiểm tra behavior - quantity, error/alert và cart badge từ snapshot của batch
+        state = batch["state"]
+        
+        if state and state["quantity_value"] is not None:
+            current_value = state["quantity_value"]
             print(f"📊 Quantity value after submit: {current_value}")
         else:
             current_value = "unknown"
@@ -164,33 +137,13 @@ class TestCase06:
         expected_behavior = self.test_data['expected_behavior']
         expected_cart_items = self.test_data['expected_cart_items']
         
-        # Kiểm tra error message nếu có
-        error_found = False
-        error_message = ""
-        
-        error_element = TestHelpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.ERROR_MESSAGE, timeout=5
-        )
-        
-        if error_element and error_element.is_displayed():
-            error_message = error_element.text
-            error_found = True
+        # Kiểm tra error message nếu có (error selectors trước, sau đó alert/notification)
+        messages = (state["errors"] + state["alerts"]) if state else []
+        error_found = bool(messages)
+        error_message = messages[0] if messages else ""
+        if error_found:
             print(f"📝 Error message found: {error_message}")
         
-        # Check for any validation alerts or notifications
-        try:
-            alert_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                ".alert, .notification, .message, [role='alert'], .toast")
-            for alert in alert_elements:
-                if alert.is_displayed() and alert.text.strip():
-                    if not error_found:
-                        error_message = alert.text
-                        error_found = True
-                        print(f"📝 Alert message found: {error_message}")
-                    break
-        except:
-            pass
-        
         # Validate expected behavior
         if expected_behavior == "reset_to_1":
             if current_value == "1":
@@ -211,18 +164,12 @@ class TestCase06:
                 }
         
         # Check if cart was updated (should not be for invalid values)
-        try:
-            cart_indicators = self.driver.find_elements(By.CSS_SELECTOR, 
-                ".cart-count, .cart-total, [class*='cart'], [class*='added']")
-            cart_updated = any(indicator.is_displayed() for indicator in cart_indicators)
-            
-            if cart_updated and expected_cart_items == 0:
-                return {
-                    "status": "FAILED",
-                    "message": f"Cart was updated despite invalid quantity {quantity_value}"
-                }
-        except:
-            pass
+        cart_updated = bool(state and state["cart_count"])
+        if cart_updated and expected_cart_items == 0:
+            return {
+                "status": "FAILED",
+                "message": f"Cart was updated despite invalid quantity {quantity_value}"
+            }
         
         return {
             "status": "PASSED", 
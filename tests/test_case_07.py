@@ -23,6 +23,7 @@ from config.locators import ProductPageLocators
 from config.test_data import TestData
 from utils.driver_manager import DriverManager
 from utils.test_helpers import TestHelpers
+from utils.wait_policy import WaitPolicy
 
 class TestCase07:
     """Test Case 7: Error Handling - Số lượng = -1"""
@@ -36,7 +37,7 @@ class TestCase07:
     def setup(self):
         """Thiết lập test environment"""
         print("🔧 Setting up Test Case #7: Error Handling")
-        self.driver = DriverManager.get_driver()
+        self.driver = DriverManager.acquire_driver()
         self.wait = WebDriverWait(self.driver, EXPLICIT_WAIT)
         
     def teardown(self):
@@ -45,8 +46,8 @@ class TestCase07:
             self.test_helpers.take_screenshot(self.driver, "TC07_final_state")
         
         if self.driver:
-            time.sleep(3)
-            self.driver.quit()
+            WaitPolicy.sleep(OBSERVATION_PAUSE, "observation pause")
+            DriverManager.release_driver(self.driver)
         print("🧹 Test Case #7 cleanup completed")
     
     def execute_equivalence_partitioning(self):
@@ -90,21 +91,14 @@ class TestCase07:
         
         # Bước 1: Truy cập trang
         self.driver.get(PRODUCT_URL)
+        self.test_helpers.wait_until_ready(self.driver, ProductPageLocators.PRODUCT_FORM_READY)
         print(f"✓ Accessed: {PRODUCT_URL}")
         
         # Bước 2: Chọn phân loại
-        category_dropdown = self.test_helpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.CATEGORY_DROPDOWN, timeout=5
-        )
-        
-        if category_dropdown:
-            try:
-                select = Select(category_dropdown)
-                if len(select.options) > 1:
-                    select.select_by_index(1)
-                    print("✓ Đã chọn phân loại đối tượng")
-            except:
-                print("⚠️ Không thể chọn phân loại, tiếp tục test")
+        if self.test_helpers.select_category_option(self.driver, "khac"):
+            print("✓ Đã chọn phân loại đối tượng")
+        else:
+            print("⚠️ Không thể chọn phân loại, tiếp tục test")
         
         # Bước 3: Nhập negative quantity
         quantity_input = self.test_helpers.find_element_by_multiple_selectors(
@@ -122,8 +116,9 @@ class TestCase07:
         print(f"✓ Đã thử nhập quantity = {quantity_value}")
         
         # Kiểm tra giá trị trong field sau khi nhập
-        time.sleep(1)
-        actual_value = quantity_input.get_attribute("value")
+        actual_value = self.test_helpers.wait_for_value_committed(self.driver, quantity_input)
+        if actual_value is None:
+            actual_value = quantity_input.get_attribute("value")
         print(f"📊 Actual value in field: '{actual_value}'")
         
         # Bước 4: Click "Thêm vào giỏ hàng"
@@ -134,6 +129,7 @@ class TestCase07:
         if not add_to_cart_btn:
             return {"status": "FAILED", "message": "Không tìm thấy button 'Thêm vào giỏ hàng'"}
         
+        self.test_helpers.arm_settle_tracker(self.driver)
         success = self.test_helpers.safe_click(self.driver, add_to_cart_btn)
         if not success:
             return {"status": "FAILED", "message": "Không thể click button"}
@@ -141,10 +137,15 @@ class TestCase07:
         print("✓ Đã click 'Thêm vào giỏ hàng'")
         
         # Bước 5: Kiểm tra error handling
-        time.sleep(2)
+        self.test_helpers.wait_until_settled(self.driver, "add_to_cart", ADD_TO_CART_REQUEST_PATTERN)
         
         # Kiểm tra quantity có reset về 1 không
-        current_value = quantity_input.get_attribute("value")
+        state = self.test_helpers.snapshot_state(
+            self.driver, until=lambda state: state["quantity_value"] == "1" or state["errors"]
+        )
+        if state is None:
+            return {"status": "ERROR", "message": "Không đọc được trạng thái trang sau khi click 'Thêm vào giỏ hàng' (snapshot_state thất bại)"}
+        current_value = state.get("quantity_value")
         print(f"📊 Quantity value after submit: {current_value}")
         
         expected_behavior = self.test_data['expected_behavior']
@@ -178,22 +179,14 @@ class TestCase07:
         
         # Bước 1: Truy cập trang
         self.driver.get(PRODUCT_URL)
-        self.test_helpers.wait_for_page_load(self.driver)
+        self.test_helpers.wait_until_ready(self.driver, ProductPageLocators.PRODUCT_FORM_READY)
         print(f"✓ Accessed: {PRODUCT_URL}")
         
         # Bước 2: Chọn phân loại (để focus vào quantity testing)
-        category_dropdown = self.test_helpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.CATEGORY_DROPDOWN, timeout=5
-        )
-        
-        if category_dropdown:
-            try:
-                select = Select(category_dropdown)
-                if len(select.options) > 1:
-                    select.select_by_index(1)
-                    print("✓ Đã chọn phân loại đối tượng")
-            except:
-                print("⚠️ Không thể chọn phân loại, tiếp tục test")
+        if self.test_helpers.select_category_option(self.driver, "khac"):
+            print("✓ Đã chọn phân loại đối tượng")
+        else:
+            print("⚠️ Không thể chọn phân loại, tiếp tục test")
         
         # Bước 3: Tìm quantity input field
         quantity_input = self.test_helpers.find_element_by_multiple_selectors(
@@ -223,6 +216,7 @@ class TestCase07:
         if not add_to_cart_btn:
             return {"status": "FAILED", "message": "Không tìm thấy button 'Thêm vào giỏ hàng'"}
         
+        self.test_helpers.arm_settle_tracker(self.driver)
         success = self.test_helpers.safe_click(self.driver, add_to_cart_btn)
         if not success:
             return {"status": "FAILED", "message": "Không thể click button"}
@@ -230,21 +224,22 @@ class TestCase07:
         print("✓ Đã click 'Thêm vào giỏ hàng'")
         
         # Bước 5: Kiểm tra validation behavior
-        time.sleep(2)
+        self.test_helpers.wait_until_settled(self.driver, "add_to_cart", ADD_TO_CART_REQUEST_PATTERN)
         
         # Kiểm tra quantity field có reset về 1 không
-        current_value = quantity_input.get_attribute("value")
+        state = self.test_helpers.snapshot_state(
+            self.driver, until=lambda state: state["quantity_value"] == "1" or state["errors"]
+        )
+        if state is None:
+            return {"status": "ERROR", "message": "Không đọc được trạng thái trang sau khi click 'Thêm vào giỏ hàng' (snapshot_state thất bại)"}
+        current_value = state.get("quantity_value")
         print(f"📊 Quantity value after submit: {current_value}")
         
         expected_behavior = self.test_data['expected_behavior']
         
         # Kiểm tra error message
-        error_element = self.test_helpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.ERROR_MESSAGE, timeout=5
-        )
-        
-        if error_element and error_element.is_displayed():
-            error_message = error_element.text
+        if state.get("errors"):
+            error_message = state["errors"][0]
             print(f"📝 Error message: {error_message}")
         
         if expected_behavior == "reset_to_1":
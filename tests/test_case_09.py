@@ -20,12 +20,14 @@ import logging
 import subprocess
 import psutil
 import threading
+from urllib.parse import urlparse
 
 from config.settings import *
 from config.locators import ProductPageLocators
 from config.test_data import TestData
 from utils.driver_manager import DriverManager
 from utils.test_helpers import TestHelpers
+from utils.wait_policy import WaitPolicy
 from utils.boundary_helpers import BoundaryHelpers
 from utils.error_handlers import ErrorHandlers
 
@@ -44,7 +46,7 @@ class TestCase09:
     def setup(self):
         """Thiết lập test environment"""
         print("🔧 Setting up Test Case #9: Stress/Load Testing")
-        self.driver = DriverManager.get_driver()
+        self.driver = DriverManager.acquire_driver()
         self.wait = WebDriverWait(self.driver, EXPLICIT_WAIT)
         
         # Setup performance monitoring
@@ -59,8 +61,8 @@ class TestCase09:
         self.stop_performance_monitoring()
         
         if self.driver:
-            time.sleep(3)
-            self.driver.quit()
+            WaitPolicy.sleep(OBSERVATION_PAUSE, "observation pause")
+            DriverManager.release_driver(self.driver)
         print("🧹 Test Case #9 cleanup completed")
     
     def setup_performance_monitoring(self):
@@ -171,23 +173,15 @@ class TestCase09:
         # Bước 1: Truy cập trang
         page_load_start = time.time()
         self.driver.get(PRODUCT_URL)
-        self.test_helpers.wait_for_page_load(self.driver)
+        self.test_helpers.wait_until_ready(self.driver, ProductPageLocators.PRODUCT_FORM_READY)
         page_load_time = time.time() - page_load_start
         print(f"✓ Page loaded in {page_load_time:.2f} seconds")
         
         # Bước 2: Chọn phân loại (để focus vào quantity testing)
-        category_dropdown = self.test_helpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.CATEGORY_DROPDOWN, timeout=5
-        )
-        
-        if category_dropdown:
-            try:
-                select = Select(category_dropdown)
-                if len(select.options) > 1:
-                    select.select_by_index(1)
-                    print("✓ Đã chọn phân loại đối tượng")
-            except Exception as e:
-                print(f"⚠️ Không thể chọn phân loại: {str(e)}")
+        if self.test_helpers.select_category_option(self.driver, "khac"):
+            print("✓ Đã chọn phân loại đối tượng")
+        else:
+            print("⚠️ Không thể chọn phân loại, tiếp tục test")
         
         # Bước 3: Input large quantity
         quantity_input = self.test_helpers.find_element_by_multiple_selectors(
@@ -220,6 +214,7 @@ class TestCase09:
         if not add_to_cart_btn:
             return {"status": "FAILED", "message": "Không tìm thấy button 'Thêm vào giỏ hàng'"}
         
+        self.test_helpers.arm_settle_tracker(self.driver)
         success = self.test_helpers.safe_click(self.driver, add_to_cart_btn)
         if not success:
             return {"status": "FAILED", "message": "Không thể click button"}
@@ -228,12 +223,12 @@ class TestCase09:
         print(f"✓ Submit completed in {submit_time:.2f} seconds")
         
         # Bước 5: Check stress test results
-        time.sleep(3)  # Wait for response
+        self.test_helpers.wait_until_settled(self.driver, "add_to_cart", ADD_TO_CART_REQUEST_PATTERN)  # Wait for response
         
         # Check for error message
-        error_element = self.test_helpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.ERROR_MESSAGE, timeout=8
-        )
+        state = self.test_helpers.snapshot_state(self.driver, until=lambda state: state["errors"])
+        if state is None:
+            return {"status": "ERROR", "message": "Không đọc được trạng thái trang sau khi click 'Thêm vào giỏ hàng' (snapshot_state thất bại)"}
         
         expected_message = self.test_data['expected_message']
         total_time = time.time() - start_time
@@ -241,8 +236,8 @@ class TestCase09:
         # Record response time
         self.performance_metrics["response_times"].append(total_time)
         
-        if error_element and error_element.is_displayed():
-            actual_message = error_element.text
+        if state.get("errors"):
+            actual_message = state["errors"][0]
             print(f"✓ Error message found: '{actual_message}'")
             print(f"📈 Total response time: {total_time:.2f} seconds")
             
@@ -258,7 +253,7 @@ class TestCase09:
                 }
         else:
             # Check if quantity was reset or limited
-            current_value = quantity_input.get_attribute("value")
+            current_value = state.get("quantity_value")
             if current_value != str(quantity_value):
                 return {
                     "status": "PASSED",
@@ -288,7 +283,7 @@ class TestCase09:
             try:
                 # Quick test cycle
                 self.driver.refresh()
-                time.sleep(1)
+                self.test_helpers.wait_until_ready(self.driver, ProductPageLocators.PRODUCT_FORM_READY)
                 
                 # Quick input test
                 quantity_input = self.test_helpers.find_element_by_multiple_selectors(
@@ -323,6 +318,7 @@ class TestCase09:
         """Tạo JMeter script cho load testing"""
         jmeter_dir = "performance/jmeter_scripts"
         os.makedirs(jmeter_dir, exist_ok=True)
+        target = urlparse(BASE_URL)
         
         jmeter_script = f"""<?xml version="1.0" encoding="UTF-8"?>
 <jmeterTestPlan version="1.2" properties="5.0" jmeter="5.4.1">
@@ -360,11 +356,11 @@ class TestCase09:
               </elementProp>
             </collectionProp>
           </elementProp>
-          <stringProp name="HTTPSampler.domain">atd.ueh.edu.vn</stringProp>
-          <stringProp name="HTTPSampler.port"></stringProp>
-          <stringProp name="HTTPSampler.protocol">https</stringProp>
+          <stringProp name="HTTPSampler.domain">{target.hostname}</stringProp>
+          <stringProp name="HTTPSampler.port">{target.port or ''}</stringProp>
+          <stringProp name="HTTPSampler.protocol">{target.scheme}</stringProp>
           <stringProp name="HTTPSampler.contentEncoding"></stringProp>
-          <stringProp name="HTTPSampler.path">/business-analyst-in-practices-p16.html</stringProp>
+          <stringProp name="HTTPSampler.path">{PRODUCT_PATH}</stringProp>
           <stringProp name="HTTPSampler.method">POST</stringProp>
           <boolProp name="HTTPSampler.follow_redirects">true</boolProp>
           <boolProp name="HTTPSampler.auto_redirects">false</boolProp>
@@ -24,6 +24,7 @@ from config.locators import ProductPageLocators
 from config.test_data import TestData
 from utils.driver_manager import DriverManager
 from utils.test_helpers import TestHelpers
+from utils.wait_policy import WaitPolicy
 from utils.validation_helpers import ValidationHelpers
 from utils.error_handlers import ErrorHandlers
 
@@ -41,7 +42,7 @@ class TestCase10:
     def setup(self):
         """Thiết lập test environment"""
         print("🔧 Setting up Test Case #10: Error Handling - Special Characters")
-        self.driver = DriverManager.get_driver()
+        self.driver = DriverManager.acquire_driver()
         self.wait = WebDriverWait(self.driver, EXPLICIT_WAIT)
         
     def teardown(self):
@@ -50,8 +51,8 @@ class TestCase10:
             self.test_helpers.take_screenshot(self.driver, "TC10_final_state")
         
         if self.driver:
-            time.sleep(3)
-            self.driver.quit()
+            WaitPolicy.sleep(OBSERVATION_PAUSE, "observation pause")
+            DriverManager.release_driver(self.driver)
         print("🧹 Test Case #10 cleanup completed")
     
     def execute_equivalence_partitioning(self):
@@ -110,22 +111,14 @@ class TestCase10:
         
         # Bước 1: Truy cập trang
         self.driver.get(PRODUCT_URL)
-        self.test_helpers.wait_for_page_load(self.driver)
+        self.test_helpers.wait_until_ready(self.driver, ProductPageLocators.PRODUCT_FORM_READY)
         print(f"✓ Accessed: {PRODUCT_URL}")
         
         # Bước 2: Chọn phân loại
-        category_dropdown = self.test_helpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.CATEGORY_DROPDOWN, timeout=5
-        )
-        
-        if category_dropdown:
-            try:
-                select = Select(category_dropdown)
-                if len(select.options) > 1:
-                    select.select_by_index(1)
-                    print("✓ Đã chọn phân loại đối tượng")
-            except Exception as e:
-                print(f"⚠️ Không thể chọn phân loại: {str(e)}")
+        if self.test_helpers.select_category_option(self.driver, "khac"):
+            print("✓ Đã chọn phân loại đối tượng")
+        else:
+            print("⚠️ Không thể chọn phân loại, tiếp tục test")
         
         # Bước 3: Test special character input
         quantity_input = self.test_helpers.find_element_by_multiple_selectors(
@@ -169,8 +162,7 @@ class TestCase10:
                     current_value = method_result.get("final_value", "")
                 else:
                     method_func()
-                    time.sleep(0.5)
-                    current_value = quantity_input.get_attribute("value")
+                    current_value = self.test_helpers.wait_for_value_committed(self.driver, quantity_input)
                 
                 results[method_name] = current_value
                 print(f"     Result: '{current_value}'")
@@ -191,6 +183,7 @@ class TestCase10:
         final_field_value = quantity_input.get_attribute("value")
         print(f"📊 Final field value before submit: '{final_field_value}'")
         
+        self.test_helpers.arm_settle_tracker(self.driver)
         success = self.test_helpers.safe_click(self.driver, add_to_cart_btn)
         if not success:
             return {"status": "FAILED", "message": "Không thể click button"}
@@ -198,17 +191,17 @@ class TestCase10:
         print("✓ Đã click 'Thêm vào giỏ hàng'")
         
         # Bước 5: Kiểm tra error handling
-        time.sleep(2)
+        self.test_helpers.wait_until_settled(self.driver, "add_to_cart", ADD_TO_CART_REQUEST_PATTERN)
         
         # Check for error message
-        error_element = self.test_helpers.find_element_by_multiple_selectors(
-            self.driver, self.wait, ProductPageLocators.ERROR_MESSAGE, timeout=5
-        )
+        state = self.test_helpers.snapshot_state(self.driver, until=lambda state: state["errors"])
+        if state is None:
+            return {"status": "ERROR", "message": "Không đọc được trạng thái trang sau khi click 'Thêm vào giỏ hàng' (snapshot_state thất bại)"}
         
         expected_message = self.test_data['expected_message']
         
-        if error_element and error_element.is_displayed():
-            actual_message = error_element.text
+        if state.get("errors"):
+            actual_message = state["errors"][0]
             print(f"✓ Error message found: '{actual_message}'")
             
             if expected_message in actual_message or "số" in actual_message.lower() or "hợp lệ" in actual_message.lower():
@@ -223,7 +216,7 @@ class TestCase10:
                 }
         else:
             # Check if input was sanitized
-            sanitized_value = quantity_input.get_attribute("value")
+            sanitized_value = state.get("quantity_value") or ""
             if sanitized_value != input_value:
                 return {
                     "status": "PASSED",
@@ -239,7 +232,7 @@ class TestCase10:
         """Input text character by character"""
         for char in text:
             element.send_keys(char)
-            time.sleep(0.1)
+            WaitPolicy.sleep(0.1, "typing cadence")
     
     def simulate_copy_paste(self, element, text):
         """Simulate copy-paste operation"""
@@ -0,0 +1,165 @@
+"""
+Unit tests cho Deadline: clamp timeout theo thời gian còn lại và báo cáo khi hết deadline
+(cả khi đi qua WaitPolicy.until/sleep)
+
+Chạy: python -m pytest -q tests/test_deadline.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+import utils.deadline as deadline
+import utils.wait_policy as wait_policy
+from utils.deadline import Deadline
+from utils.wait_policy import WaitPolicy
+
+class FakeClock:
+    """Thay cho module time trong utils.deadline"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def time(self):
+        return self.now
+    
+    def advance(self, seconds):
+        self.now += seconds
+    
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(deadline, "time", clock)
+    monkeypatch.setattr(wait_policy, "time", clock)
+    yield clock
+    Deadline.end()
+
+def test_no_deadline_keeps_timeout(clock):
+    assert Deadline.remaining() is None
+    assert Deadline.expired() is False
+    assert Deadline.clamp(10, "lookup") == 10
+    assert Deadline.end() == {}
+
+def test_disabled_budget_keeps_timeout(clock):
+    Deadline.begin("TC05", None)
+    
+    assert Deadline.remaining() is None
+    assert Deadline.clamp(10, "lookup") == 10
+
+def test_clamp_to_remaining_time(clock):
+    Deadline.begin("TC05", 30)
+    
+    assert Deadline.clamp(10, "lookup") == 10
+    clock.advance(25)
+    assert Deadline.remaining() == 5
+    assert Deadline.clamp(10, "lookup") == 5
+
+def test_expired_deadline_records_first_step(clock):
+    Deadline.begin("TC05", 30)
+    clock.advance(31)
+    
+    assert Deadline.expired() is True
+    assert Deadline.clamp(10, "settle") == 0
+    assert Deadline.clamp(10, "lookup") == 0
+    
+    report = Deadline.end()
+    assert report["expired"] is True
+    assert report["expired_at"] == "settle"
+    assert report["elapsed"] == 31
+
+def test_end_reports_longest_waits(clock):
+    Deadline.begin("TC05", 60)
+    for step, seconds in [("lookup", 1), ("settle", 4), ("lookup", 2), ("a", 0.1), ("b", 0.2), ("c", 0.3), ("d", 0.4)]:
+        Deadline.charge(step, seconds)
+    
+    report = Deadline.end()
+    
+    assert report["expired"] is False
+    assert report["top_waits"] == [
+        {"step": "settle", "seconds": 4},
+        {"step": "lookup", "seconds": 3},
+        {"step": "d", "seconds": 0.4},
+        {"step": "c", "seconds": 0.3},
+        {"step": "b", "seconds": 0.2}
+    ]
+    assert Deadline.remaining() is None
+
+def test_describe(clock):
+    Deadline.begin("TC05", 30)
+    Deadline.charge("settle", 12.5)
+    clock.advance(30)
+    Deadline.clamp(5, "snapshot")
+    
+    message = Deadline.describe(Deadline.end())
+    
+    assert message == "Test deadline of 30s exceeded at 'snapshot' (longest waits: settle 12.5s)"
+
+def test_deadline_is_per_thread(clock):
+    Deadline.begin("TC05", 30)
+    seen = {}
+    
+    worker = threading.Thread(target=lambda: seen.update(remaining=Deadline.remaining()))
+    worker.start()
+    worker.join()
+    
+    assert seen["remaining"] is None
+    assert Deadline.remaining() == 30
+
+def test_expiry_without_later_wait_is_reported(clock):
+    Deadline.begin("TC05", 30)
+    Deadline.charge("add_to_cart settled", 20)
+    clock.advance(31)
+    
+    report = Deadline.end()
+    
+    assert report["expired"] is True
+    assert report["expired_at"] == "add_to_cart settled"
+
+def test_until_records_the_wait_that_used_up_the_budget(clock):
+    Deadline.begin("TC05", 5)
+    
+    with pytest.raises(TimeoutException, match="Test deadline reached"):
+        WaitPolicy.until(None, lambda driver: False, 10, "add_to_cart settled")
+    # Wait kế tiếp sau khi hết deadline không được ghi đè bước đã hết thời gian
+    assert WaitPolicy.poll(None, lambda driver: False, 10, "state condition") is None
+    
+    report = Deadline.end()
+    assert report["expired"] is True
+    assert report["expired_at"] == "add_to_cart settled"
+    assert report["top_waits"][0] == {"step": "add_to_cart settled", "seconds": 5}
+
+def test_until_timeout_within_budget_does_not_expire(clock):
+    Deadline.begin("TC05", 30)
+    
+    with pytest.raises(TimeoutException, match="Timed out after 2s"):
+        WaitPolicy.until(None, lambda driver: False, 2, "lookup")
+    
+    report = Deadline.end()
+    assert report["expired"] is False
+    assert report["expired_at"] is None
+
+def test_until_returns_before_deadline(clock):
+    Deadline.begin("TC05", 30)
+    ready_at = clock.now + 1
+    
+    assert WaitPolicy.until(None, lambda driver: clock.now >= ready_at, 10, "lookup") is True
+    assert Deadline.end()["expired"] is False
+
+def test_clamped_sleep_records_expiry(clock):
+    Deadline.begin("TC05", 3)
+    clock.advance(2)
+    
+    WaitPolicy.sleep(5, "typing cadence")
+    WaitPolicy.sleep(1, "animation")
+    
+    report = Deadline.end()
+    assert report["expired"] is True
+    assert report["expired_at"] == "typing cadence"
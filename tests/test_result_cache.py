@@ -0,0 +1,113 @@
+"""
+Unit tests cho ResultCache: lookup, store và invalidation của key
+
+Chạy: python -m pytest -q tests/test_result_cache.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import importlib
+
+import pytest
+
+import utils.result_cache as result_cache
+from utils.result_cache import ResultCache
+
+TEST_CASE = {"id": "TC99", "module": "sample_test_module"}
+FINGERPRINT = "etag:\"v1\""
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Project tạm: một module test, config/*.py, utils/*.py và cache file riêng"""
+    (tmp_path / "config").mkdir()
+    (tmp_path / "utils").mkdir()
+    (tmp_path / "config" / "settings.py").write_text("TIMEOUT = 10\n", encoding="utf-8")
+    (tmp_path / "utils" / "helpers.py").write_text("def helper():\n    return 1\n", encoding="utf-8")
+    (tmp_path / "sample_test_module.py").write_text("def run():\n    return 'PASSED'\n", encoding="utf-8")
+    importlib.invalidate_caches()
+    
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_FILE", str(tmp_path / ".cache" / "result_cache.json"))
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_SOURCES", ["config/*.py", "utils/*.py"])
+    monkeypatch.setattr(ResultCache, "_entries", None)
+    monkeypatch.setattr(ResultCache, "_dirty", False)
+    monkeypatch.setattr(ResultCache, "stats", {"hits": 0, "misses": 0, "stored": 0})
+    return tmp_path
+
+def passed_result(**overrides):
+    result = {
+        "test_id": TEST_CASE["id"],
+        "status": "PASSED",
+        "message": "ok",
+        "execution_time": 12.5,
+        "timestamp": "2026-01-01 10:00:00",
+        "metrics": {"wait_seconds": 3.0}
+    }
+    result.update(overrides)
+    return result
+
+def test_lookup_misses_on_empty_cache(project):
+    assert ResultCache.lookup(TEST_CASE, FINGERPRINT) is None
+    assert ResultCache.stats["misses"] == 1
+
+def test_store_then_lookup_returns_cached_result(project):
+    ResultCache.store(TEST_CASE, FINGERPRINT, passed_result())
+    
+    cached = ResultCache.lookup(TEST_CASE, FINGERPRINT)
+    
+    assert cached["status"] == "PASSED"
+    assert cached["cached"] is True
+    assert cached["cached_at"] == "2026-01-01 10:00:00"
+    assert cached["cached_execution_time"] == 12.5
+    assert cached["execution_time"] == 0.0
+    assert cached["metrics"] == {}
+    assert cached["message"].startswith("[cached 2026-01-01 10:00:00]")
+    assert ResultCache.stats == {"hits": 1, "misses": 0, "stored": 1}
+
+@pytest.mark.parametrize("result", [
+    passed_result(status="FAILED"),
+    passed_result(status="ERROR"),
+    passed_result(cached=True)
+])
+def test_store_skips_non_passed_and_cached_results(project, result):
+    ResultCache.store(TEST_CASE, FINGERPRINT, result)
+    
+    assert ResultCache.lookup(TEST_CASE, FINGERPRINT) is None
+    assert ResultCache.stats["stored"] == 0
+
+def test_saved_cache_is_reloaded_from_disk(project):
+    ResultCache.store(TEST_CASE, FINGERPRINT, passed_result())
+    ResultCache.save()
+    ResultCache._entries = None
+    
+    assert (project / ".cache" / "result_cache.json").exists()
+    assert ResultCache.lookup(TEST_CASE, FINGERPRINT)["cached"] is True
+
+@pytest.mark.parametrize("path, content", [
+    ("sample_test_module.py", "def run():\n    return 'FAILED'\n"),
+    ("utils/helpers.py", "def helper():\n    return 2\n"),
+    ("config/settings.py", "TIMEOUT = 20\n"),
+    ("utils/new_helper.py", "VALUE = 1\n")
+])
+def test_source_change_invalidates_key(project, path, content):
+    ResultCache.store(TEST_CASE, FINGERPRINT, passed_result())
+    
+    (project / path).write_text(content, encoding="utf-8")
+    
+    assert ResultCache.lookup(TEST_CASE, FINGERPRINT) is None
+
+def test_removed_helper_invalidates_key(project):
+    ResultCache.store(TEST_CASE, FINGERPRINT, passed_result())
+    
+    (project / "utils" / "helpers.py").unlink()
+    
+    assert ResultCache.lookup(TEST_CASE, FINGERPRINT) is None
+
+def test_page_fingerprint_change_invalidates_key(project):
+    ResultCache.store(TEST_CASE, FINGERPRINT, passed_result())
+    
+    assert ResultCache.lookup(TEST_CASE, "etag:\"v2\"") is None
+    assert ResultCache.lookup(TEST_CASE, FINGERPRINT) is not None
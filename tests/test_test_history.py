@@ -0,0 +1,129 @@
+"""
+Unit tests cho TestHistory: median execution_time, trạng thái gần nhất, lọc report và --history
+
+Chạy: python -m pytest -q tests/test_test_history.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import pytest
+
+import utils.test_history as test_history
+from utils.test_history import TestHistory
+
+SUITE = "E-Commerce Product Testing - Complete Suite"
+BVA_SUITE = "E-Commerce Product Testing - Comprehensive BVA"
+
+@pytest.fixture
+def history_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(test_history, "TEST_HISTORY_DIR", str(tmp_path))
+    return tmp_path
+
+def write_report(directory, name, age, results, test_suite=SUITE, metadata=None):
+    """Ghi một JSON report; age (seconds) càng lớn thì report càng cũ"""
+    path = directory / f"{name}.json"
+    report = {"test_suite": test_suite, "test_results": results, "metadata": metadata or {}}
+    path.write_text(json.dumps(report), encoding="utf-8")
+    mtime = 1_700_000_000 - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+def result(test_id, execution_time, status="PASSED", **extra):
+    return dict({"test_id": test_id, "execution_time": execution_time, "status": status}, **extra)
+
+def test_empty_history(history_dir):
+    assert TestHistory.load_reports() == []
+    assert TestHistory.durations() == {}
+    assert TestHistory.last_statuses() == {}
+
+def test_durations_are_median_of_recent_runs(history_dir):
+    write_report(history_dir, "r1", 30, [result("TC05", 10), result("TC06", 4)])
+    write_report(history_dir, "r2", 20, [result("TC05", 30), result("TC06", 8)])
+    write_report(history_dir, "r3", 10, [result("TC05", 20)])
+    
+    assert TestHistory.durations() == {"TC05": 20, "TC06": 6}
+
+def test_durations_only_read_latest_runs(history_dir):
+    write_report(history_dir, "old", 30, [result("TC05", 100)])
+    write_report(history_dir, "new1", 20, [result("TC05", 10)])
+    write_report(history_dir, "new2", 10, [result("TC05", 20)])
+    
+    assert TestHistory.durations(runs=2) == {"TC05": 15}
+
+def test_cached_results_are_ignored(history_dir):
+    write_report(history_dir, "r1", 20, [result("TC05", 12)])
+    write_report(history_dir, "r2", 10, [result("TC05", 0.0, cached=True)])
+    
+    assert TestHistory.durations() == {"TC05": 12}
+
+def test_merged_reports_are_not_counted_twice(history_dir):
+    write_report(history_dir, "shard1", 20, [result("TC05", 10)], metadata={"shard": "1/2"})
+    write_report(history_dir, "shard2", 20, [result("TC06", 4)], metadata={"shard": "2/2"})
+    write_report(history_dir, "merged", 10, [result("TC05", 50), result("TC06", 50)],
+                 metadata={"merged_from": ["shard1.json", "shard2.json"]})
+    
+    assert len(TestHistory.load_reports()) == 2
+    assert TestHistory.durations() == {"TC05": 10, "TC06": 4}
+
+def test_history_is_filtered_by_suite(history_dir):
+    write_report(history_dir, "tc", 20, [result("TC05", 10)])
+    write_report(history_dir, "bva", 10, [result("BVA_01", 3)], test_suite=BVA_SUITE)
+    
+    assert TestHistory.durations(test_suite=SUITE) == {"TC05": 10}
+    assert TestHistory.durations(test_suite=BVA_SUITE) == {"BVA_01": 3}
+    assert TestHistory.durations() == {"TC05": 10, "BVA_01": 3}
+
+def test_unreadable_and_foreign_files_are_skipped(history_dir):
+    (history_dir / "broken.json").write_text("{not json", encoding="utf-8")
+    (history_dir / "list.json").write_text("[]", encoding="utf-8")
+    write_report(history_dir, "r1", 10, [result("TC05", 7)])
+    
+    assert TestHistory.durations() == {"TC05": 7}
+
+def test_last_statuses_use_newest_report(history_dir):
+    write_report(history_dir, "old", 20, [result("TC05", 10, "FAILED"), result("TC06", 4, "ERROR")])
+    write_report(history_dir, "new", 10, [result("TC05", 10, "PASSED")])
+    
+    assert TestHistory.last_statuses() == {"TC05": "PASSED", "TC06": "ERROR"}
+
+def test_shared_history_directory_reads_every_report(tmp_path):
+    for index, execution_time in enumerate([10, 30, 20, 40, 50, 60, 70]):
+        write_report(tmp_path, f"r{index}", index, [result("TC05", execution_time)])
+    write_report(tmp_path, "bva", 0, [result("BVA_01", 3)], test_suite=BVA_SUITE)
+    
+    # Không giới hạn theo mtime: mọi CI node tải cùng thư mục sẽ ra cùng kết quả
+    assert TestHistory.shared_durations(str(tmp_path), test_suite=SUITE) == {"TC05": 40}
+
+def test_shared_history_accepts_merged_report(tmp_path):
+    path = write_report(tmp_path, "merged", 0, [result("TC05", 12), result("TC06", 4)],
+                        metadata={"merged_from": ["shard1.json", "shard2.json"]})
+    
+    assert TestHistory.shared_durations(str(path), test_suite=SUITE) == {"TC05": 12, "TC06": 4}
+
+def test_shared_history_accepts_durations_map(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps({"TC05": 190, "TC06": 15.5}), encoding="utf-8")
+    
+    assert TestHistory.shared_durations(str(path)) == {"TC05": 190, "TC06": 15.5}
+
+def test_shared_history_rejects_report_of_other_suite(tmp_path):
+    path = write_report(tmp_path, "bva", 0, [result("BVA_01", 3)], test_suite=BVA_SUITE)
+    
+    with pytest.raises(ValueError, match="expected"):
+        TestHistory.shared_durations(str(path), test_suite=SUITE)
+
+@pytest.mark.parametrize("content", ["{not json", "[]", '{"TC05": "slow"}'])
+def test_shared_history_rejects_invalid_file(tmp_path, content):
+    path = tmp_path / "history.json"
+    path.write_text(content, encoding="utf-8")
+    
+    with pytest.raises(ValueError):
+        TestHistory.shared_durations(str(path))
+
+def test_missing_shared_history_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Cannot read"):
+        TestHistory.shared_durations(str(tmp_path / "missing.json"))
@@ -0,0 +1,138 @@
+"""
+Unit tests cho TestScheduler: --shard i/n, --order và makespan dự kiến
+
+Chạy: python -m pytest -q tests/test_test_scheduler.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import utils.test_scheduler as test_scheduler
+from utils.test_history import TestHistory
+from utils.test_scheduler import TestScheduler
+
+DURATIONS = {"TC05": 190, "TC06": 15, "TC07": 105, "TC08": 105, "TC09": 410, "TC10": 104}
+TEST_CASES = [{"id": test_id} for test_id in DURATIONS]
+
+@pytest.fixture
+def no_history(monkeypatch):
+    """Không có report nào trong lịch sử"""
+    monkeypatch.setattr(TestHistory, "durations", lambda **kwargs: {})
+    monkeypatch.setattr(TestHistory, "last_statuses", lambda **kwargs: {})
+
+@pytest.fixture
+def local_history(monkeypatch):
+    """Lịch sử local của CI node (mỗi node một khác) không được dùng để chia shard"""
+    def fail(**kwargs):
+        raise AssertionError("shard plan must not read local history")
+    monkeypatch.setattr(TestHistory, "durations", fail)
+
+def ids(items):
+    return [item["id"] for item in items]
+
+@pytest.mark.parametrize("value, expected", [("1/1", (1, 1)), ("2/3", (2, 3)), ("3/3", (3, 3))])
+def test_parse_shard(value, expected):
+    assert TestScheduler.parse_shard(value) == expected
+
+@pytest.mark.parametrize("value", ["0/3", "4/3", "1/0", "1", "a/b", "1/2/3"])
+def test_parse_shard_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        TestScheduler.parse_shard(value)
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 6, 8])
+def test_every_test_is_assigned_to_exactly_one_shard(count):
+    selected = []
+    for index in range(1, count + 1):
+        items, loads = TestScheduler.select_shard(TEST_CASES, f"{index}/{count}", durations=DURATIONS)
+        selected += ids(items)
+        assert len(loads) == count
+    
+    assert sorted(selected) == sorted(DURATIONS)
+
+@pytest.mark.parametrize("count", [2, 3, 4])
+def test_shards_are_balanced(count):
+    shards = TestScheduler.plan_shards(TEST_CASES, count, durations=DURATIONS)
+    loads = [shard["expected_seconds"] for shard in shards]
+    
+    # Greedy LPT: chênh lệch giữa các shard không vượt quá test dài nhất
+    assert max(loads) - min(loads) <= max(DURATIONS.values())
+    assert sum(loads) == pytest.approx(sum(DURATIONS.values()))
+    assert loads == [sum(DURATIONS[test_id] for test_id in ids(shard["items"])) for shard in shards]
+
+def test_shard_plan_for_known_durations():
+    shards = TestScheduler.plan_shards(TEST_CASES, 2, durations=DURATIONS)
+    
+    assert ids(shards[0]["items"]) == ["TC06", "TC09"]
+    assert ids(shards[1]["items"]) == ["TC05", "TC07", "TC08", "TC10"]
+    assert [shard["expected_seconds"] for shard in shards] == [425, 504]
+
+def test_shard_keeps_original_order():
+    items, _ = TestScheduler.select_shard(TEST_CASES, "2/2", durations=DURATIONS)
+    
+    assert ids(items) == [test_id for test_id in DURATIONS if test_id in ids(items)]
+
+def test_no_history_falls_back_to_default_duration(no_history):
+    estimates = TestScheduler.estimate(list(DURATIONS))
+    
+    assert set(estimates.values()) == {test_scheduler.SHARD_DEFAULT_DURATION}
+
+def test_without_shared_history_shards_split_by_position(local_history):
+    shards = TestScheduler.plan_shards(TEST_CASES, 3)
+    
+    assert [ids(shard["items"]) for shard in shards] == [["TC05", "TC08"], ["TC06", "TC09"], ["TC07", "TC10"]]
+    assert [shard["expected_seconds"] for shard in shards] == [2 * test_scheduler.SHARD_DEFAULT_DURATION] * 3
+
+@pytest.mark.parametrize("count", [1, 4, 6])
+def test_position_split_assigns_every_test_once(local_history, count):
+    selected = []
+    for index in range(1, count + 1):
+        selected += ids(TestScheduler.select_shard(TEST_CASES, f"{index}/{count}")[0])
+    
+    assert sorted(selected) == sorted(DURATIONS)
+
+@pytest.mark.parametrize("durations", [None, DURATIONS])
+def test_shard_without_tests_is_empty(local_history, durations):
+    items, loads = TestScheduler.select_shard(TEST_CASES, "8/8", durations=durations)
+    
+    assert items == []
+    assert loads[-1] == 0
+
+def test_unknown_test_uses_median_of_known_tests():
+    estimates = TestScheduler.estimate(["TC05", "TC06", "TC07", "TC99"], durations={"TC05": 30, "TC06": 10, "TC07": 20})
+    
+    assert estimates["TC99"] == 20
+
+def test_default_order_is_unchanged():
+    assert ids(TestScheduler.order(TEST_CASES, "default", durations=DURATIONS)) == list(DURATIONS)
+
+def test_lpt_order_runs_longest_first():
+    ordered = TestScheduler.order(TEST_CASES, "lpt", durations=DURATIONS)
+    
+    assert ids(ordered) == ["TC09", "TC05", "TC07", "TC08", "TC10", "TC06"]
+
+def test_failures_first_order(monkeypatch):
+    monkeypatch.setattr(TestHistory, "last_statuses",
+                        lambda **kwargs: {"TC06": "FAILED", "TC10": "ERROR", "TC09": "PASSED"})
+    
+    ordered = TestScheduler.order(TEST_CASES, "failures-first", durations=DURATIONS)
+    
+    assert ids(ordered) == ["TC10", "TC06", "TC09", "TC05", "TC07", "TC08"]
+
+def test_unknown_order_is_rejected():
+    with pytest.raises(ValueError):
+        TestScheduler.order(TEST_CASES, "random", durations=DURATIONS)
+
+@pytest.mark.parametrize("workers, expected", [(1, 929), (2, 504), (6, 410)])
+def test_expected_makespan(workers, expected):
+    ordered = TestScheduler.order(TEST_CASES, "lpt", durations=DURATIONS)
+    
+    assert TestScheduler.expected_makespan(ordered, workers, durations=DURATIONS) == expected
+
+def test_lpt_order_does_not_increase_makespan():
+    default = TestScheduler.expected_makespan(TEST_CASES, 2, durations=DURATIONS)
+    lpt = TestScheduler.expected_makespan(TestScheduler.order(TEST_CASES, "lpt", durations=DURATIONS), 2, durations=DURATIONS)
+    
+    assert lpt <= default
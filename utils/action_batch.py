@@ -0,0 +1,190 @@
+"""
+Gom chuỗi thao tác (click, nhập, chờ ổn định, đọc trạng thái) vào một roundtrip WebDriver
+"""
+
+import logging
+import time
+from config.settings import *
+from config.locators import ProductPageLocators
+from utils.browser_scripts import ACTION_BATCH
+from utils.run_metrics import RunMetrics
+from utils.deadline import Deadline
+from utils.test_helpers import TestHelpers
+from utils.screenshot_pipeline import ScreenshotPipeline
+
+class ActionBatch:
+    """
+    Mô tả một chuỗi thao tác rồi chạy trong một execute_async_script
+    
+    Ví dụ:
+        result = (ActionBatch(driver)
+                  .click(ProductPageLocators.CATEGORY_LABELS["khac"], name="select_category")
+                  .set_value(ProductPageLocators.QUANTITY_INPUT, 5, name="quantity")
+                  .click(ProductPageLocators.ADD_TO_CART_BUTTON, name="add_to_cart")
+                  .settle(name="add_to_cart_settle")
+                  .read_state()
+                  .run())
+        quantity = ActionBatch.step(result, "quantity")
+    
+    Tên bước phải khác nhau để đọc kết quả theo tên bằng step().
+    """
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.steps = []
+    
+    def click(self, selectors, name="click", optional=False):
+        """
+        Click element đầu tiên có thể thao tác và không bị che (cuộn tức thì)
+        
+        Args:
+            selectors: Selector hoặc list selectors theo thứ tự ưu tiên
+            name: Tên bước
+            optional: Bước thất bại không dừng batch
+        """
+        self._add({
+            "type": "click",
+            "name": name,
+            "selectors": ActionBatch._as_list(selectors),
+            "optional": optional,
+            "arm": False
+        })
+        return self
+    
+    def set_value(self, selectors, value, name="set_value", optional=False):
+        """Set value của input qua native setter (None được coi là rỗng)"""
+        self._add({
+            "type": "set_value",
+            "name": name,
+            "selectors": ActionBatch._as_list(selectors),
+            "value": "" if value is None else str(value),
+            "optional": optional
+        })
+        return self
+    
+    def settle(self, name="settle", quiet_window=SETTLE_QUIET_WINDOW, timeout=SETTLE_TIMEOUT):
+        """
+        Chờ request xong và DOM yên lặng sau click gần nhất
+        
+        Settle tracker được bật ngay trước click đó. Hết timeout thì ghi nhận
+        nhưng vẫn chạy tiếp các bước sau.
+        """
+        for step in reversed(self.steps):
+            if step["type"] == "click":
+                step["arm"] = True
+                break
+        self._add({
+            "type": "settle",
+            "name": name,
+            "quietMs": quiet_window * 1000,
+            "timeoutMs": timeout * 1000,
+            "optional": True
+        })
+        return self
+    
+    def read_state(self, name="state", expected_text=None, locators=None):
+        """Đọc snapshot trạng thái trang (giống TestHelpers.snapshot_state)"""
+        self._add({
+            "type": "read_state",
+            "name": name,
+            "locators": locators or ProductPageLocators.STATE_SNAPSHOT,
+            "expected": expected_text,
+            "optional": False
+        })
+        return self
+    
+    def run(self, request_pattern=ADD_TO_CART_REQUEST_PATTERN):
+        """
+        Chạy toàn bộ batch
+        
+        Args:
+            request_pattern: Chuỗi trong URL của request chính, dùng khi tính latency cho bước settle
+        
+        Returns:
+            dict: ok, failed_at (index bước lỗi hoặc None), failed_step, steps (name, type, ok, ms,
+                  selector, error, data), state (snapshot cuối), elapsed (cả roundtrip)
+        """
+        start_time = time.time()
+        for step in self.steps:
+            if step["type"] == "settle":
+                step["timeoutMs"] = Deadline.clamp(step["timeoutMs"] / 1000, step["name"]) * 1000
+        try:
+            raw = self.driver.execute_async_script(ACTION_BATCH, self.steps)
+        except Exception as e:
+            logging.error(f"Action batch failed: {str(e)}")
+            return {
+                "ok": False,
+                "failed_at": None,
+                "failed_step": None,
+                "error": str(e),
+                "steps": [],
+                "state": None,
+                "elapsed": round(time.time() - start_time, 3)
+            }
+        
+        steps = []
+        state = None
+        for step in raw["steps"]:
+            entry = {
+                "name": step["name"],
+                "type": step["type"],
+                "ok": step["ok"],
+                "ms": round(step["ms"], 1),
+                "selector": step["selector"],
+                "error": step["error"],
+                "data": step["data"]
+            }
+            if step["type"] == "settle":
+                entry["data"] = TestHelpers.summarize_settle(step["data"], request_pattern)
+                RunMetrics.append("settle", dict(entry["data"], label=step["name"], settled=step["ok"],
+                                                 navigated=False, elapsed=round(step["ms"] / 1000, 3)))
+                if not step["ok"] and Deadline.expired():
+                    Deadline.mark_expired(step["name"])
+            elif step["type"] == "read_state" and step["data"]:
+                state = entry["data"] = TestHelpers.parse_snapshot(step["data"])
+            steps.append(entry)
+        
+        failed_at = raw["failedAt"]
+        result = {
+            "ok": failed_at is None,
+            "failed_at": failed_at,
+            "failed_step": steps[failed_at]["name"] if failed_at is not None else None,
+            "error": steps[failed_at]["error"] if failed_at is not None else None,
+            "steps": steps,
+            "state": state,
+            "elapsed": round(time.time() - start_time, 3)
+        }
+        
+        timings = ", ".join(f"{step['name']} {step['ms']:.0f}ms" for step in steps)
+        if result["ok"]:
+            logging.info(f"Action batch completed in {result['elapsed']:.2f}s ({timings})")
+        else:
+            logging.warning(f"Action batch failed at step {failed_at} '{result['failed_step']}': {result['error']}")
+        ScreenshotPipeline.record_frame(self.driver, result["failed_step"] or "batch")
+        return result
+    
+    @staticmethod
+    def step(result, name):
+        """
+        Kết quả của một bước theo tên
+        
+        Args:
+            result: Kết quả của run()
+            name: Tên bước
+        
+        Returns:
+            dict or None: Step (name, type, ok, ms, selector, error, data), None nếu bước không chạy
+        """
+        for step in result["steps"]:
+            if step["name"] == name:
+                return step
+        return None
+    
+    def _add(self, step):
+        if any(existing["name"] == step["name"] for existing in self.steps):
+            raise ValueError(f"Duplicate action batch step name '{step['name']}'")
+        self.steps.append(step)
+    
+    @staticmethod
+    def _as_list(selectors):
+        return [selectors] if isinstance(selectors, str) else list(selectors)
@@ -0,0 +1,429 @@
+"""
+JavaScript chạy trong browser qua execute_script
+Gom nhiều thao tác vào một roundtrip WebDriver
+"""
+
+# Helpers dùng chung: tìm element theo CSS/XPath và kiểm tra có thể thao tác
+QUERY_HELPERS = """
+function __qaFind(selector) {
+    try {
+        if (selector.indexOf('//') === 0) {
+            return document.evaluate(selector, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        return document.querySelector(selector);
+    } catch (e) {
+        return null;
+    }
+}
+
+function __qaVisible(el) {
+    if (!el || !el.isConnected) return false;
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden') return false;
+    return el.getClientRects().length > 0;
+}
+
+function __qaInteractable(el) {
+    return __qaVisible(el) && !el.disabled && el.getAttribute('aria-disabled') !== 'true';
+}
+
+// URL + hash (FNV-1a) của script/stylesheet cùng origin - đổi khi site deploy bundle mới
+function __qaFingerprint() {
+    var assets = [];
+    var nodes = document.querySelectorAll('script[src], link[rel="stylesheet"][href]');
+    for (var i = 0; i < nodes.length; i++) {
+        var url = nodes[i].src || nodes[i].href;
+        try {
+            if (new URL(url).origin === location.origin) assets.push(url);
+        } catch (e) {}
+    }
+    assets.sort();
+    var text = assets.join('|');
+    var hash = 0x811c9dc5;
+    for (var j = 0; j < text.length; j++) {
+        hash ^= text.charCodeAt(j);
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return location.origin + location.pathname + '#' + hash.toString(16);
+}
+"""
+
+# arguments[0]: {name: [selectors]} -> {readyState, pending: [names]}
+CHECK_READINESS = QUERY_HELPERS + """
+var requirements = arguments[0];
+var pending = [];
+for (var name in requirements) {
+    var selectors = requirements[name];
+    var ok = false;
+    for (var i = 0; i < selectors.length && !ok; i++) {
+        ok = __qaInteractable(__qaFind(selectors[i]));
+    }
+    if (!ok) pending.push(name);
+}
+return {readyState: document.readyState, pending: pending};
+"""
+
+# arguments[0]: [selectors], arguments[1]: chỉ nhận element có thể thao tác,
+# arguments[2]: {fingerprint, selector} đã thắng lần trước (hoặc null)
+# -> {fingerprint, match: {index, selector, element, matched, cached} hoặc null}
+RESOLVE_SELECTORS = QUERY_HELPERS + """
+var selectors = arguments[0];
+var clickable = arguments[1];
+var preferred = arguments[2];
+var fingerprint = __qaFingerprint();
+
+function usable(el) {
+    return el && (!clickable || __qaInteractable(el));
+}
+
+// Cache hit: chỉ một query
+if (preferred && preferred.fingerprint === fingerprint) {
+    var cachedIndex = selectors.indexOf(preferred.selector);
+    var cachedEl = cachedIndex >= 0 ? __qaFind(preferred.selector) : null;
+    if (usable(cachedEl)) {
+        return {fingerprint: fingerprint, match: {
+            index: cachedIndex, selector: preferred.selector, element: cachedEl, matched: 1, cached: true
+        }};
+    }
+}
+
+var best = null;
+var matched = 0;
+for (var i = 0; i < selectors.length; i++) {
+    var el = __qaFind(selectors[i]);
+    if (!usable(el)) continue;
+    matched++;
+    if (best === null) best = {index: i, selector: selectors[i], element: el, cached: false};
+}
+if (best) best.matched = matched;
+return {fingerprint: fingerprint, match: best};
+"""
+
+# arguments[0]: element -> cuộn tức thì (không animation), trả true khi tâm element nằm trong viewport
+SCROLL_INTO_VIEW = """
+var el = arguments[0];
+el.scrollIntoView({behavior: 'instant', block: 'center', inline: 'nearest'});
+var rect = el.getBoundingClientRect();
+var x = rect.left + rect.width / 2;
+var y = rect.top + rect.height / 2;
+return x >= 0 && y >= 0 && x <= window.innerWidth && y <= window.innerHeight;
+"""
+
+# Theo dõi DOM mutations và fetch/XMLHttpRequest: __qaArmSettle() cài hook (một lần mỗi page)
+# và bắt đầu một lượt theo dõi mới, __qaReadSettle() đọc trạng thái (null nếu page đã điều hướng)
+SETTLE_HELPERS = """
+function __qaArmSettle() {
+    var tracker = window.__qaSettle;
+    if (!tracker) {
+        tracker = window.__qaSettle = {generation: 0, pending: 0, requests: [], mutations: 0};
+    
+        var begin = function (method, url) {
+            var entry = {generation: tracker.generation, method: method, url: String(url), start: performance.now(), end: null, status: null};
+            tracker.requests.push(entry);
+            tracker.pending++;
+            return entry;
+        };
+        var finish = function (entry, status) {
+            if (entry.end !== null) return;
+            entry.end = performance.now();
+            entry.status = status;
+            if (entry.generation === tracker.generation) tracker.pending--;
+        };
+    
+        if (window.fetch) {
+            var originalFetch = window.fetch;
+            window.fetch = function (input, init) {
+                var method = (init && init.method) || (input && input.method) || 'GET';
+                var entry = begin(method, (input && input.url) || input);
+                return originalFetch.apply(this, arguments).then(function (response) {
+                    finish(entry, response.status);
+                    return response;
+                }, function (error) {
+                    finish(entry, 0);
+                    throw error;
+                });
+            };
+        }
+    
+        var originalOpen = XMLHttpRequest.prototype.open;
+        var originalSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.open = function (method, url) {
+            this.__qaRequest = {method: method, url: url};
+            return originalOpen.apply(this, arguments);
+        };
+        XMLHttpRequest.prototype.send = function () {
+            var xhr = this;
+            var info = xhr.__qaRequest || {method: 'GET', url: ''};
+            var entry = begin(info.method, info.url);
+            xhr.addEventListener('loadend', function () { finish(entry, xhr.status); });
+            return originalSend.apply(this, arguments);
+        };
+    
+        new MutationObserver(function (mutations) {
+            tracker.mutations += mutations.length;
+            tracker.lastMutation = performance.now();
+        }).observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    }
+    
+    tracker.generation++;
+    tracker.pending = 0;
+    tracker.requests = [];
+    tracker.mutations = 0;
+    tracker.armedAt = performance.now();
+    tracker.lastMutation = null;
+    return tracker;
+}
+
+function __qaReadSettle() {
+    var tracker = window.__qaSettle;
+    if (!tracker) return null;
+    return {
+        now: performance.now(),
+        armedAt: tracker.armedAt,
+        pending: tracker.pending,
+        mutations: tracker.mutations,
+        lastMutation: tracker.lastMutation,
+        requests: tracker.requests
+    };
+}
+"""
+
+# Gọi trước action, sau đó poll READ_SETTLE_STATE
+ARM_SETTLE_TRACKER = SETTLE_HELPERS + """
+__qaArmSettle();
+return true;
+"""
+
+# -> {now, armedAt, pending, mutations, lastMutation, requests} hoặc null nếu page đã điều hướng
+READ_SETTLE_STATE = SETTLE_HELPERS + """
+return __qaReadSettle();
+"""
+
+# __qaSetValue(el, text): set qua native value setter (React/Vue nhận được) rồi bắn input/change/blur,
+# trả initialValue, committedValue, validity, elapsedMs
+INPUT_HELPERS = """
+function __qaSetValue(el, text) {
+    var start = performance.now();
+    var initialValue = el.value;
+    el.scrollIntoView({behavior: 'instant', block: 'center'});
+    el.focus();
+    var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+    setter.call(el, text);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+    var v = el.validity || {};
+    return {
+        initialValue: initialValue,
+        committedValue: el.value,
+        validity: {
+            valid: v.valid !== false,
+            badInput: !!v.badInput,
+            valueMissing: !!v.valueMissing,
+            rangeOverflow: !!v.rangeOverflow,
+            rangeUnderflow: !!v.rangeUnderflow,
+            stepMismatch: !!v.stepMismatch,
+            patternMismatch: !!v.patternMismatch,
+            message: el.validationMessage || ''
+        },
+        elapsedMs: performance.now() - start
+    };
+}
+"""
+
+# arguments[0]: input element, arguments[1]: text
+SET_INPUT_VALUE = INPUT_HELPERS + """
+return __qaSetValue(arguments[0], arguments[1]);
+"""
+
+# __qaSnapshot(locators, expected): locators {quantity, errors, alerts, cart: [selectors]}, expected: text cần tìm
+# -> {url, quantityValue, errors, alerts, cartText, cartCount, expectedText}
+STATE_HELPERS = """
+function __qaFindAll(selector) {
+    try {
+        if (selector.indexOf('//') === 0) {
+            var result = document.evaluate(selector, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+        }
+        return Array.prototype.slice.call(document.querySelectorAll(selector));
+    } catch (e) {
+        return [];
+    }
+}
+
+function __qaVisibleTexts(selectors) {
+    var texts = [];
+    for (var i = 0; i < (selectors || []).length && texts.length < 10; i++) {
+        var nodes = __qaFindAll(selectors[i]);
+        for (var j = 0; j < nodes.length && texts.length < 10; j++) {
+            if (!__qaVisible(nodes[j])) continue;
+            var text = (nodes[j].innerText || '').trim().substring(0, 300);
+            if (text && texts.indexOf(text) < 0) texts.push(text);
+        }
+    }
+    return texts;
+}
+
+function __qaSnapshot(locators, expected) {
+    var quantityValue = null;
+    for (var q = 0; q < (locators.quantity || []).length && quantityValue === null; q++) {
+        var input = __qaFind(locators.quantity[q]);
+        if (input) quantityValue = input.value;
+    }
+    
+    var cartTexts = __qaVisibleTexts(locators.cart);
+    var cartText = cartTexts.length ? cartTexts[0] : null;
+    var digits = cartText ? cartText.replace(/[^0-9]/g, '') : '';
+    
+    var expectedText = null;
+    if (expected) {
+        var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, null, false);
+        while (walker.nextNode()) {
+            var parent = walker.currentNode.parentElement;
+            if (walker.currentNode.nodeValue.indexOf(expected) >= 0 && __qaVisible(parent)) {
+                expectedText = parent.innerText.trim();
+                break;
+            }
+        }
+    }
+    
+    return {
+        url: location.href,
+        quantityValue: quantityValue,
+        errors: __qaVisibleTexts(locators.errors),
+        alerts: __qaVisibleTexts(locators.alerts),
+        cartText: cartText,
+        cartCount: digits ? parseInt(digits, 10) : null,
+        expectedText: expectedText
+    };
+}
+"""
+
+# arguments[0]: locators, arguments[1]: text cần tìm (hoặc null) - đọc trạng thái trong một roundtrip
+SNAPSHOT_STATE = QUERY_HELPERS + STATE_HELPERS + """
+return __qaSnapshot(arguments[0], arguments[1]);
+"""
+
+# Chạy tuần tự các bước trong một execute_async_script.
+# arguments[0]: [{type: click|set_value|settle|read_state, name, selectors, value, optional,
+#                 quietMs, timeoutMs, locators, expected}]
+# -> {steps: [{name, type, ok, ms, selector, error, data}], failedAt}
+ACTION_BATCH = QUERY_HELPERS + SETTLE_HELPERS + INPUT_HELPERS + STATE_HELPERS + """
+var steps = arguments[0];
+var done = arguments[arguments.length - 1];
+var results = [];
+
+function locate(step, actionable) {
+    for (var i = 0; i < step.selectors.length; i++) {
+        var el = __qaFind(step.selectors[i]);
+        if (!el) continue;
+        el.scrollIntoView({behavior: 'instant', block: 'center', inline: 'nearest'});
+        if (actionable && !__qaInteractable(el)) continue;
+        return {element: el, selector: step.selectors[i]};
+    }
+    return null;
+}
+
+function unobscured(el) {
+    var rect = el.getBoundingClientRect();
+    var top = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+    return !top || top === el || el.contains(top) || top.contains(el) || (el.control && el.control === top);
+}
+
+function waitSettled(step) {
+    var deadline = performance.now() + step.timeoutMs;
+    return new Promise(function (resolve) {
+        (function poll() {
+            var state = __qaReadSettle();
+            var ends = state.requests.filter(function (r) { return r.end !== null; }).map(function (r) { return r.end; });
+            var last = Math.max.apply(null, [state.armedAt, state.lastMutation || 0].concat(ends));
+            var quiet = state.pending === 0 && state.now - last >= step.quietMs;
+            if (quiet || state.now >= deadline) {
+                state.settled = quiet;
+                resolve(state);
+            } else {
+                setTimeout(poll, 25);
+            }
+        })();
+    });
+}
+
+async function run(step) {
+    if (step.type === 'click' || step.type === 'set_value') {
+        var found = locate(step, true);
+        if (!found) throw new Error('no actionable element for ' + step.name);
+        if (step.type === 'click') {
+            if (!unobscured(found.element)) throw new Error('element obscured: ' + found.selector);
+            if (step.arm) __qaArmSettle();
+            found.element.click();
+            return {selector: found.selector};
+        }
+        return {selector: found.selector, data: __qaSetValue(found.element, step.value)};
+    }
+    if (step.type === 'settle') {
+        if (!window.__qaSettle) __qaArmSettle();
+        var state = await waitSettled(step);
+        if (!state.settled) throw Object.assign(new Error('not settled after ' + step.timeoutMs + 'ms'), {data: state});
+        return {data: state};
+    }
+    if (step.type === 'read_state') {
+        return {data: __qaSnapshot(step.locators, step.expected)};
+    }
+    throw new Error('unknown step type ' + step.type);
+}
+
+(async function () {
+    var failedAt = null;
+    for (var i = 0; i < steps.length; i++) {
+        var step = steps[i];
+        var start = performance.now();
+        var entry = {name: step.name, type: step.type, ok: true, selector: null, error: null, data: null};
+        try {
+            var outcome = await run(step);
+            entry.selector = outcome.selector || null;
+            entry.data = outcome.data || null;
+        } catch (e) {
+            entry.ok = false;
+            entry.error = String(e.message || e);
+            entry.data = e.data || null;
+        }
+        entry.ms = performance.now() - start;
+        results.push(entry);
+        if (!entry.ok && !step.optional) {
+            failedAt = i;
+            break;
+        }
+    }
+    done({steps: results, failedAt: failedAt});
+})();
+"""
+
+# arguments[0]: [selectors], arguments[1]: quiet window (ms)
+# -> {found: {selector, text} của element đang hiển thị đầu tiên hoặc null, settled: trang đã ổn định}
+ABSENCE_CHECK = QUERY_HELPERS + SETTLE_HELPERS + STATE_HELPERS + """
+var selectors = arguments[0];
+var quietMs = arguments[1];
+var found = null;
+for (var i = 0; i < selectors.length && !found; i++) {
+    var nodes = __qaFindAll(selectors[i]);
+    for (var j = 0; j < nodes.length; j++) {
+        if (__qaVisible(nodes[j])) {
+            found = {selector: selectors[i], text: (nodes[j].innerText || '').trim().substring(0, 300)};
+            break;
+        }
+    }
+}
+
+var settled = false;
+var state = __qaReadSettle();
+if (state) {
+    var ends = state.requests.filter(function (r) { return r.end !== null; }).map(function (r) { return r.end; });
+    var last = Math.max.apply(null, [state.armedAt, state.lastMutation || 0].concat(ends));
+    settled = state.pending === 0 && state.now - last >= quietMs;
+}
+return {found: found, settled: settled};
+"""
@@ -0,0 +1,125 @@
+"""
+Deadline cho từng test case: mọi wait lấy timeout từ thời gian còn lại của test
+"""
+
+import threading
+import time
+
+class Deadline:
+    """Thời gian còn lại của test case hiện tại, lưu theo từng thread như RunMetrics"""
+    
+    _local = threading.local()
+    
+    @staticmethod
+    def begin(test_id, budget):
+        """
+        Bắt đầu deadline cho một test case
+        
+        Args:
+            test_id: ID của test case
+            budget: Tổng thời gian cho phép (seconds), None để tắt
+        """
+        Deadline._local.state = {
+            "test_id": test_id,
+            "budget": budget,
+            "started": time.time(),
+            "expires": time.time() + budget if budget else None,
+            "expired_at": None,
+            "last_step": None,
+            "charges": {}
+        }
+    
+    @staticmethod
+    def end():
+        """
+        Kết thúc deadline
+        
+        Returns:
+            dict: budget, elapsed, expired, expired_at (bước hết thời gian), top_waits
+        """
+        state = getattr(Deadline._local, "state", None)
+        Deadline._local.state = None
+        if state is None:
+            return {}
+        
+        # Hết thời gian mà sau đó không còn wait nào: quy cho bước chờ cuối cùng
+        if state["expired_at"] is None and state["expires"] is not None and time.time() >= state["expires"]:
+            state["expired_at"] = state["last_step"] or "test body"
+        
+        top_waits = sorted(state["charges"].items(), key=lambda item: item[1], reverse=True)[:5]
+        return {
+            "budget": state["budget"],
+            "elapsed": round(time.time() - state["started"], 2),
+            "expired": state["expired_at"] is not None,
+            "expired_at": state["expired_at"],
+            "top_waits": [{"step": step, "seconds": round(seconds, 2)} for step, seconds in top_waits]
+        }
+    
+    @staticmethod
+    def remaining():
+        """Số giây còn lại, hoặc None nếu không có deadline"""
+        state = getattr(Deadline._local, "state", None)
+        if state is None or state["expires"] is None:
+            return None
+        return max(state["expires"] - time.time(), 0.0)
+    
+    @staticmethod
+    def expired():
+        """True nếu test hiện tại đã hết thời gian"""
+        remaining = Deadline.remaining()
+        return remaining is not None and remaining <= 0
+    
+    @staticmethod
+    def clamp(timeout, step="wait"):
+        """
+        Giới hạn timeout theo thời gian còn lại của test
+        
+        Args:
+            timeout: Timeout mong muốn (seconds)
+            step: Tên bước, ghi lại nếu deadline hết tại bước này
+        
+        Returns:
+            float: Timeout thực tế (0 nếu đã hết thời gian)
+        """
+        remaining = Deadline.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            Deadline.mark_expired(step)
+            return 0
+        return min(timeout, remaining)
+    
+    @staticmethod
+    def mark_expired(step):
+        """
+        Ghi nhận bước đã dùng hết thời gian của test (chỉ giữ bước đầu tiên)
+        
+        Gọi khi một wait/sleep đã bị clamp chạy hết timeout, để báo cáo đúng bước
+        tiêu tốn budget thay vì bước kế tiếp.
+        """
+        state = getattr(Deadline._local, "state", None)
+        if state is not None and state["expired_at"] is None:
+            state["expired_at"] = step
+    
+    @staticmethod
+    def charge(step, seconds):
+        """Cộng thời gian chờ vào bước tương ứng (dùng cho báo cáo khi hết deadline)"""
+        state = getattr(Deadline._local, "state", None)
+        if state is not None:
+            state["charges"][step] = state["charges"].get(step, 0.0) + seconds
+            state["last_step"] = step
+    
+    @staticmethod
+    def describe(report):
+        """
+        Mô tả ngắn khi test hết deadline
+        
+        Args:
+            report: Kết quả Deadline.end()
+        
+        Returns:
+            str: Bước hết thời gian và các bước chờ lâu nhất
+        """
+        waits = ", ".join(f"{item['step']} {item['seconds']}s" for item in report.get("top_waits", []))
+        return (f"Test deadline of {report['budget']}s exceeded at '{report['expired_at']}'"
+                f" (longest waits: {waits or 'none'})")
@@ -5,13 +5,250 @@ Quản lý WebDriver với các tính năng nâng cao
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from config.settings import *
+from utils.driver_resolver import DriverResolver
+from utils.run_metrics import RunMetrics
+from utils.stand_in_server import StandInServer
+import atexit
+import json
 import logging
+import os
+import threading
+import time
+
+class DriverPool:
+    """Pool các WebDriver session đã khởi động sẵn, cho mượn và thu hồi giữa các test"""
+    
+    def __init__(self, factory, max_size=DRIVER_POOL_SIZE, max_uses=DRIVER_POOL_MAX_USES):
+        """
+        Args:
+            factory: Callable tạo WebDriver mới
+            max_size: Số session tối đa (idle + đang được mượn)
+            max_uses: Số lần cho mượn trước khi recycle session
+        """
+        self._factory = factory
+        self._max_size = max_size
+        self._max_uses = max_uses
+        self._idle = []
+        self._uses = {}
+        self._leased = set()
+        self._starting = 0
+        self._warming = 0
+        self._warm_launch = {}
+        self._condition = threading.Condition()
+    
+    def _size(self):
+        return len(self._idle) + len(self._leased) + self._starting
+    
+    def lease(self, timeout=DRIVER_POOL_LEASE_TIMEOUT):
+        """
+        Mượn một session từ pool, khởi động mới nếu pool chưa đầy
+        
+        Args:
+            timeout: Thời gian tối đa chờ một session rảnh
+        
+        Returns:
+            WebDriver: Session sẵn sàng sử dụng
+        """
+        deadline = time.time() + timeout
+        
+        while True:
+            driver = None
+            with self._condition:
+                # Chờ session đang warm-up thay vì khởi động thêm một browser
+                while not self._idle and (self._size() >= self._max_size or self._warming):
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No pooled WebDriver available after {timeout}s")
+                    self._condition.wait(remaining)
+                
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    self._starting += 1
+            
+            if driver is None:
+                try:
+                    driver = self._factory()
+                except Exception:
+                    with self._condition:
+                        self._starting -= 1
+                        self._condition.notify_all()
+                    raise
+                with self._condition:
+                    self._starting -= 1
+                    self._leased.add(driver)
+                    self._uses[id(driver)] = uses = 1
+            elif not DriverPool.is_alive(driver):
+                logging.warning("Pooled WebDriver crashed while idle, recycling")
+                self._discard(driver)
+                continue
+            else:
+                with self._condition:
+                    self._leased.add(driver)
+                    self._uses[id(driver)] = uses = self._uses.get(id(driver), 0) + 1
+            
+            logging.info(f"WebDriver leased from pool (use {uses}/{self._max_uses})")
+            return driver
+    
+    def release(self, driver, crashed=False):
+        """
+        Trả session về pool sau khi reset trạng thái, hoặc recycle nếu cần
+        
+        Args:
+            driver: WebDriver đã mượn
+            crashed: True nếu test phát hiện browser bị lỗi
+        """
+        with self._condition:
+            if driver not in self._leased:
+                logging.warning("Released WebDriver is not leased from this pool, quitting it")
+                self._discard(driver)
+                return
+            self._leased.discard(driver)
+            recycle = crashed or self._uses.get(id(driver), 0) >= self._max_uses
+        
+        if not recycle:
+            try:
+                reset_result = DriverManager.reset_session(driver)
+                if not reset_result["verified"]:
+                    logging.warning("Pooled WebDriver still has state after reset, recycling")
+                    recycle = True
+            except Exception as e:
+                logging.warning(f"Failed to reset pooled WebDriver, recycling: {str(e)}")
+                recycle = True
+        
+        if recycle:
+            self._discard(driver)
+        else:
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify_all()
+            logging.info("WebDriver returned to pool")
+    
+    def _discard(self, driver):
+        """Quit session và loại khỏi pool"""
+        with self._condition:
+            self._uses.pop(id(driver), None)
+            self._warm_launch.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._condition:
+            self._condition.notify_all()
+        logging.info("WebDriver recycled")
+    
+    def warm_up(self, count=1):
+        """
+        Khởi động trước session để luôn có ít nhất `count` session idle hoặc đang khởi động
+        
+        Args:
+            count: Số session idle mong muốn
+        """
+        while True:
+            with self._condition:
+                if len(self._idle) + self._warming >= count or self._size() >= self._max_size:
+                    return
+                self._starting += 1
+                self._warming += 1
+            
+            launch_start = time.time()
+            try:
+                driver = self._factory()
+            except Exception:
+                with self._condition:
+                    self._starting -= 1
+                    self._warming -= 1
+                    self._condition.notify_all()
+                raise
+            
+            with self._condition:
+                self._starting -= 1
+                self._warming -= 1
+                self._uses[id(driver)] = 0
+                self._warm_launch[id(driver)] = time.time() - launch_start
+                self._idle.append(driver)
+                self._condition.notify_all()
+    
+    def resize(self, max_size):
+        """
+        Tăng số session tối đa của pool (không giảm để tránh quit session đang được mượn)
+        
+        Args:
+            max_size: Số session tối đa mong muốn
+        """
+        with self._condition:
+            self._max_size = max(self._max_size, max_size)
+            self._condition.notify_all()
+    
+    def needs_warm_session(self):
+        """True nếu lần lease kế tiếp sẽ phải khởi động browser mới"""
+        with self._condition:
+            if self._idle or self._warming:
+                return False
+            return all(self._uses.get(id(driver), 0) >= self._max_uses for driver in self._leased)
+    
+    def take_warm_launch(self, driver):
+        """
+        Lấy thời gian khởi động của session được warm-up trong background
+        
+        Returns:
+            float or None: Launch seconds, None nếu session không phải warm-up
+        """
+        with self._condition:
+            return self._warm_launch.pop(id(driver), None)
+    
+    def shutdown(self):
+        """Quit tất cả session trong pool"""
+        with self._condition:
+            drivers = self._idle + list(self._leased)
+            self._idle = []
+            self._leased.clear()
+            self._uses.clear()
+            self._warm_launch.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
+    @staticmethod
+    def is_alive(driver):
+        """Kiểm tra browser còn phản hồi không"""
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
 
 class DriverManager:
     """Quản lý WebDriver instance"""
     
+    # Resource type -> URL patterns cho Network.setBlockedURLs
+    RESOURCE_TYPE_PATTERNS = {
+        "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*", "*/_next/image*"],
+        "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+        "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.m3u8*"],
+        "stylesheet": ["*.css*"]
+    }
+    
+    _pool = None
+    _pool_lock = threading.Lock()
+    _resource_policies = {}
+    _interceptors = {}
+    _prespawned = None
+    _upcoming = 0
+    _prespawn_lock = threading.Lock()
+    _resource_baseline = None
+    _baseline_lock = threading.Lock()
+    _local = threading.local()
+    
+    # Lỗi cho thấy browser/session không còn dùng được
+    SESSION_ERROR_MARKERS = (
+        "invalid session id", "session deleted", "chrome not reachable", "disconnected",
+        "no such window", "target window already closed", "tab crashed"
+    )
+    
     @staticmethod
     def get_driver():
         """
@@ -23,6 +260,7 @@ class DriverManager:
         try:
             if BROWSER.lower() == "chrome":
                 options = Options()
+                options.page_load_strategy = PAGE_LOAD_STRATEGY
                 
                 # Basic options
                 if HEADLESS:
@@ -36,8 +274,11 @@ class DriverManager:
                 options.add_argument("--disable-web-security")
                 options.add_argument("--allow-running-insecure-content")
                 
-                # Auto-download ChromeDriver
-                service = Service(ChromeDriverManager().install())
+                # Performance log để thống kê requests/bytes theo resource policy
+                options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+                
+                # ChromeDriver từ manifest cache (chỉ download khi cache stale)
+                service = Service(DriverResolver.resolve())
                 driver = webdriver.Chrome(service=service, options=options)
                 
             else:
@@ -55,4 +296,493 @@ class DriverManager:
             
         except Exception as e:
             logging.error(f"Failed to initialize WebDriver: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    @staticmethod
+    def get_pool():
+        """
+        Lấy driver pool dùng chung (khởi tạo lần đầu khi cần)
+        
+        Returns:
+            DriverPool: Shared pool instance
+        """
+        with DriverManager._pool_lock:
+            if DriverManager._pool is None:
+                DriverManager._pool = DriverPool(DriverManager.get_driver)
+                atexit.register(DriverManager.shutdown_pool)
+            return DriverManager._pool
+    
+    @staticmethod
+    def reserve_sessions(count):
+        """
+        Cho phép ít nhất `count` WebDriver cùng lúc (mỗi worker song song một session)
+        
+        Args:
+            count: Số session chạy đồng thời
+        """
+        if DRIVER_POOL_ENABLED:
+            DriverManager.get_pool().resize(count)
+    
+    @staticmethod
+    def acquire_driver(resource_policy=RESOURCE_POLICY):
+        """
+        Lấy WebDriver cho một test: mượn từ pool nếu bật, ngược lại tạo mới
+        
+        Args:
+            resource_policy: Tên policy trong RESOURCE_POLICIES áp dụng cho suite
+            
+        Returns:
+            WebDriver: Driver instance
+        """
+        StandInServer.ensure_started()
+        
+        acquire_start = time.time()
+        launch_seconds = None
+        
+        if DRIVER_POOL_ENABLED:
+            pool = DriverManager.get_pool()
+            driver = pool.lease()
+            launch_seconds = pool.take_warm_launch(driver)
+        else:
+            driver, launch_seconds = DriverManager._take_prespawned()
+            if driver is None:
+                driver = DriverManager.get_driver()
+        
+        wait_seconds = time.time() - acquire_start
+        if launch_seconds is not None:
+            hidden_seconds = max(launch_seconds - wait_seconds, 0.0)
+            RunMetrics.record("driver_launch", {
+                "source": "prespawned",
+                "launch_seconds": round(launch_seconds, 2),
+                "wait_seconds": round(wait_seconds, 2),
+                "hidden_seconds": round(hidden_seconds, 2)
+            })
+            logging.info(f"Prespawned WebDriver ready, hid {hidden_seconds:.2f}s of {launch_seconds:.2f}s launch")
+        else:
+            RunMetrics.record("driver_launch", {
+                "source": "pool" if DRIVER_POOL_ENABLED else "cold",
+                "wait_seconds": round(wait_seconds, 2)
+            })
+        
+        DriverManager.apply_resource_policy(driver, resource_policy)
+        if NETWORK_MODE != "live":
+            DriverManager.start_network_mode(driver, NETWORK_MODE)
+        DriverManager._prespawn_for_upcoming()
+        return driver
+    
+    @staticmethod
+    def start_network_mode(driver, mode):
+        """
+        Bật record/replay network cho driver qua CDP Fetch
+        
+        Args:
+            driver: WebDriver instance
+            mode: "record" hoặc "replay"
+            
+        Returns:
+            bool: Success status
+        """
+        from utils.network_replay import NetworkInterceptor
+        
+        interceptor = NetworkInterceptor(driver, mode)
+        if not interceptor.start():
+            return False
+        DriverManager._interceptors[id(driver)] = interceptor
+        return True
+    
+    @staticmethod
+    def stop_network_mode(driver):
+        """
+        Tắt record/replay network của driver
+        
+        Returns:
+            dict or None: Thống kê của interceptor
+        """
+        interceptor = DriverManager._interceptors.pop(id(driver), None)
+        if interceptor is None:
+            return None
+        stats = interceptor.stop()
+        stats["mode"] = interceptor.mode
+        logging.info(f"Network {interceptor.mode} stopped: {stats}")
+        return stats
+    
+    @staticmethod
+    def plan_prespawn(upcoming):
+        """
+        Bật pipeline: mỗi lần acquire_driver sẽ khởi động trước browser cho test kế tiếp
+        
+        Args:
+            upcoming: Số test còn lại sau test sắp chạy (0 để tắt)
+        """
+        with DriverManager._prespawn_lock:
+            DriverManager._upcoming = upcoming
+    
+    @staticmethod
+    def _prespawn_for_upcoming():
+        with DriverManager._prespawn_lock:
+            if DriverManager._upcoming <= 0:
+                return
+            DriverManager._upcoming -= 1
+        DriverManager.prespawn_driver()
+    
+    @staticmethod
+    def prespawn_driver():
+        """
+        Khởi động WebDriver cho test kế tiếp trên background thread
+        
+        Với pool: chỉ warm-up khi lần lease sau sẽ phải khởi động browser mới
+        
+        Returns:
+            bool: True nếu đã bắt đầu khởi động
+        """
+        if DRIVER_POOL_ENABLED:
+            pool = DriverManager.get_pool()
+            if not pool.needs_warm_session():
+                return False
+            
+            def launch():
+                try:
+                    pool.warm_up(1)
+                except Exception as e:
+                    logging.warning(f"Background WebDriver warm-up failed: {str(e)}")
+        else:
+            slot = {"driver": None, "error": None, "launch_seconds": None}
+            
+            def launch():
+                launch_start = time.time()
+                try:
+                    slot["driver"] = DriverManager.get_driver()
+                except Exception as e:
+                    slot["error"] = e
+                slot["launch_seconds"] = time.time() - launch_start
+            
+            # Slot chỉ được publish khi thread đã chạy để _take_prespawned luôn join được
+            slot["thread"] = threading.Thread(target=launch, name="driver-prespawn", daemon=True)
+            with DriverManager._prespawn_lock:
+                if DriverManager._prespawned is not None:
+                    return False
+                slot["thread"].start()
+                DriverManager._prespawned = slot
+            logging.info("Prespawning WebDriver for next test")
+            return True
+        
+        threading.Thread(target=launch, name="driver-prespawn", daemon=True).start()
+        logging.info("Warming pooled WebDriver for next test")
+        return True
+    
+    @staticmethod
+    def _take_prespawned():
+        """
+        Lấy browser đã prespawn (chờ nếu đang khởi động)
+        
+        Returns:
+            tuple: (driver or None, launch_seconds or None)
+        """
+        with DriverManager._prespawn_lock:
+            slot = DriverManager._prespawned
+            DriverManager._prespawned = None
+        if slot is None:
+            return None, None
+        
+        slot["thread"].join()
+        if slot["error"] is not None:
+            logging.warning(f"Prespawned WebDriver failed, launching cold: {str(slot['error'])}")
+            return None, None
+        return slot["driver"], slot["launch_seconds"]
+    
+    @staticmethod
+    def discard_prespawned():
+        """Quit browser đã prespawn nhưng không còn test nào dùng"""
+        DriverManager.plan_prespawn(0)
+        driver, _ = DriverManager._take_prespawned()
+        if driver:
+            driver.quit()
+            logging.info("Unused prespawned WebDriver discarded")
+    
+    @staticmethod
+    def release_driver(driver, crashed=False):
+        """
+        Trả WebDriver sau test: về pool nếu bật, ngược lại quit
+        
+        Args:
+            driver: WebDriver instance
+            crashed: True nếu browser bị lỗi và cần recycle
+        """
+        if driver is None:
+            return
+        
+        resource_stats = DriverManager.collect_resource_stats(driver)
+        if resource_stats:
+            RunMetrics.record("resource_policy", resource_stats)
+        DriverManager._resource_policies.pop(id(driver), None)
+        
+        network_stats = DriverManager.stop_network_mode(driver)
+        if network_stats:
+            RunMetrics.record("network_mode", network_stats)
+        
+        # Trong phạm vi begin_test/end_test: giữ lại tới khi biết test có làm hỏng session không
+        pending = getattr(DriverManager._local, "pending", None)
+        if pending is not None and not crashed:
+            pending.append(driver)
+            return
+        DriverManager._return_driver(driver, crashed)
+    
+    @staticmethod
+    def begin_test():
+        """Bắt đầu phạm vi một test: release_driver hoãn trả session tới end_test"""
+        DriverManager._local.pending = []
+    
+    @staticmethod
+    def end_test(crashed=False):
+        """
+        Trả các session test đã release, recycle nếu test kết thúc bằng lỗi WebDriver/session
+        
+        Args:
+            crashed: True nếu test kết thúc bằng lỗi session (xem is_session_error)
+        """
+        pending = getattr(DriverManager._local, "pending", None)
+        DriverManager._local.pending = None
+        for driver in pending or []:
+            DriverManager._return_driver(driver, crashed)
+    
+    @staticmethod
+    def is_session_error(error):
+        """
+        True nếu exception/message là lỗi WebDriver cho thấy session đã hỏng
+        
+        Args:
+            error: Exception hoặc message lỗi
+        """
+        from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException
+        
+        if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+            return True
+        message = str(error or "").lower()
+        return any(marker in message for marker in DriverManager.SESSION_ERROR_MARKERS)
+    
+    @staticmethod
+    def _return_driver(driver, crashed):
+        if DRIVER_POOL_ENABLED:
+            DriverManager.get_pool().release(driver, crashed=crashed)
+        else:
+            driver.quit()
+    
+    @staticmethod
+    def reset_session(driver, origins=None):
+        """
+        Đưa browser về trạng thái sạch mà không cần quit/relaunch
+        
+        Xóa cookies, localStorage, sessionStorage, IndexedDB, Cache Storage và
+        service workers qua CDP, đóng các tab phụ, kiểm tra giỏ hàng trên PRODUCT_URL
+        đã trống (DRIVER_POOL_VERIFY_CART) rồi về about:blank
+        
+        Args:
+            driver: WebDriver instance
+            origins: Các origin cần xóa dữ liệu (mặc định: origin hiện tại và BASE_URL)
+            
+        Returns:
+            dict: verified (không còn cookies/storage và giỏ hàng trống), cart_empty, origins, duration_ms
+        """
+        start_time = time.time()
+        
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        
+        if origins is None:
+            origins = {BASE_URL.rstrip("/")}
+            current_origin = driver.execute_script(
+                "try { sessionStorage.clear(); } catch (e) {} return location.origin;"
+            )
+            if current_origin and current_origin.startswith("http"):
+                origins.add(current_origin)
+        
+        DriverManager._clear_browser_data(driver, origins)
+        cart_empty = True
+        if DRIVER_POOL_VERIFY_CART:
+            # Giỏ hàng có thể nằm trong session phía server (không theo cookie) hoặc được
+            # khôi phục từ nơi khác - đọc trực tiếp cart indicator trên trang sản phẩm
+            cart_empty = DriverManager._is_cart_empty(driver)
+            # Lần mở trang vừa rồi có thể tạo cookie/storage mới
+            DriverManager._clear_browser_data(driver, origins)
+        driver.get("about:blank")
+        
+        verified = cart_empty and DriverManager._is_session_clean(driver, origins)
+        duration_ms = (time.time() - start_time) * 1000
+        logging.info(f"Browser session reset in {duration_ms:.0f}ms (clean: {verified}, cart empty: {cart_empty})")
+        
+        return {
+            "verified": verified,
+            "cart_empty": cart_empty,
+            "origins": sorted(origins),
+            "duration_ms": round(duration_ms, 1)
+        }
+    
+    @staticmethod
+    def _clear_browser_data(driver, origins):
+        """Xóa storage của các origin và toàn bộ cookies qua CDP"""
+        for origin in origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": origin,
+                "storageTypes": "local_storage,indexeddb,cache_storage,service_workers,websql,file_systems"
+            })
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    
+    @staticmethod
+    def _is_cart_empty(driver):
+        """Mở PRODUCT_URL và kiểm tra cart indicator không hiển thị số lượng nào"""
+        from config.locators import ProductPageLocators
+        from utils.browser_scripts import SNAPSHOT_STATE
+        
+        driver.get(PRODUCT_URL)
+        state = driver.execute_script(SNAPSHOT_STATE, ProductPageLocators.STATE_SNAPSHOT, None)
+        if state["cartCount"]:
+            logging.warning(f"Cart is not empty after session reset: '{state['cartText']}'")
+            return False
+        return True
+    
+    @staticmethod
+    def _is_session_clean(driver, origins):
+        """Kiểm tra không còn cookies hay localStorage (nơi lưu giỏ hàng) cho các origin"""
+        if driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies"):
+            return False
+        
+        driver.execute_cdp_cmd("DOMStorage.enable", {})
+        try:
+            for origin in origins:
+                items = driver.execute_cdp_cmd("DOMStorage.getDOMStorageItems", {
+                    "storageId": {"securityOrigin": origin, "isLocalStorage": True}
+                }).get("entries", [])
+                if items:
+                    return False
+        finally:
+            driver.execute_cdp_cmd("DOMStorage.disable", {})
+        return True
+    
+    @staticmethod
+    def shutdown_pool():
+        """Đóng tất cả session trong pool và browser prespawn còn dư"""
+        DriverManager.discard_prespawned()
+        with DriverManager._pool_lock:
+            pool = DriverManager._pool
+            DriverManager._pool = None
+        if pool:
+            pool.shutdown()
+            logging.info("WebDriver pool shut down")
+    
+    @staticmethod
+    def apply_resource_policy(driver, policy_name=RESOURCE_POLICY):
+        """
+        Chặn các URL pattern và resource type theo policy qua CDP
+        
+        Args:
+            driver: WebDriver instance
+            policy_name: Tên policy trong RESOURCE_POLICIES, None để bỏ chặn
+            
+        Returns:
+            bool: Success status
+        """
+        policy = RESOURCE_POLICIES.get(policy_name) if policy_name else None
+        if policy_name and policy is None:
+            logging.warning(f"Unknown resource policy '{policy_name}', loading all resources")
+        
+        patterns = []
+        if policy:
+            for resource_type in policy.get("block_types", []):
+                patterns.extend(DriverManager.RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+            patterns.extend(policy.get("block_patterns", []))
+        
+        try:
+            # Bỏ log của test trước để thống kê chỉ tính test hiện tại
+            driver.get_log("performance")
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            DriverManager._resource_policies[id(driver)] = policy_name if policy else None
+            logging.info(f"Resource policy '{policy_name}' applied ({len(patterns)} blocked patterns)")
+            return True
+        except Exception as e:
+            logging.warning(f"Failed to apply resource policy '{policy_name}': {str(e)}")
+            return False
+    
+    @staticmethod
+    def collect_resource_stats(driver):
+        """
+        Thống kê requests/bytes đã load và đã chặn từ performance log
+        
+        Bytes tránh được ước tính theo kích thước đã ghi nhận của URL đó trong các lần load đầy đủ trước
+        
+        Args:
+            driver: WebDriver instance
+            
+        Returns:
+            dict or None: Resource statistics
+        """
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logging.debug(f"Performance log not available: {str(e)}")
+            return None
+        
+        urls = {}
+        loaded = {}
+        blocked = []
+        
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            
+            if method == "Network.requestWillBeSent":
+                urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+            elif method == "Network.loadingFinished":
+                loaded[params.get("requestId")] = params.get("encodedDataLength", 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked.append(params.get("requestId"))
+        
+        loaded_sizes = {}
+        for request_id, size in loaded.items():
+            if request_id in urls:
+                loaded_sizes[urls[request_id].split("?")[0]] = size
+        
+        with DriverManager._baseline_lock:
+            baseline = DriverManager._load_resource_baseline()
+            baseline.update(loaded_sizes)
+            DriverManager._save_resource_baseline(baseline)
+            
+            blocked_urls = [urls.get(request_id, "").split("?")[0] for request_id in blocked]
+            bytes_avoided = sum(baseline.get(url, 0) for url in blocked_urls)
+            unknown = len([url for url in blocked_urls if url not in baseline])
+        
+        return {
+            "policy": DriverManager._resource_policies.get(id(driver)),
+            "requests_loaded": len(loaded),
+            "bytes_loaded": sum(loaded.values()),
+            "requests_blocked": len(blocked),
+            "bytes_avoided": int(bytes_avoided),
+            "blocked_without_size_estimate": unknown
+        }
+    
+    @staticmethod
+    def _load_resource_baseline():
+        """Kích thước đã biết của từng URL (cache trong process)"""
+        if DriverManager._resource_baseline is None:
+            try:
+                with open(RESOURCE_BASELINE_FILE, 'r', encoding='utf-8') as f:
+                    DriverManager._resource_baseline = json.load(f)
+            except (OSError, ValueError):
+                DriverManager._resource_baseline = {}
+        return DriverManager._resource_baseline
+    
+    @staticmethod
+    def _save_resource_baseline(baseline):
+        try:
+            os.makedirs(os.path.dirname(RESOURCE_BASELINE_FILE), exist_ok=True)
+            with open(RESOURCE_BASELINE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(baseline, f)
+        except OSError as e:
+            logging.debug(f"Failed to save resource baseline: {str(e)}")
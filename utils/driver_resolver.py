@@ -0,0 +1,263 @@
+"""
+Resolve ChromeDriver path với manifest cache offline
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from config.settings import *
+
+class DriverResolver:
+    """Tìm ChromeDriver khớp với Chrome đã cài, cache kết quả trong manifest"""
+    
+    CHROME_CANDIDATES = [
+        "google-chrome",
+        "google-chrome-stable",
+        "chromium",
+        "chromium-browser",
+        "chrome",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
+    ]
+    
+    # Thời gian install() ước tính khi manifest chưa ghi nhận lần nào
+    DEFAULT_INSTALL_SECONDS = 1.0
+    
+    _resolved_path = None
+    _install_seconds = DEFAULT_INSTALL_SECONDS
+    _lock = threading.Lock()
+    stats = {
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "saved_seconds": 0.0
+    }
+    
+    @staticmethod
+    def resolve():
+        """
+        Lấy đường dẫn ChromeDriver, ưu tiên memo trong process rồi tới manifest
+        
+        Returns:
+            str: Path tới chromedriver executable
+        """
+        with DriverResolver._lock:
+            start_time = time.time()
+            manifest = None
+            
+            if DriverResolver._resolved_path:
+                path = DriverResolver._resolved_path
+                install_seconds = DriverResolver._install_seconds
+                source = "memory"
+            else:
+                manifest = DriverResolver.load_manifest()
+                path = DriverResolver._validate_manifest(manifest)
+                install_seconds = (manifest or {}).get("install_seconds", DriverResolver.DEFAULT_INSTALL_SECONDS)
+                source = "manifest"
+            
+            if path:
+                elapsed = time.time() - start_time
+                saved = max(install_seconds - elapsed, 0.0)
+                DriverResolver.stats["cache_hits"] += 1
+                DriverResolver.stats["saved_seconds"] += saved
+                DriverResolver._resolved_path = path
+                DriverResolver._install_seconds = install_seconds
+                logging.info(f"ChromeDriver resolved from {source} in {elapsed * 1000:.1f}ms (saved {saved:.2f}s)")
+                return path
+            
+            DriverResolver.stats["cache_misses"] += 1
+            path = DriverResolver._refresh(manifest)
+            DriverResolver._resolved_path = path
+            return path
+    
+    @staticmethod
+    def _validate_manifest(manifest):
+        """
+        Kiểm tra manifest còn khớp với Chrome và driver trên máy không
+        
+        Args:
+            manifest: Dữ liệu manifest (dict hoặc None)
+        
+        Returns:
+            str or None: Driver path nếu cache còn hợp lệ
+        """
+        if not manifest:
+            return None
+        
+        if manifest.get("pinned_version") != CHROMEDRIVER_VERSION:
+            logging.info("ChromeDriver pin changed, manifest is stale")
+            return None
+        
+        chrome_binary = manifest.get("chrome_binary")
+        driver_path = manifest.get("driver_path")
+        if not chrome_binary or not driver_path:
+            return None
+        
+        if DriverResolver._file_fingerprint(chrome_binary) != manifest.get("chrome_fingerprint"):
+            logging.info("Chrome binary changed since last resolve, manifest is stale")
+            return None
+        
+        if DriverResolver._file_fingerprint(driver_path) != manifest.get("driver_fingerprint"):
+            logging.info("Cached ChromeDriver missing or modified, manifest is stale")
+            return None
+        
+        return driver_path
+    
+    @staticmethod
+    def _refresh(previous_manifest):
+        """
+        Resolve lại driver (có thể cần network) và ghi manifest mới
+        
+        Args:
+            previous_manifest: Manifest cũ, dùng làm fallback khi offline
+        
+        Returns:
+            str: Driver path
+        """
+        chrome_binary = DriverResolver.find_chrome_binary()
+        chrome_version = DriverResolver.get_chrome_version(chrome_binary) if chrome_binary else None
+        logging.info(f"Detected Chrome {chrome_version or 'unknown'} at {chrome_binary or 'unknown'}")
+        
+        install_start = time.time()
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            driver_path = ChromeDriverManager(driver_version=CHROMEDRIVER_VERSION).install()
+        except Exception as e:
+            logging.warning(f"ChromeDriverManager install failed: {str(e)}")
+            driver_path = DriverResolver._offline_fallback(previous_manifest, chrome_version)
+            if not driver_path:
+                raise
+        install_seconds = time.time() - install_start
+        if previous_manifest and install_seconds < previous_manifest.get("install_seconds", 0):
+            # Giữ thời gian cold install đã đo để báo cáo thời gian tiết kiệm chính xác
+            install_seconds = previous_manifest["install_seconds"]
+        
+        manifest = {
+            "chrome_binary": chrome_binary,
+            "chrome_version": chrome_version,
+            "chrome_fingerprint": DriverResolver._file_fingerprint(chrome_binary) if chrome_binary else None,
+            "driver_path": driver_path,
+            "driver_fingerprint": DriverResolver._file_fingerprint(driver_path),
+            "pinned_version": CHROMEDRIVER_VERSION,
+            "install_seconds": round(install_seconds, 3),
+            "resolved_at": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+        if chrome_binary:
+            DriverResolver.save_manifest(manifest)
+        DriverResolver._install_seconds = install_seconds
+        
+        logging.info(f"ChromeDriver resolved to {driver_path} in {install_seconds:.2f}s")
+        return driver_path
+    
+    @staticmethod
+    def _offline_fallback(previous_manifest, chrome_version):
+        """
+        Tìm driver dùng được khi không có network
+        
+        Ưu tiên driver cũ trong manifest nếu cùng major version, sau đó tới chromedriver trên PATH
+        """
+        if previous_manifest:
+            driver_path = previous_manifest.get("driver_path")
+            cached_version = previous_manifest.get("chrome_version") or ""
+            same_major = chrome_version and cached_version.split(".")[0] == chrome_version.split(".")[0]
+            if driver_path and os.path.exists(driver_path) and (same_major or not chrome_version):
+                logging.warning(f"Using cached ChromeDriver from manifest: {driver_path}")
+                return driver_path
+        
+        driver_path = shutil.which("chromedriver")
+        if driver_path:
+            logging.warning(f"Using ChromeDriver from PATH: {driver_path}")
+        return driver_path
+    
+    @staticmethod
+    def find_chrome_binary():
+        """
+        Tìm Chrome executable trên máy
+        
+        Returns:
+            str or None: Absolute path tới Chrome
+        """
+        candidates = [CHROME_BINARY] if CHROME_BINARY else DriverResolver.CHROME_CANDIDATES
+        for candidate in candidates:
+            path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+            if path and os.path.exists(path):
+                return os.path.realpath(path)
+        return None
+    
+    @staticmethod
+    def get_chrome_version(chrome_binary):
+        """
+        Đọc version của Chrome
+        
+        Args:
+            chrome_binary: Path tới Chrome executable
+        
+        Returns:
+            str or None: Version dạng "120.0.6099.109"
+        """
+        try:
+            if sys.platform.startswith("win"):
+                output = subprocess.run(
+                    ["powershell", "-NoProfile", "-Command", f"(Get-Item '{chrome_binary}').VersionInfo.ProductVersion"],
+                    capture_output=True, text=True, timeout=10
+                ).stdout
+            else:
+                output = subprocess.run(
+                    [chrome_binary, "--version"], capture_output=True, text=True, timeout=10
+                ).stdout
+            match = re.search(r"\d+\.\d+\.\d+\.\d+", output)
+            return match.group(0) if match else None
+        except Exception as e:
+            logging.debug(f"Could not read Chrome version: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _file_fingerprint(path):
+        """Fingerprint rẻ cho một file: size + mtime"""
+        try:
+            stat = os.stat(path)
+            return f"{stat.st_size}:{int(stat.st_mtime)}"
+        except OSError:
+            return None
+    
+    @staticmethod
+    def load_manifest():
+        """Đọc manifest, trả None nếu chưa có hoặc bị hỏng"""
+        try:
+            with open(DRIVER_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def save_manifest(manifest):
+        """Ghi manifest (atomic replace)"""
+        try:
+            os.makedirs(os.path.dirname(DRIVER_MANIFEST_FILE), exist_ok=True)
+            tmp_file = f"{DRIVER_MANIFEST_FILE}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, DRIVER_MANIFEST_FILE)
+        except OSError as e:
+            logging.warning(f"Failed to write driver manifest: {str(e)}")
+    
+    @staticmethod
+    def get_summary():
+        """
+        Thống kê resolve trong run hiện tại
+        
+        Returns:
+            dict: cache_hits, cache_misses, saved_seconds
+        """
+        return {
+            "cache_hits": DriverResolver.stats["cache_hits"],
+            "cache_misses": DriverResolver.stats["cache_misses"],
+            "saved_seconds": round(DriverResolver.stats["saved_seconds"], 2)
+        }
@@ -7,6 +7,7 @@ import traceback
 from datetime import datetime
 from typing import Dict, Any
 import os
+from utils.screenshot_pipeline import ScreenshotPipeline
 
 class ErrorHandlers:
     """Error handling utilities"""
@@ -58,13 +59,10 @@ class ErrorHandlers:
         
         # Take screenshot if driver is available
         if driver:
-            try:
-                screenshot_path = f"reports/screenshots/error_{test_name}_{int(datetime.now().timestamp())}.png"
-                driver.save_screenshot(screenshot_path)
+            # Chế độ ring: frame được ghi cùng các frame khác nếu test kết thúc FAILED/ERROR
+            screenshot_path = ScreenshotPipeline.capture(driver, f"error_{test_name}")
+            if screenshot_path:
                 error_info["screenshot"] = screenshot_path
-                logging.info(f"Error screenshot saved: {screenshot_path}")
-            except:
-                logging.warning("Failed to take error screenshot")
         
         # Log error
         logging.error(f"Selenium error in {test_name}: {error_info['error_message']}")
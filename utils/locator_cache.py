@@ -0,0 +1,101 @@
+"""
+Cache selector thắng cho từng locator list, theo page fingerprint
+Trên trang ổn định mỗi lần tìm element chỉ còn một query
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from config.settings import *
+
+class LocatorCache:
+    """Selector thắng lần trước cho mỗi locator list, lưu xuống LOCATOR_CACHE_FILE"""
+    
+    _entries = None
+    _lock = threading.Lock()
+    _dirty = False
+    stats = {"hits": 0, "misses": 0, "invalidated": 0}
+    
+    @staticmethod
+    def make_key(selectors):
+        """
+        Key của một locator list (đổi khi list trong locators.py thay đổi)
+        
+        Args:
+            selectors: List of selectors
+        
+        Returns:
+            str: Hash của list
+        """
+        return hashlib.sha1(json.dumps(list(selectors)).encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    def get(selectors):
+        """
+        Selector đã thắng cho locator list này
+        
+        Returns:
+            dict or None: {"fingerprint", "selector"} để truyền cho RESOLVE_SELECTORS
+        """
+        if not LOCATOR_CACHE_ENABLED:
+            return None
+        with LocatorCache._lock:
+            return LocatorCache._load().get(LocatorCache.make_key(selectors))
+    
+    @staticmethod
+    def update(selectors, fingerprint, match):
+        """
+        Ghi nhận kết quả một lần resolve
+        
+        Args:
+            selectors: List of selectors
+            fingerprint: Page fingerprint lúc resolve
+            match: Kết quả RESOLVE_SELECTORS (dict có selector, cached) hoặc None
+        """
+        if not LOCATOR_CACHE_ENABLED or not match:
+            return
+        
+        with LocatorCache._lock:
+            entries = LocatorCache._load()
+            key = LocatorCache.make_key(selectors)
+            if match.get("cached"):
+                LocatorCache.stats["hits"] += 1
+                return
+            
+            LocatorCache.stats["misses"] += 1
+            previous = entries.get(key)
+            if previous and previous["fingerprint"] != fingerprint:
+                LocatorCache.stats["invalidated"] += 1
+                logging.info(f"Locator cache invalidated (page fingerprint changed): {previous['selector']}")
+            entries[key] = {"fingerprint": fingerprint, "selector": match["selector"]}
+            LocatorCache._dirty = True
+    
+    @staticmethod
+    def save():
+        """Lưu cache xuống file nếu có thay đổi"""
+        with LocatorCache._lock:
+            if not LocatorCache._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(LOCATOR_CACHE_FILE), exist_ok=True)
+                tmp_file = f"{LOCATOR_CACHE_FILE}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(LocatorCache._entries, f, indent=2)
+                os.replace(tmp_file, LOCATOR_CACHE_FILE)
+                LocatorCache._dirty = False
+            except OSError as e:
+                logging.debug(f"Failed to save locator cache: {str(e)}")
+    
+    @staticmethod
+    def _load():
+        if LocatorCache._entries is None:
+            try:
+                with open(LOCATOR_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    LocatorCache._entries = json.load(f)
+            except (OSError, ValueError):
+                LocatorCache._entries = {}
+            atexit.register(LocatorCache.save)
+        return LocatorCache._entries
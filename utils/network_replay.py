@@ -0,0 +1,239 @@
+"""
+Record và replay network qua CDP Fetch (archive kiểu HAR)
+Cho phép chạy test offline với thời gian load ổn định
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import trio
+from config.settings import *
+
+class NetworkArchive:
+    """Archive các response đã ghi, key theo method + URL + hash của POST body"""
+    
+    def __init__(self, path=NETWORK_ARCHIVE_FILE):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(method, url, post_data=None):
+        """
+        Tạo key cho một request
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            post_data: Request body (nếu có)
+        
+        Returns:
+            str: Archive key
+        """
+        key = f"{method.upper()} {url}"
+        if post_data:
+            key += f" #{hashlib.sha1(post_data.encode('utf-8')).hexdigest()[:12]}"
+        return key
+    
+    def load(self):
+        """Đọc archive từ file, trả False nếu chưa có"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("entries", {})
+            logging.info(f"Network archive loaded: {len(self.entries)} responses from {self.path}")
+            return True
+        except (OSError, ValueError) as e:
+            logging.warning(f"Network archive not available ({self.path}): {str(e)}")
+            self.entries = {}
+            return False
+    
+    def save(self):
+        """Merge các entries mới vào file archive"""
+        with self._lock:
+            existing = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    existing = json.load(f).get("entries", {})
+            except (OSError, ValueError):
+                pass
+            existing.update(self.entries)
+            
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_file = f"{self.path}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "entries": existing
+                }, f, ensure_ascii=False)
+            os.replace(tmp_file, self.path)
+        logging.info(f"Network archive saved: {len(existing)} responses to {self.path}")
+    
+    def put(self, key, status, headers, body_base64):
+        with self._lock:
+            self.entries[key] = {
+                "status": status,
+                "headers": headers,
+                "body": body_base64
+            }
+    
+    def get(self, method, url, post_data=None):
+        """
+        Tìm response cho request, fallback bỏ qua POST body nếu không khớp chính xác
+        
+        Returns:
+            dict or None: Entry đã ghi
+        """
+        entry = self.entries.get(NetworkArchive.make_key(method, url, post_data))
+        if entry is None and post_data:
+            entry = self.entries.get(NetworkArchive.make_key(method, url))
+        return entry
+
+class NetworkInterceptor:
+    """Chặn request của một WebDriver qua CDP Fetch trên background thread"""
+    
+    # Header không được replay nguyên trạng (body đã được giải nén khi ghi)
+    SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+    
+    def __init__(self, driver, mode, archive=None, latency_ms=REPLAY_LATENCY_MS):
+        """
+        Args:
+            driver: Chrome WebDriver instance
+            mode: "record" hoặc "replay"
+            archive: NetworkArchive dùng chung (mặc định đọc NETWORK_ARCHIVE_FILE)
+            latency_ms: Độ trễ giả lập cho mỗi response khi replay
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported network mode '{mode}'")
+        self.driver = driver
+        self.mode = mode
+        self.latency = latency_ms / 1000.0
+        self.archive = archive or NetworkArchive()
+        if mode == "replay" and not self.archive.entries:
+            self.archive.load()
+        self.stats = {"recorded": 0, "replayed": 0, "unmatched": 0}
+        self._ready = threading.Event()
+        self._thread = None
+        self._trio_token = None
+        self._cancel_scope = None
+        self._error = None
+    
+    def start(self, timeout=10):
+        """
+        Bắt đầu chặn request, chờ tới khi Fetch.enable có hiệu lực
+        
+        Returns:
+            bool: True nếu interception đã sẵn sàng
+        """
+        self._thread = threading.Thread(target=self._run, name=f"network-{self.mode}", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout) or self._error:
+            logging.error(f"Network {self.mode} could not start: {self._error or 'timeout'}")
+            return False
+        logging.info(f"Network {self.mode} mode active")
+        return True
+    
+    def stop(self):
+        """
+        Dừng interception (và lưu archive khi record)
+        
+        Returns:
+            dict: Thống kê recorded/replayed/unmatched
+        """
+        if self._trio_token and self._cancel_scope:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._trio_token)
+            except trio.RunFinishedError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=10)
+        if self.mode == "record" and self.stats["recorded"]:
+            self.archive.save()
+        return dict(self.stats)
+    
+    def _run(self):
+        try:
+            trio.run(self._intercept)
+        except Exception as e:
+            self._error = e
+            logging.error(f"Network {self.mode} stopped with error: {str(e)}")
+        finally:
+            self._ready.set()
+    
+    async def _intercept(self):
+        self._trio_token = trio.lowlevel.current_trio_token()
+        async with self.driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            stage = devtools.fetch.RequestStage.RESPONSE if self.mode == "record" else devtools.fetch.RequestStage.REQUEST
+            await session.execute(devtools.fetch.enable(
+                patterns=[devtools.fetch.RequestPattern(url_pattern="*", request_stage=stage)]
+            ))
+            listener = session.listen(devtools.fetch.RequestPaused)
+            
+            with trio.CancelScope() as cancel_scope:
+                self._cancel_scope = cancel_scope
+                self._ready.set()
+                async with trio.open_nursery() as nursery:
+                    async for event in listener:
+                        nursery.start_soon(self._handle, session, devtools, event)
+            
+            with trio.move_on_after(2):
+                await session.execute(devtools.fetch.disable())
+    
+    async def _handle(self, session, devtools, event):
+        try:
+            if self.mode == "record":
+                await self._record(session, devtools, event)
+            else:
+                await self._replay(session, devtools, event)
+        except Exception as e:
+            logging.debug(f"Network {self.mode} failed for {event.request.url}: {str(e)}")
+            try:
+                await session.execute(devtools.fetch.continue_request(event.request_id))
+            except Exception:
+                pass
+    
+    async def _record(self, session, devtools, event):
+        request = event.request
+        if event.response_status_code is not None and not event.response_error_reason:
+            body, is_base64 = await session.execute(devtools.fetch.get_response_body(event.request_id))
+            body_base64 = body if is_base64 else base64.b64encode(body.encode('utf-8')).decode('ascii')
+            headers = [[header.name, header.value] for header in (event.response_headers or [])]
+            key = NetworkArchive.make_key(request.method, request.url, request.post_data)
+            self.archive.put(key, event.response_status_code, headers, body_base64)
+            self.stats["recorded"] += 1
+        await session.execute(devtools.fetch.continue_request(event.request_id))
+    
+    async def _replay(self, session, devtools, event):
+        request = event.request
+        entry = self.archive.get(request.method, request.url, request.post_data)
+        
+        if entry is None:
+            self.stats["unmatched"] += 1
+            if REPLAY_UNMATCHED == "passthrough":
+                await session.execute(devtools.fetch.continue_request(event.request_id))
+            else:
+                logging.debug(f"No recorded response for {request.method} {request.url}")
+                await session.execute(devtools.fetch.fail_request(
+                    event.request_id, devtools.network.ErrorReason.INTERNET_DISCONNECTED
+                ))
+            return
+        
+        if self.latency:
+            await trio.sleep(self.latency)
+        
+        headers = [
+            devtools.fetch.HeaderEntry(name=name, value=value)
+            for name, value in entry["headers"]
+            if name.lower() not in NetworkInterceptor.SKIPPED_HEADERS
+        ]
+        await session.execute(devtools.fetch.fulfill_request(
+            event.request_id,
+            response_code=entry["status"],
+            response_headers=headers,
+            body=entry["body"]
+        ))
+        self.stats["replayed"] += 1
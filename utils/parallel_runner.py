@@ -0,0 +1,76 @@
+"""
+Chạy các test case độc lập trên thread pool, giữ output console theo từng test
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class GroupedOutput:
+    """Stream thay cho sys.stdout: mỗi worker ghi vào buffer riêng, in ra một lần khi test xong"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            with self._lock:
+                return self._stream.write(text)
+        buffer.append(text)
+        return len(text)
+    
+    def flush(self):
+        if getattr(self._local, "buffer", None) is None:
+            self._stream.flush()
+    
+    def begin(self):
+        """Bắt đầu gom output của thread hiện tại"""
+        self._local.buffer = []
+    
+    def end(self):
+        """In toàn bộ output đã gom của thread hiện tại thành một khối liền"""
+        buffer = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        if buffer:
+            with self._lock:
+                self._stream.write("".join(buffer))
+                self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+class ParallelRunner:
+    """Thread pool cho các test I/O-bound (mỗi test dùng WebDriver riêng)"""
+    
+    @staticmethod
+    def run(items, function, workers):
+        """
+        Chạy function(item) cho từng item trên `workers` thread
+        
+        Args:
+            items: List các item (ví dụ test case dict)
+            function: Callable nhận một item, tự xử lý exception và trả kết quả
+            workers: Số thread chạy đồng thời
+        
+        Returns:
+            list: Kết quả theo đúng thứ tự của items
+        """
+        output = GroupedOutput(sys.stdout)
+        
+        def run_grouped(item):
+            output.begin()
+            try:
+                return function(item)
+            finally:
+                output.end()
+        
+        original_stdout = sys.stdout
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="test-worker") as executor:
+                return list(executor.map(run_grouped, items))
+        finally:
+            sys.stdout = original_stdout
@@ -0,0 +1,139 @@
+"""
+Cache kết quả PASSED theo hash của source test, test data, locators và fingerprint của trang
+Khi không có gì thay đổi, test được bỏ qua và trả lại kết quả đã lưu
+"""
+
+import glob
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+import urllib.request
+from datetime import datetime
+from config.settings import *
+
+class ResultCache:
+    """Kết quả PASSED gần nhất của từng test, lưu xuống RESULT_CACHE_FILE"""
+    
+    _entries = None
+    _lock = threading.Lock()
+    _dirty = False
+    stats = {"hits": 0, "misses": 0, "stored": 0}
+    
+    @staticmethod
+    def page_fingerprint(url=PRODUCT_URL, timeout=RESULT_CACHE_FETCH_TIMEOUT):
+        """
+        Fingerprint của trang đích: ETag nếu server trả về, ngược lại digest của HTML
+        
+        Args:
+            url: URL trang cần fingerprint
+            timeout: Timeout của request (seconds)
+        
+        Returns:
+            str or None: Fingerprint, None nếu không tải được trang (khi đó không dùng cache)
+        """
+        try:
+            request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 (result-cache)"})
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                etag = response.headers.get("ETag")
+                if etag:
+                    return f"etag:{etag}"
+                return f"sha256:{hashlib.sha256(response.read()).hexdigest()}"
+        except Exception as e:
+            logging.warning(f"Failed to fingerprint {url}, result cache disabled: {str(e)}")
+            return None
+    
+    @staticmethod
+    def make_key(test_case, fingerprint):
+        """
+        Key của một test: đổi khi source test, helpers/settings/test data/locators
+        (RESULT_CACHE_SOURCES) hoặc trang đích thay đổi
+        
+        Args:
+            test_case: Metadata từ TestRegistry (cần "id" và "module")
+            fingerprint: Kết quả page_fingerprint()
+        
+        Returns:
+            str: Hash key
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{test_case['id']}|{PRODUCT_URL}|{fingerprint}".encode('utf-8'))
+        # find_spec chỉ tìm file, không import module test
+        sources = [(test_case["module"], importlib.util.find_spec(test_case["module"]).origin)]
+        for pattern in RESULT_CACHE_SOURCES:
+            sources += [(path.replace(os.sep, "/"), path) for path in sorted(glob.glob(pattern))]
+        for name, path in sources:
+            # Tên file cũng nằm trong key: thêm/xóa/đổi tên helper làm key đổi theo
+            digest.update(name.encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def lookup(test_case, fingerprint):
+        """
+        Kết quả đã lưu nếu key còn khớp
+        
+        Returns:
+            dict or None: Kết quả PASSED đã lưu, đánh dấu cached
+        """
+        key = ResultCache.make_key(test_case, fingerprint)
+        with ResultCache._lock:
+            entry = ResultCache._load().get(test_case["id"])
+            if not entry or entry["key"] != key:
+                ResultCache.stats["misses"] += 1
+                return None
+            ResultCache.stats["hits"] += 1
+        
+        result = dict(entry["result"])
+        result["cached"] = True
+        result["cached_at"] = entry["stored_at"]
+        result["cached_execution_time"] = result.get("execution_time", 0)
+        result["execution_time"] = 0.0
+        result["timestamp"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        result["message"] = f"[cached {entry['stored_at']}] {result.get('message', '')}"
+        result["metrics"] = {}
+        return result
+    
+    @staticmethod
+    def store(test_case, fingerprint, result):
+        """Lưu kết quả nếu test PASSED (kết quả khác không được cache)"""
+        if result.get("status") != "PASSED" or result.get("cached"):
+            return
+        key = ResultCache.make_key(test_case, fingerprint)
+        with ResultCache._lock:
+            ResultCache._load()[test_case["id"]] = {
+                "key": key,
+                "stored_at": result.get("timestamp") or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "result": {k: v for k, v in result.items() if k not in ("metrics", "deadline", "screenshots")}
+            }
+            ResultCache.stats["stored"] += 1
+            ResultCache._dirty = True
+    
+    @staticmethod
+    def save():
+        """Lưu cache xuống file nếu có thay đổi"""
+        with ResultCache._lock:
+            if not ResultCache._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(RESULT_CACHE_FILE), exist_ok=True)
+                tmp_file = f"{RESULT_CACHE_FILE}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(ResultCache._entries, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_file, RESULT_CACHE_FILE)
+                ResultCache._dirty = False
+            except OSError as e:
+                logging.debug(f"Failed to save result cache: {str(e)}")
+    
+    @staticmethod
+    def _load():
+        if ResultCache._entries is None:
+            try:
+                with open(RESULT_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    ResultCache._entries = json.load(f)
+            except (OSError, ValueError):
+                ResultCache._entries = {}
+        return ResultCache._entries
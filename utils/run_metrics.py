@@ -0,0 +1,59 @@
+"""
+Thu thập metrics cho test case đang chạy
+"""
+
+import threading
+
+class RunMetrics:
+    """Metrics của test case hiện tại, lưu theo từng thread để runner gắn vào kết quả"""
+    
+    _local = threading.local()
+    
+    @staticmethod
+    def begin(test_id):
+        """
+        Bắt đầu thu thập metrics cho một test case
+        
+        Args:
+            test_id: ID của test case (ví dụ "TC06")
+        """
+        RunMetrics._local.metrics = {"test_id": test_id}
+    
+    @staticmethod
+    def end():
+        """
+        Kết thúc thu thập metrics
+        
+        Returns:
+            dict: Metrics đã ghi nhận (không gồm test_id)
+        """
+        metrics = getattr(RunMetrics._local, "metrics", None) or {}
+        RunMetrics._local.metrics = None
+        metrics.pop("test_id", None)
+        return metrics
+    
+    @staticmethod
+    def current():
+        """Metrics đang thu thập, hoặc None nếu không có test nào đang chạy"""
+        return getattr(RunMetrics._local, "metrics", None)
+    
+    @staticmethod
+    def record(key, value):
+        """Ghi một giá trị metric"""
+        metrics = RunMetrics.current()
+        if metrics is not None:
+            metrics[key] = value
+    
+    @staticmethod
+    def add(key, amount):
+        """Cộng dồn một metric dạng số"""
+        metrics = RunMetrics.current()
+        if metrics is not None:
+            metrics[key] = metrics.get(key, 0) + amount
+    
+    @staticmethod
+    def append(key, item):
+        """Thêm một phần tử vào metric dạng list"""
+        metrics = RunMetrics.current()
+        if metrics is not None:
+            metrics.setdefault(key, []).append(item)
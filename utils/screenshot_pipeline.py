@@ -0,0 +1,222 @@
+"""
+Pipeline chụp ảnh màn hình: test thread chỉ lấy bytes PNG, encode/dedup/ghi file ở worker nền
+Ở chế độ "ring", frame chỉ nằm trong bộ nhớ và được ghi khi test FAILED/ERROR
+"""
+
+import atexit
+import base64
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from PIL import Image
+from config.settings import *
+from utils.run_metrics import RunMetrics
+
+class ScreenshotPipeline:
+    """Encode screenshot sang WebP/JPEG và bỏ frame trùng (perceptual hash) trên một worker thread"""
+    
+    _queue = queue.Queue()
+    _worker = None
+    _lock = threading.Lock()
+    _recent_hashes = deque(maxlen=SCREENSHOT_DEDUP_HISTORY)
+    _local = threading.local()
+    stats = {"captured": 0, "written": 0, "duplicates": 0, "failed": 0, "bytes_written": 0,
+             "frames_recorded": 0, "frames_discarded": 0}
+    
+    @staticmethod
+    def capture(driver, name):
+        """
+        Lấy bytes PNG từ driver rồi giao cho worker, không chờ encode/ghi file
+        
+        Ở SCREENSHOT_MODE "ring" chỉ ghi frame vào ring buffer (xem record_frame)
+        
+        Args:
+            driver: WebDriver instance
+            name: Tiền tố tên file (ví dụ "TC05_final_state")
+        
+        Returns:
+            str: Path dự kiến của artifact, hoặc None nếu không chụp được hoặc đang ở chế độ ring.
+                 Nếu frame trùng với ảnh gần đây thì file không được ghi,
+                 metrics "screenshots" của test ghi lại path của ảnh trùng.
+        """
+        if SCREENSHOT_MODE == "ring":
+            ScreenshotPipeline.record_frame(driver, name)
+            return None
+        
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception as e:
+            logging.error(f"Failed to take screenshot: {str(e)}")
+            return None
+        
+        # Giữ tham chiếu metrics của test hiện tại để worker ghi kết quả vào đúng test
+        return ScreenshotPipeline._submit(png, name, RunMetrics.current())
+    
+    @staticmethod
+    def record_frame(driver, label):
+        """
+        Chụp frame độ phân giải thấp vào ring buffer của thread hiện tại (không I/O đĩa)
+        
+        Args:
+            driver: WebDriver instance
+            label: Tên bước (ví dụ "add_to_cart")
+        """
+        if not SCREENSHOT_ON_FAILURE or driver is None:
+            return
+        try:
+            viewport = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})["cssVisualViewport"]
+            data = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": SCREENSHOT_RING_QUALITY,
+                "clip": {
+                    "x": viewport["pageX"],
+                    "y": viewport["pageY"],
+                    "width": viewport["clientWidth"],
+                    "height": viewport["clientHeight"],
+                    "scale": SCREENSHOT_RING_SCALE
+                }
+            })["data"]
+            frame = base64.b64decode(data)
+        except Exception as e:
+            logging.debug(f"CDP screenshot failed, using full-size capture: {str(e)}")
+            try:
+                frame = driver.get_screenshot_as_png()
+            except Exception as e:
+                logging.debug(f"Failed to record frame '{label}': {str(e)}")
+                return
+        
+        ScreenshotPipeline._ring().append((label, frame))
+        ScreenshotPipeline.stats["frames_recorded"] += 1
+    
+    @staticmethod
+    def persist_frames(name, metrics=None):
+        """
+        Ghi các frame trong ring buffer ra đĩa (qua worker) rồi xóa ring buffer
+        
+        Args:
+            name: Tiền tố tên file (ví dụ "TC06")
+            metrics: Dict metrics của test để worker ghi artifact vào key "screenshots"
+        
+        Returns:
+            list: Path dự kiến của từng frame, theo thứ tự chụp
+        """
+        ring = ScreenshotPipeline._ring()
+        paths = [ScreenshotPipeline._submit(frame, f"{name}_{index:02d}_{label}", metrics)
+                 for index, (label, frame) in enumerate(ring)]
+        ring.clear()
+        if paths:
+            logging.info(f"Persisting {len(paths)} frames for {name}")
+        return paths
+    
+    @staticmethod
+    def discard_frames():
+        """Bỏ các frame trong ring buffer (test PASSED)"""
+        ring = ScreenshotPipeline._ring()
+        ScreenshotPipeline.stats["frames_discarded"] += len(ring)
+        ring.clear()
+    
+    @staticmethod
+    def flush(timeout=SCREENSHOT_FLUSH_TIMEOUT):
+        """
+        Chờ worker xử lý hết ảnh đang chờ (gọi trước khi ghi report)
+        
+        Args:
+            timeout: Thời gian chờ tối đa (seconds)
+        
+        Returns:
+            bool: True nếu queue đã trống
+        """
+        end_time = time.time() + timeout
+        while ScreenshotPipeline._queue.unfinished_tasks:
+            if time.time() >= end_time:
+                logging.warning(f"Screenshot pipeline still has {ScreenshotPipeline._queue.unfinished_tasks} pending frames")
+                return False
+            time.sleep(0.05)
+        return True
+    
+    @staticmethod
+    def _ring():
+        ring = getattr(ScreenshotPipeline._local, "ring", None)
+        if ring is None:
+            ring = ScreenshotPipeline._local.ring = deque(maxlen=SCREENSHOT_RING_SIZE)
+        return ring
+    
+    @staticmethod
+    def _submit(image_bytes, name, metrics):
+        path = f"{SCREENSHOT_DIR}/{name}_{int(time.time() * 1000)}.{ScreenshotPipeline._extension()}"
+        ScreenshotPipeline.stats["captured"] += 1
+        ScreenshotPipeline._ensure_worker()
+        ScreenshotPipeline._queue.put((image_bytes, name, path, metrics))
+        return path
+    
+    @staticmethod
+    def _ensure_worker():
+        with ScreenshotPipeline._lock:
+            if ScreenshotPipeline._worker is None or not ScreenshotPipeline._worker.is_alive():
+                ScreenshotPipeline._worker = threading.Thread(
+                    target=ScreenshotPipeline._run, name="screenshot-pipeline", daemon=True)
+                ScreenshotPipeline._worker.start()
+                atexit.register(ScreenshotPipeline.flush)
+    
+    @staticmethod
+    def _run():
+        while True:
+            image_bytes, name, path, metrics = ScreenshotPipeline._queue.get()
+            try:
+                artifact = ScreenshotPipeline._process(image_bytes, name, path)
+                if metrics is not None:
+                    metrics.setdefault("screenshots", []).append(artifact)
+            except Exception as e:
+                ScreenshotPipeline.stats["failed"] += 1
+                logging.error(f"Failed to write screenshot {path}: {str(e)}")
+            finally:
+                ScreenshotPipeline._queue.task_done()
+    
+    @staticmethod
+    def _process(image_bytes, name, path):
+        start_time = time.time()
+        image = Image.open(io.BytesIO(image_bytes))
+        frame_hash = ScreenshotPipeline._dhash(image)
+        
+        for previous_hash, previous_path in ScreenshotPipeline._recent_hashes:
+            if bin(frame_hash ^ previous_hash).count("1") <= SCREENSHOT_DEDUP_DISTANCE:
+                ScreenshotPipeline.stats["duplicates"] += 1
+                logging.info(f"Screenshot {name} matches {previous_path}, skipped")
+                return {"name": name, "path": previous_path, "duplicate": True, "bytes": 0,
+                        "encode_ms": round((time.time() - start_time) * 1000, 1)}
+        
+        if image.width > SCREENSHOT_MAX_WIDTH:
+            height = round(image.height * SCREENSHOT_MAX_WIDTH / image.width)
+            image = image.resize((SCREENSHOT_MAX_WIDTH, height), Image.LANCZOS)
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if SCREENSHOT_FORMAT == "webp":
+            image.save(path, "WEBP", quality=SCREENSHOT_QUALITY, method=4)
+        else:
+            image.convert("RGB").save(path, "JPEG", quality=SCREENSHOT_QUALITY, optimize=True)
+        
+        size = os.path.getsize(path)
+        ScreenshotPipeline._recent_hashes.append((frame_hash, path))
+        ScreenshotPipeline.stats["written"] += 1
+        ScreenshotPipeline.stats["bytes_written"] += size
+        logging.info(f"Screenshot saved: {path} ({size // 1024} KB, captured {len(image_bytes) // 1024} KB)")
+        return {"name": name, "path": path, "duplicate": False, "bytes": size,
+                "encode_ms": round((time.time() - start_time) * 1000, 1)}
+    
+    @staticmethod
+    def _dhash(image):
+        """Difference hash 64 bit: so sánh độ sáng các pixel kề nhau trên ảnh 9x8 grayscale"""
+        pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+        value = 0
+        for row in range(8):
+            for col in range(8):
+                value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+        return value
+    
+    @staticmethod
+    def _extension():
+        return "webp" if SCREENSHOT_FORMAT == "webp" else "jpg"
@@ -0,0 +1,334 @@
+"""
+Local stand-in server cho trang sản phẩm
+Tái hiện DOM, validation và giỏ hàng của PRODUCT_URL để test hermetic, tốc độ cao
+
+Chạy riêng (từ thư mục gốc của project): python -m utils.stand_in_server
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config.settings import *
+
+MAX_QUANTITY = 999
+
+# Thông báo validation dùng chung cho client-side script và API giỏ hàng
+VALIDATION_MESSAGES = {
+    "invalid_number": "Hãy nhập số hợp lệ",
+    "quantity_min": "Số lượng tối thiểu là 1",
+    "quantity_max": "Số lượng không hợp lệ",
+    "category_required": "Vui lòng chọn một khóa học"
+}
+
+PRODUCT_PAGE_HTML = """<!DOCTYPE html>
+<html lang="vi">
+<head>
+    <meta charset="UTF-8">
+    <title>Business Analyst in Practices</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .attr_order { display: inline-block; margin: 4px; padding: 6px 10px; border: 1px solid #ccc; cursor: pointer; }
+        .attr_order input { display: none; }
+        .attr_order input:checked + span.choose { font-weight: bold; color: #0a58ca; }
+        .styles_qty_pd__IF7fO { display: inline-flex; margin: 16px 0; }
+        .styles_qty_pd_input__dFgvy { width: 80px; }
+        .error-message { color: #dc3545; margin: 8px 0; }
+        .toast { background: #d1e7dd; padding: 8px; margin: 8px 0; }
+        .cart-count { background: #dc3545; color: white; border-radius: 50%; padding: 2px 8px; }
+    </style>
+</head>
+<body>
+    <header><a href="/cart" id="cart_link">Giỏ hàng</a> <span id="cart_badge_slot"></span></header>
+    <h1>Business Analyst in Practices</h1>
+    
+    <div class="pd-attr-box" id="pd_attr_0">
+        <p>Phân loại đối tượng</p>
+        <label class="attr_order" tooltip="Cao học UEH/ VB2 UEH"><input type="radio" class="pd_attr" name="attr_0" value="35" data-type="0" data-title="Cao học UEH/ VB2 UEH"><span class="choose">Cao học UEH/ VB2 UEH</span></label>
+        <label class="attr_order" tooltip="Học viên cũ tại ATD"><input type="radio" class="pd_attr" name="attr_0" value="38" data-type="0" data-title="Học viên cũ tại ATD"><span class="choose">Học viên cũ tại ATD</span></label>
+        <label class="attr_order" tooltip="SV trường khác UEH"><input type="radio" class="pd_attr" name="attr_0" value="39" data-type="0" data-title="SV trường khác UEH"><span class="choose">SV trường khác UEH</span></label>
+        <label class="attr_order" tooltip="SV UEH"><input type="radio" class="pd_attr" name="attr_0" value="40" data-type="0" data-title="SV UEH"><span class="choose">SV UEH</span></label>
+        <label class="attr_order" tooltip="Khác"><input type="radio" class="pd_attr" name="attr_0" value="42" data-type="0" data-title="Khác"><span class="choose">Khác</span></label>
+    </div>
+    
+    <div class="styles_qty_pd_box__JONgL qty_pd_box">
+        <div class="styles_qty_pd__IF7fO">
+            <button type="button" id="qty_decrease">-</button>
+            <input type="text" class="text-center styles_qty_pd_input__dFgvy" value="1">
+            <button type="button" id="qty_increase">+</button>
+        </div>
+    </div>
+    
+    <div id="message_slot"></div>
+    
+    <button type="button" class="add_to_cart styles_add_to_cart__LTr7C" data-pdid="16">Thêm vào giỏ hàng</button>
+    <button type="button" class="buy_now styles_buy_now__DEI8S" data-pdid="16">Đăng ký ngay</button>
+    
+    <script>
+    (function () {
+        var MAX_QUANTITY = __MAX_QUANTITY__;
+        var MESSAGES = __VALIDATION_MESSAGES__;
+        var input = document.querySelector('.styles_qty_pd_input__dFgvy');
+        var messageSlot = document.getElementById('message_slot');
+        
+        function clearMessages() {
+            messageSlot.innerHTML = '';
+        }
+        
+        function showError(text) {
+            clearMessages();
+            var el = document.createElement('div');
+            el.className = 'error-message';
+            el.setAttribute('role', 'alert');
+            el.textContent = text;
+            messageSlot.appendChild(el);
+        }
+        
+        function showToast(text) {
+            clearMessages();
+            var el = document.createElement('div');
+            el.className = 'toast';
+            el.textContent = text;
+            messageSlot.appendChild(el);
+        }
+        
+        function renderCart(count) {
+            var slot = document.getElementById('cart_badge_slot');
+            slot.innerHTML = '';
+            if (count > 0) {
+                var badge = document.createElement('span');
+                badge.className = 'cart-count';
+                badge.textContent = count;
+                slot.appendChild(badge);
+            }
+        }
+        
+        function validateQuantity(raw) {
+            var value = (raw || '').trim();
+            if (!/^-?\\d+$/.test(value)) {
+                return {ok: false, message: MESSAGES.invalid_number};
+            }
+            var quantity = parseInt(value, 10);
+            if (quantity < 1) {
+                input.value = '1';
+                return {ok: false, message: MESSAGES.quantity_min};
+            }
+            if (quantity > MAX_QUANTITY) {
+                return {ok: false, message: MESSAGES.quantity_max};
+            }
+            return {ok: true, quantity: quantity};
+        }
+        
+        document.getElementById('qty_decrease').addEventListener('click', function () {
+            var quantity = parseInt(input.value, 10) || 1;
+            input.value = String(Math.max(1, quantity - 1));
+        });
+        document.getElementById('qty_increase').addEventListener('click', function () {
+            var quantity = parseInt(input.value, 10) || 0;
+            input.value = String(Math.min(MAX_QUANTITY, quantity + 1));
+        });
+        
+        document.querySelector('.styles_add_to_cart__LTr7C').addEventListener('click', function () {
+            var check = validateQuantity(input.value);
+            if (!check.ok) {
+                showError(check.message);
+                return;
+            }
+            var selected = document.querySelector("input[name='attr_0']:checked");
+            if (!selected) {
+                showError(MESSAGES.category_required);
+                return;
+            }
+            clearMessages();
+            fetch('/api/cart', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({product_id: 16, attr_0: selected.value, quantity: check.quantity})
+            }).then(function (response) {
+                return response.json();
+            }).then(function (data) {
+                if (data.success) {
+                    localStorage.setItem('cart', JSON.stringify(data.cart));
+                    renderCart(data.cart_count);
+                    showToast('Đã thêm vào giỏ hàng');
+                } else {
+                    showError(data.message);
+                }
+            }).catch(function () {
+                showError('Không thể kết nối máy chủ');
+            });
+        });
+        
+        try {
+            var cart = JSON.parse(localStorage.getItem('cart') || '[]');
+            renderCart(cart.reduce(function (sum, item) { return sum + item.quantity; }, 0));
+        } catch (e) {}
+    })();
+    </script>
+</body>
+</html>
+""".replace("__MAX_QUANTITY__", str(MAX_QUANTITY)).replace(
+    "__VALIDATION_MESSAGES__", json.dumps(VALIDATION_MESSAGES, ensure_ascii=False))
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Xử lý request cho stand-in server"""
+    
+    server_version = "QAQCStandIn/1.0"
+    
+    def log_message(self, format, *args):
+        logging.debug(f"Stand-in server: {format % args}")
+    
+    def _delay(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+    
+    def _session_id(self):
+        match = re.search(r"qa_session=([\w-]+)", self.headers.get("Cookie", ""))
+        return match.group(1) if match else None
+    
+    def _send(self, status, body, content_type="text/html; charset=utf-8", session_id=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        if session_id:
+            self.send_header("Set-Cookie", f"qa_session={session_id}; Path=/; SameSite=Lax")
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _send_json(self, status, payload, session_id=None):
+        self._send(status, json.dumps(payload, ensure_ascii=False), "application/json; charset=utf-8", session_id)
+    
+    def do_GET(self):
+        self._delay()
+        path = urlparse(self.path).path
+        if path in ("/", PRODUCT_PATH):
+            self._send(200, PRODUCT_PAGE_HTML)
+        elif path == "/api/cart":
+            session_id = self._session_id()
+            cart = self.server.get_cart(session_id)
+            self._send_json(200, {"cart": cart, "cart_count": sum(item["quantity"] for item in cart)})
+        else:
+            self._send(404, "Not Found", "text/plain; charset=utf-8")
+    
+    def do_POST(self):
+        self._delay()
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length).decode("utf-8") if length else ""
+        
+        if path == "/api/cart":
+            try:
+                payload = json.loads(raw_body or "{}")
+            except ValueError:
+                payload = {}
+        elif path == PRODUCT_PATH:
+            # Form POST (JMeter load test)
+            payload = {key: values[0] for key, values in parse_qs(raw_body).items()}
+            payload.setdefault("attr_0", "42")
+        else:
+            self._send(404, "Not Found", "text/plain; charset=utf-8")
+            return
+        
+        session_id = self._session_id() or uuid.uuid4().hex
+        status, response = self.server.add_to_cart(session_id, payload)
+        self._send_json(status, response, session_id)
+
+class StandInServer(ThreadingHTTPServer):
+    """HTTP server tái hiện trang sản phẩm và giỏ hàng (state theo cookie qa_session)"""
+    
+    daemon_threads = True
+    
+    _instance = None
+    _lock = threading.Lock()
+    
+    def __init__(self, host=LOCAL_SERVER_HOST, port=LOCAL_SERVER_PORT, latency_ms=LOCAL_SERVER_LATENCY_MS):
+        super().__init__((host, port), StandInRequestHandler)
+        self.latency = latency_ms / 1000.0
+        self.carts = {}
+        self.cart_lock = threading.Lock()
+        self.thread = None
+    
+    def get_cart(self, session_id):
+        with self.cart_lock:
+            return list(self.carts.get(session_id, []))
+    
+    def add_to_cart(self, session_id, payload):
+        """
+        Validate và thêm sản phẩm vào giỏ hàng (cùng rule với client-side)
+        
+        Returns:
+            tuple: (HTTP status, response dict)
+        """
+        quantity = str(payload.get("quantity", "")).strip()
+        if not re.match(r"^-?\d+$", quantity):
+            return 400, {"success": False, "message": VALIDATION_MESSAGES["invalid_number"]}
+        if int(quantity) < 1:
+            return 400, {"success": False, "message": VALIDATION_MESSAGES["quantity_min"]}
+        if int(quantity) > MAX_QUANTITY:
+            return 400, {"success": False, "message": VALIDATION_MESSAGES["quantity_max"]}
+        if not payload.get("attr_0"):
+            return 400, {"success": False, "message": VALIDATION_MESSAGES["category_required"]}
+        
+        with self.cart_lock:
+            cart = self.carts.setdefault(session_id, [])
+            cart.append({
+                "product_id": payload.get("product_id", 16),
+                "attr_0": str(payload["attr_0"]),
+                "quantity": int(quantity)
+            })
+            cart_count = sum(item["quantity"] for item in cart)
+            return 200, {"success": True, "cart": list(cart), "cart_count": cart_count}
+    
+    def start(self):
+        """Chạy server trên background thread"""
+        self.thread = threading.Thread(target=self.serve_forever, name="stand-in-server", daemon=True)
+        self.thread.start()
+        logging.info(f"Stand-in server listening on http://{self.server_address[0]}:{self.server_address[1]}{PRODUCT_PATH}")
+    
+    def stop(self):
+        """Dừng server"""
+        self.shutdown()
+        self.server_close()
+        logging.info("Stand-in server stopped")
+    
+    @staticmethod
+    def ensure_started():
+        """
+        Khởi động server dùng chung nếu TARGET_ENV là local (idempotent)
+        
+        Returns:
+            StandInServer or None: Server đang chạy
+        """
+        if TARGET_ENV != "local":
+            return None
+        with StandInServer._lock:
+            if StandInServer._instance is None:
+                server = StandInServer()
+                server.start()
+                StandInServer._instance = server
+            return StandInServer._instance
+    
+    @staticmethod
+    def stop_shared():
+        """Dừng server dùng chung nếu đang chạy"""
+        with StandInServer._lock:
+            server = StandInServer._instance
+            StandInServer._instance = None
+        if server:
+            server.stop()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    server = StandInServer()
+    print(f"🏠 Stand-in product page: http://{LOCAL_SERVER_HOST}:{LOCAL_SERVER_PORT}{PRODUCT_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -3,7 +3,6 @@ Helper functions cho automation testing
 """
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
@@ -11,76 +10,80 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 import time
 import logging
 from config.settings import *
+from utils.browser_scripts import CHECK_READINESS, RESOLVE_SELECTORS, SCROLL_INTO_VIEW, ARM_SETTLE_TRACKER, READ_SETTLE_STATE, SET_INPUT_VALUE, SNAPSHOT_STATE, ABSENCE_CHECK
+from utils.wait_policy import WaitPolicy
+from utils.locator_cache import LocatorCache
+from utils.run_metrics import RunMetrics
+from utils.deadline import Deadline
+from utils.screenshot_pipeline import ScreenshotPipeline
 
 class TestHelpers:
     """Helper methods cho testing"""
     
     @staticmethod
-    def find_element_by_multiple_selectors(driver, wait, selectors, timeout=10):
+    def resolve_selectors(driver, selectors, timeout=LOOKUP_TIMEOUT, clickable=False):
+        """
+        Tìm element bằng cả list selectors (CSS và XPath) trong một execute_script mỗi lần poll
+        
+        Selector thắng lần trước (LocatorCache) được thử trước khi page fingerprint không đổi
+        
+        Args:
+            driver: WebDriver instance
+            selectors: List of selectors, theo thứ tự ưu tiên
+            timeout: Timeout cho cả list (không phải cho từng selector)
+            clickable: Chỉ nhận element hiển thị và không disabled
+            
+        Returns:
+            dict: element, selector, index, matched, cached, elapsed - hoặc None nếu không tìm thấy
+        """
+        start_time = time.time()
+        preferred = LocatorCache.get(selectors)
+        
+        def resolve(driver):
+            result = driver.execute_script(RESOLVE_SELECTORS, list(selectors), clickable, preferred)
+            return result if result and result["match"] else None
+        
+        result = WaitPolicy.poll(driver, resolve, timeout, f"any of {len(selectors)} selectors")
+        elapsed = time.time() - start_time
+        
+        if not result:
+            return None
+        match = result["match"]
+        LocatorCache.update(selectors, result["fingerprint"], match)
+        match["elapsed"] = round(elapsed, 3)
+        return match
+    
+    @staticmethod
+    def find_element_by_multiple_selectors(driver, wait, selectors, timeout=LOOKUP_TIMEOUT):
         """
         Tìm element bằng nhiều selectors
         
         Args:
             driver: WebDriver instance
-            wait: WebDriverWait instance
+            wait: Không còn dùng (giữ để tương thích), timeout do WaitPolicy quản lý
             selectors: List of selectors to try
             timeout: Timeout in seconds
             
         Returns:
             WebElement or None
         """
-        for selector in selectors:
-            try:
-                if selector.startswith("//"):
-                    # XPath selector
-                    element = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                elif selector.startswith(".") or selector.startswith("#") or "[" in selector:
-                    # CSS selector
-                    element = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                else:
-                    # Try as CSS first, then as tag name
-                    try:
-                        element = WebDriverWait(driver, timeout).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                    except:
-                        element = WebDriverWait(driver, timeout).until(
-                            EC.presence_of_element_located((By.TAG_NAME, selector))
-                        )
-                
-                logging.info(f"Element found with selector: {selector}")
-                return element
-            except TimeoutException:
-                logging.debug(f"Selector failed: {selector}")
-                continue
+        match = TestHelpers.resolve_selectors(driver, selectors, timeout)
+        if match:
+            logging.info(f"Element found with selector: {match['selector']} (#{match['index']}, {match['elapsed']:.2f}s)")
+            return match["element"]
         
         logging.warning(f"Element not found with any of the selectors: {selectors}")
         return None
     
     @staticmethod
-    def find_clickable_element_by_multiple_selectors(driver, wait, selectors, timeout=10):
+    def find_clickable_element_by_multiple_selectors(driver, wait, selectors, timeout=LOOKUP_TIMEOUT):
         """
         Tìm clickable element bằng nhiều selectors
         """
-        for selector in selectors:
-            try:
-                if selector.startswith("//"):
-                    element = WebDriverWait(driver, timeout).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                else:
-                    element = WebDriverWait(driver, timeout).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                
-                logging.info(f"Clickable element found with selector: {selector}")
-                return element
-            except TimeoutException:
-                continue
+        match = TestHelpers.resolve_selectors(driver, selectors, timeout, clickable=True)
+        if match:
+            logging.info(f"Clickable element found with selector: {match['selector']} (#{match['index']}, {match['elapsed']:.2f}s)")
+            return match["element"]
         
         logging.warning(f"Clickable element not found with any selectors: {selectors}")
         return None
@@ -100,14 +103,16 @@ class TestHelpers:
             bool: Success status
         """
         for attempt in range(max_retries):
+            if Deadline.expired():
+                logging.error("Test deadline reached, giving up click")
+                return False
             try:
                 # Scroll to element
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-                time.sleep(0.5)
+                TestHelpers.scroll_into_view(driver, element)
                 
                 # Wait for element to be stable
-                WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable(element)
+                WaitPolicy.until(
+                    driver, EC.element_to_be_clickable(element), CLICKABLE_TIMEOUT, "element clickable"
                 )
                 
                 if use_javascript or attempt > 0:
@@ -133,7 +138,6 @@ class TestHelpers:
                             }
                         }
                     """)
-                    time.sleep(0.5)
                     # Force JavaScript click on next attempt
                     use_javascript = True
                 else:
@@ -144,7 +148,6 @@ class TestHelpers:
                 logging.error(f"Failed to click element on attempt {attempt + 1}: {str(e)}")
                 if attempt == max_retries - 1:
                     return False
-                time.sleep(0.5)
         
         return False
     
@@ -164,8 +167,7 @@ class TestHelpers:
         """
         try:
             # Scroll to element
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-            time.sleep(0.5)
+            TestHelpers.scroll_into_view(driver, element)
             
             # Click to focus
             TestHelpers.safe_click(driver, element, use_javascript=True)
@@ -175,7 +177,7 @@ class TestHelpers:
                 element.clear()
                 element.send_keys(Keys.CTRL + "a")
                 element.send_keys(Keys.DELETE)
-                time.sleep(0.2)
+                TestHelpers.wait_for_value_committed(driver, element, expected="")
             
             element.send_keys(str(text))
             logging.info(f"Text '{text}' sent to element successfully")
@@ -186,22 +188,27 @@ class TestHelpers:
             return False
     
     @staticmethod
-    def safe_input_quantity(driver, element, value):
+    def safe_input_quantity(driver, element, value, method=QUANTITY_INPUT_METHOD):
         """
         An toàn nhập quantity với kiểm tra validation
         
         Args:
             driver: WebDriver instance
             element: Quantity input element
-            value: Value to input
+            value: Value to input (None được coi là rỗng)
+            method: "native" (một roundtrip qua set_input_value) hoặc "keyboard" (gõ phím)
             
         Returns:
             dict: Result with success status and final value
         """
+        if method == "native":
+            return TestHelpers.set_input_value(driver, element, value)
+        
+        text = "" if value is None else str(value)
+        start_time = time.time()
         try:
             # Scroll to element
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-            time.sleep(0.5)
+            TestHelpers.scroll_into_view(driver, element)
             
             # Get initial value
             initial_value = element.get_attribute("value")
@@ -211,16 +218,16 @@ class TestHelpers:
             
             # Clear field using multiple methods
             element.clear()
-            time.sleep(0.2)
             
             # Select all and delete
             element.send_keys(Keys.CTRL + "a")
             element.send_keys(Keys.DELETE)
-            time.sleep(0.2)
+            TestHelpers.wait_for_value_committed(driver, element, expected="")
             
             # Input new value
-            element.send_keys(str(value))
-            time.sleep(0.5)
+            if text:
+                element.send_keys(text)
+            TestHelpers.wait_for_value_committed(driver, element, expected=text)
             
             # Trigger change event
             driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", element)
@@ -231,58 +238,385 @@ class TestHelpers:
             
             return {
                 "success": True,
+                "method": "keyboard",
                 "initial_value": initial_value,
-                "input_value": str(value),
+                "input_value": text,
                 "final_value": final_value,
-                "was_modified": final_value != str(value)
+                "was_modified": final_value != text,
+                "validity": None,
+                "elapsed": round(time.time() - start_time, 3)
             }
             
         except Exception as e:
             logging.error(f"Failed to input quantity: {str(e)}")
             return {
                 "success": False,
+                "method": "keyboard",
                 "error": str(e),
                 "initial_value": None,
-                "input_value": str(value),
+                "input_value": text,
                 "final_value": None
             }
     
     @staticmethod
-    def take_screenshot(driver, filename):
+    def set_input_value(driver, element, value):
         """
-        Chụp ảnh màn hình
+        Set value của input trong một execute_script qua native value setter
+        
+        Bắn input/change/blur như người dùng nhập nên framework kiểu React vẫn nhận được.
         
         Args:
             driver: WebDriver instance
-            filename: Filename for screenshot
+            element: Input element
+            value: Value to set (None được coi là rỗng)
             
         Returns:
-            str: Path to screenshot file
+            dict: success, initial_value, input_value, final_value, was_modified, validity, elapsed
         """
+        text = "" if value is None else str(value)
+        start_time = time.time()
         try:
-            screenshot_path = f"{SCREENSHOT_DIR}/{filename}_{int(time.time())}.png"
-            driver.save_screenshot(screenshot_path)
-            logging.info(f"Screenshot saved: {screenshot_path}")
-            return screenshot_path
+            state = driver.execute_script(SET_INPUT_VALUE, element, text)
+            final_value = state["committedValue"]
+            logging.info(f"Input value '{text}' committed as '{final_value}' ({state['elapsedMs']:.1f}ms in page)")
+            
+            return {
+                "success": True,
+                "method": "native",
+                "initial_value": state["initialValue"],
+                "input_value": text,
+                "final_value": final_value,
+                "was_modified": final_value != text,
+                "validity": state["validity"],
+                "elapsed": round(time.time() - start_time, 3)
+            }
+            
         except Exception as e:
-            logging.error(f"Failed to take screenshot: {str(e)}")
+            logging.error(f"Failed to set input value: {str(e)}")
+            return {
+                "success": False,
+                "method": "native",
+                "error": str(e),
+                "initial_value": None,
+                "input_value": text,
+                "final_value": None
+            }
+    
+    @staticmethod
+    def scroll_into_view(driver, element, timeout=CLICKABLE_TIMEOUT):
+        """
+        Cuộn tức thì tới element và chờ tới khi element nằm trong viewport
+        
+        Returns:
+            bool: True nếu element đã nằm trong viewport
+        """
+        return bool(WaitPolicy.poll(
+            driver,
+            lambda driver: driver.execute_script(SCROLL_INTO_VIEW, element),
+            timeout,
+            "scroll settled"
+        ))
+    
+    @staticmethod
+    def wait_for_value_committed(driver, element, expected=None, quiet_window=SETTLE_QUIET_WINDOW, timeout=CLICKABLE_TIMEOUT):
+        """
+        Chờ value của input được commit
+        
+        Value bằng `expected` thì trả về ngay; ngược lại (không truyền expected, hoặc trang đã
+        normalise value) value phải giữ nguyên trong suốt quiet_window, tính từ lần đọc đầu tiên.
+        
+        Args:
+            driver: WebDriver instance
+            element: Input element
+            expected: Value vừa nhập (tùy chọn)
+            quiet_window: Thời gian value không đổi thì coi là đã commit (seconds)
+            timeout: Timeout in seconds
+        
+        Returns:
+            str: Value đã commit (None nếu không ổn định trong timeout)
+        """
+        expected = None if expected is None else str(expected)
+        last = {"value": element.get_property("value"), "since": time.time()}
+        
+        def committed(driver):
+            value = element.get_property("value")
+            if value != last["value"]:
+                last["value"], last["since"] = value, time.time()
+                return False
+            return value == expected or time.time() - last["since"] >= quiet_window
+        
+        if WaitPolicy.poll(driver, committed, timeout, "value committed"):
+            return last["value"]
+        return None
+    
+    @staticmethod
+    def arm_settle_tracker(driver):
+        """Bắt đầu theo dõi DOM mutations và fetch/XHR - gọi trước action cần chờ phản hồi"""
+        try:
+            driver.execute_script(ARM_SETTLE_TRACKER)
+        except Exception as e:
+            logging.debug(f"Failed to arm settle tracker: {str(e)}")
+    
+    @staticmethod
+    def wait_until_settled(driver, label="action", request_pattern=None,
+                           quiet_window=SETTLE_QUIET_WINDOW, timeout=SETTLE_TIMEOUT):
+        """
+        Chờ tới khi không còn request đang chạy và DOM yên lặng trong quiet_window
+        (cần gọi arm_settle_tracker trước action)
+        
+        Args:
+            driver: WebDriver instance
+            label: Tên action, dùng khi ghi metrics
+            request_pattern: Chuỗi trong URL của request chính (tính server latency)
+            quiet_window: Thời gian DOM không đổi để coi là ổn định (seconds)
+            timeout: Timeout in seconds
+            
+        Returns:
+            dict: settled, navigated, elapsed, requests, mutations, server_ms, render_ms
+        """
+        start_time = time.time()
+        quiet_ms = quiet_window * 1000
+        state = {"raw": None, "navigated": False}
+        
+        def settled(driver):
+            raw = driver.execute_script(READ_SETTLE_STATE)
+            if raw is None:
+                state["navigated"] = True
+                return True
+            state["raw"] = raw
+            last_activity = max(
+                [raw["armedAt"], raw["lastMutation"] or 0] +
+                [request["end"] for request in raw["requests"] if request["end"] is not None]
+            )
+            return raw["pending"] == 0 and raw["now"] - last_activity >= quiet_ms
+        
+        try:
+            ok = bool(WaitPolicy.poll(driver, settled, timeout, f"{label} settled"))
+        except Exception as e:
+            logging.debug(f"Settle tracking failed: {str(e)}")
+            ok = False
+        
+        raw = state["raw"]
+        result = {
+            "label": label,
+            "settled": ok,
+            "navigated": state["navigated"],
+            "elapsed": round(time.time() - start_time, 3)
+        }
+        result.update(TestHelpers.summarize_settle(raw, request_pattern))
+        
+        if not ok:
+            logging.warning(f"{label} not settled after {timeout}s (pending requests: {raw['pending'] if raw else 'unknown'})")
+        else:
+            logging.info(f"{label} settled in {result['elapsed']:.2f}s (server: {result['server_ms']}ms, render: {result['render_ms']}ms)")
+        RunMetrics.append("settle", result)
+        ScreenshotPipeline.record_frame(driver, label)
+        return result
+    
+    @staticmethod
+    def assert_absent(driver, locators, within=ABSENT_WINDOW, quiet_window=SETTLE_QUIET_WINDOW):
+        """
+        Kiểm tra không có element nào trong locators hiển thị, với một deadline chung cho cả list
+        
+        Dừng ngay khi thấy element (assertion fail) hoặc khi trang đã ổn định theo settle
+        tracker (arm_settle_tracker), nên test pass không phải chờ hết timeout.
+        
+        Args:
+            driver: WebDriver instance
+            locators: List of selectors
+            within: Thời gian tối đa chờ element xuất hiện (seconds)
+            quiet_window: Thời gian DOM yên lặng để coi là đã ổn định (seconds)
+            
+        Returns:
+            dict: absent, found (text), selector, settled, elapsed
+        """
+        start_time = time.time()
+        state = {"found": None, "settled": False}
+        
+        def decided(driver):
+            state.update(driver.execute_script(ABSENCE_CHECK, list(locators), quiet_window * 1000))
+            return state["found"] is not None or state["settled"]
+        
+        try:
+            WaitPolicy.poll(driver, decided, within, "absence decided")
+        except Exception as e:
+            logging.debug(f"Absence check failed: {str(e)}")
+        
+        found = state["found"]
+        result = {
+            "absent": found is None,
+            "found": found["text"] if found else None,
+            "selector": found["selector"] if found else None,
+            "settled": state["settled"],
+            "elapsed": round(time.time() - start_time, 3)
+        }
+        if found:
+            logging.info(f"Unexpected element visible ({found['selector']}): {found['text']}")
+        return result
+    
+    @staticmethod
+    def summarize_settle(raw, request_pattern=None):
+        """
+        Tính latency từ trạng thái settle tracker (READ_SETTLE_STATE)
+        
+        Args:
+            raw: Trạng thái tracker, hoặc None
+            request_pattern: Chuỗi trong URL của request chính
+            
+        Returns:
+            dict: requests, mutations, server_ms (request chính), render_ms (response -> mutation cuối)
+        """
+        summary = {"requests": 0, "mutations": 0, "server_ms": None, "render_ms": None}
+        if not raw:
+            return summary
+        
+        requests = [request for request in raw["requests"] if request["end"] is not None]
+        if request_pattern:
+            matching = [request for request in requests if request_pattern.lower() in request["url"].lower()]
+            requests = matching or requests
+        summary["requests"] = len(raw["requests"])
+        summary["mutations"] = raw["mutations"]
+        
+        response_end = raw["armedAt"]
+        if requests:
+            summary["server_ms"] = round(max(request["end"] - request["start"] for request in requests), 1)
+            response_end = max(request["end"] for request in requests)
+        if raw["lastMutation"] is not None and raw["lastMutation"] >= response_end:
+            summary["render_ms"] = round(raw["lastMutation"] - response_end, 1)
+        return summary
+    
+    @staticmethod
+    def snapshot_state(driver, expected_text=None, until=None, timeout=STATE_TIMEOUT, locators=None):
+        """
+        Đọc trạng thái trang sau action trong một roundtrip
+        
+        Args:
+            driver: WebDriver instance
+            expected_text: Text cần tìm trong các element đang hiển thị (tùy chọn)
+            until: Predicate nhận snapshot - poll tới khi True hoặc hết timeout (tùy chọn)
+            timeout: Timeout khi có until
+            locators: Dict vùng cần đọc (mặc định ProductPageLocators.STATE_SNAPSHOT)
+            
+        Returns:
+            dict: url, quantity_value, errors, alerts, cart_text, cart_count, expected_text, elapsed
+                  (None nếu không đọc được trang)
+        """
+        from config.locators import ProductPageLocators
+        
+        locators = locators or ProductPageLocators.STATE_SNAPSHOT
+        start_time = time.time()
+        state = {}
+        
+        def read(driver):
+            state.update(TestHelpers.parse_snapshot(driver.execute_script(SNAPSHOT_STATE, locators, expected_text)))
+            return until is None or until(state)
+        
+        try:
+            if until is None:
+                read(driver)
+            else:
+                WaitPolicy.poll(driver, read, timeout, "state condition")
+        except Exception as e:
+            logging.error(f"Failed to snapshot page state: {str(e)}")
+            return None
+        
+        if not state:
             return None
+        state["elapsed"] = round(time.time() - start_time, 3)
+        ScreenshotPipeline.record_frame(driver, "state")
+        return state
+    
+    @staticmethod
+    def parse_snapshot(raw):
+        """Chuyển kết quả __qaSnapshot sang dict snapshot của Python"""
+        return {
+            "url": raw["url"],
+            "quantity_value": raw["quantityValue"],
+            "errors": raw["errors"],
+            "alerts": raw["alerts"],
+            "cart_text": raw["cartText"],
+            "cart_count": raw["cartCount"],
+            "expected_text": raw["expectedText"]
+        }
+    
+    @staticmethod
+    def take_screenshot(driver, filename):
+        """
+        Chụp ảnh màn hình (encode và ghi file chạy nền qua ScreenshotPipeline)
+        
+        Args:
+            driver: WebDriver instance
+            filename: Filename for screenshot
+            
+        Returns:
+            str: Path to screenshot file (file được ghi sau, ảnh trùng sẽ không ghi),
+                 None ở SCREENSHOT_MODE "ring" (frame chỉ được ghi khi test FAILED/ERROR)
+        """
+        return ScreenshotPipeline.capture(driver, filename)
     
     @staticmethod
-    def wait_for_page_load(driver, timeout=30):
+    def wait_for_page_load(driver, timeout=PAGE_LOAD_TIMEOUT):
         """
         Chờ page load hoàn tất
         """
+        # eager/none: DOM đã parse là đủ, không chờ tài nguyên bên thứ ba
+        ready_states = ("complete",) if PAGE_LOAD_STRATEGY == "normal" else ("interactive", "complete")
         try:
-            WebDriverWait(driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            WaitPolicy.until(
+                driver,
+                lambda driver: driver.execute_script("return document.readyState") in ready_states,
+                timeout,
+                "document.readyState"
             )
-            time.sleep(1)  # Additional buffer
             return True
         except TimeoutException:
             logging.warning("Page load timeout")
             return False
-
+    
+    @staticmethod
+    def wait_until_ready(driver, requirements, timeout=PAGE_LOAD_TIMEOUT):
+        """
+        Chờ tới khi các element test cần đều có thể thao tác
+        
+        Không phụ thuộc document.readyState, nên trả về ngay khi form sẵn sàng
+        dù tài nguyên bên thứ ba vẫn đang load
+        
+        Args:
+            driver: WebDriver instance
+            requirements: Dict tên -> list selectors, ví dụ ProductPageLocators.PRODUCT_FORM_READY
+            timeout: Timeout in seconds
+            
+        Returns:
+            dict: ready, pending (các điều kiện chưa đạt), ready_state, elapsed
+        """
+        start_time = time.time()
+        state = {"pending": list(requirements.keys()), "readyState": None}
+        
+        def check(driver):
+            try:
+                state.update(driver.execute_script(CHECK_READINESS, requirements))
+            except Exception as e:
+                logging.debug(f"Readiness check failed: {str(e)}")
+            return not state["pending"]
+        
+        try:
+            WaitPolicy.until(driver, check, timeout, "page readiness")
+            ready = True
+        except TimeoutException:
+            ready = False
+            logging.warning(f"Page not ready after {timeout}s, pending: {state['pending']}")
+        
+        elapsed = time.time() - start_time
+        if ready:
+            logging.info(f"Page ready in {elapsed:.2f}s (readyState: {state['readyState']})")
+        
+        return {
+            "ready": ready,
+            "pending": state["pending"],
+            "ready_state": state["readyState"],
+            "elapsed": round(elapsed, 3)
+        }
+    
     @staticmethod
     def select_category_option(driver, option_key="khac"):
         """
@@ -302,8 +636,8 @@ class TestHelpers:
             if option_key in ProductPageLocators.CATEGORY_LABELS:
                 selector = ProductPageLocators.CATEGORY_LABELS[option_key]
                 try:
-                    label_element = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                    label_element = WaitPolicy.until(
+                        driver, EC.element_to_be_clickable((By.CSS_SELECTOR, selector)), LOOKUP_TIMEOUT, selector
                     )
                     return TestHelpers.safe_click(driver, label_element, use_javascript=True)
                 except TimeoutException:
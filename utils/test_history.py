@@ -0,0 +1,138 @@
+"""
+Đọc lịch sử chạy test từ các JSON report cũ trong reports/test_results
+"""
+
+import glob
+import json
+import logging
+import os
+from config.settings import *
+
+class TestHistory:
+    """Thời gian chạy và trạng thái của từng test_id trong các report gần nhất"""
+    
+    @staticmethod
+    def load_reports(runs=TEST_HISTORY_RUNS, test_suite=None, history_dir=None):
+        """
+        Đọc các JSON report mới nhất (bỏ qua report gộp từ các shard)
+        
+        Args:
+            runs: Số report gần nhất cần đọc (None = tất cả)
+            test_suite: Chỉ đọc report của suite này (mặc định mọi suite)
+            history_dir: Thư mục report (mặc định TEST_HISTORY_DIR)
+        
+        Returns:
+            list: Report data (mới nhất trước)
+        """
+        directory = history_dir or TEST_HISTORY_DIR
+        files = sorted(glob.glob(os.path.join(directory, "*.json")), key=os.path.getmtime, reverse=True)
+        reports = []
+        for path in files:
+            if runs is not None and len(reports) >= runs:
+                break
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    report = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.debug(f"Skipping unreadable report {path}: {str(e)}")
+                continue
+            if not isinstance(report, dict) or not isinstance(report.get("test_results"), list):
+                continue
+            # Kết quả của report gộp đã có trong report của từng shard
+            if report.get("metadata", {}).get("merged_from"):
+                continue
+            if test_suite and report.get("test_suite") != test_suite:
+                continue
+            reports.append(report)
+        return reports
+    
+    @staticmethod
+    def durations(runs=TEST_HISTORY_RUNS, test_suite=None, history_dir=None):
+        """
+        Thời gian chạy ước tính của từng test (median của các lần chạy gần nhất)
+        
+        Args:
+            runs: Số report gần nhất cần đọc (None = tất cả)
+            test_suite: Chỉ đọc report của suite này
+            history_dir: Thư mục report (mặc định TEST_HISTORY_DIR)
+        
+        Returns:
+            dict: test_id -> seconds
+        """
+        return TestHistory._median_durations(TestHistory.load_reports(runs, test_suite, history_dir))
+    
+    @staticmethod
+    def shared_durations(path, test_suite=None):
+        """
+        Thời gian chạy từ --history, input dùng chung để mọi shard (kể cả trên CI node khác)
+        tính cùng một kế hoạch
+        
+        Args:
+            path: Thư mục JSON report (đọc tất cả, không phụ thuộc mtime), một JSON report
+                  (ví dụ report gộp trong MERGED_REPORT_DIR) hoặc JSON {test_id: seconds}
+            test_suite: Chỉ dùng report của suite này
+        
+        Returns:
+            dict: test_id -> seconds
+        
+        Raises:
+            ValueError: Không đọc được file hoặc file không đúng định dạng
+        """
+        if os.path.isdir(path):
+            return TestHistory.durations(runs=None, test_suite=test_suite, history_dir=path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except OSError as e:
+            raise ValueError(f"Cannot read history file {path}: {str(e)}")
+        except ValueError as e:
+            raise ValueError(f"History file {path} is not valid JSON: {str(e)}")
+        
+        if isinstance(data, dict) and isinstance(data.get("test_results"), list):
+            if test_suite and data.get("test_suite") != test_suite:
+                raise ValueError(f"History file {path} is a report of '{data.get('test_suite')}', expected '{test_suite}'")
+            return TestHistory._median_durations([data])
+        if isinstance(data, dict) and all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                                          for value in data.values()):
+            return dict(data)
+        raise ValueError(f"History file {path} must be a JSON report or a {{test_id: seconds}} object")
+    
+    @staticmethod
+    def _median_durations(reports):
+        """Median execution_time của từng test_id trong các report"""
+        samples = {}
+        for report in reports:
+            for result in report["test_results"]:
+                execution_time = result.get("execution_time")
+                # Kết quả lấy từ result cache không phản ánh thời gian chạy thật
+                if result.get("cached"):
+                    continue
+                if result.get("test_id") and isinstance(execution_time, (int, float)):
+                    samples.setdefault(result["test_id"], []).append(execution_time)
+        
+        durations = {}
+        for test_id, values in samples.items():
+            values.sort()
+            middle = len(values) // 2
+            durations[test_id] = values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+        return durations
+    
+    @staticmethod
+    def last_statuses(runs=TEST_HISTORY_RUNS, test_suite=None, history_dir=None):
+        """
+        Trạng thái lần chạy gần nhất của từng test
+        
+        Args:
+            runs: Số report gần nhất cần đọc (None = tất cả)
+            test_suite: Chỉ đọc report của suite này
+            history_dir: Thư mục report (mặc định TEST_HISTORY_DIR)
+        
+        Returns:
+            dict: test_id -> status (PASSED, FAILED, ERROR, ...)
+        """
+        statuses = {}
+        for report in TestHistory.load_reports(runs, test_suite, history_dir):
+            for result in report["test_results"]:
+                if result.get("test_id") and result.get("status"):
+                    statuses.setdefault(result["test_id"], result["status"])
+        return statuses
@@ -0,0 +1,148 @@
+"""
+Lập lịch chạy test dựa trên lịch sử: chia shard có tổng thời gian gần bằng nhau,
+sắp xếp test dài nhất trước hoặc test lỗi gần đây trước
+"""
+
+from config.settings import *
+from utils.test_history import TestHistory
+
+class TestScheduler:
+    """Lập lịch chạy test theo thời gian lịch sử (mọi shard tính cùng một kế hoạch)"""
+    
+    ORDERS = ("default", "lpt", "failures-first")
+    
+    @staticmethod
+    def parse_shard(value):
+        """
+        Parse giá trị --shard dạng "i/n" (i bắt đầu từ 1)
+        
+        Returns:
+            tuple: (index, count)
+        
+        Raises:
+            ValueError: Giá trị không hợp lệ
+        """
+        try:
+            index, count = (int(part) for part in value.split("/"))
+        except ValueError:
+            raise ValueError(f"Invalid shard '{value}', expected i/n (e.g. 1/3)")
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Invalid shard '{value}', index must be between 1 and {max(count, 1)}")
+        return index, count
+    
+    @staticmethod
+    def estimate(test_ids, durations=None, test_suite=None):
+        """
+        Thời gian ước tính cho từng test; test chưa có lịch sử lấy median của các test đã biết
+        
+        Args:
+            test_ids: List test_id
+            durations: Dict test_id -> seconds (mặc định đọc TestHistory)
+            test_suite: Suite dùng để lọc lịch sử khi không truyền durations
+        
+        Returns:
+            dict: test_id -> seconds
+        """
+        durations = TestHistory.durations(test_suite=test_suite) if durations is None else durations
+        known = sorted(durations[test_id] for test_id in test_ids if test_id in durations)
+        default = known[len(known) // 2] if known else SHARD_DEFAULT_DURATION
+        return {test_id: durations.get(test_id, default) for test_id in test_ids}
+    
+    @staticmethod
+    def plan_shards(items, count, key=lambda item: item["id"], durations=None):
+        """
+        Chia items thành `count` shard: test dài nhất trước, mỗi test vào shard đang nhẹ nhất
+        
+        Args:
+            items: List item cần chia
+            count: Số shard
+            key: Hàm lấy test_id của item
+            durations: Dict test_id -> seconds dùng chung cho mọi shard (--history). Không có thì
+                       chia theo vị trí (item thứ k vào shard k mod count): lịch sử local của mỗi
+                       CI node khác nhau nên không dùng để chia shard
+        
+        Returns:
+            list: Mỗi shard là dict {"items", "expected_seconds"}; items giữ thứ tự ban đầu
+        """
+        if durations is None:
+            shards = [{"items": list(items[index::count])} for index in range(count)]
+            for shard in shards:
+                shard["expected_seconds"] = float(len(shard["items"]) * SHARD_DEFAULT_DURATION)
+            return shards
+        
+        estimates = TestScheduler.estimate([key(item) for item in items], durations)
+        positions = {id(item): position for position, item in enumerate(items)}
+        shards = [{"items": [], "expected_seconds": 0.0} for _ in range(count)]
+        
+        # Sắp xếp ổn định theo (thời gian giảm dần, test_id) để mọi shard ra cùng kế hoạch
+        for item in sorted(items, key=lambda item: (-estimates[key(item)], key(item))):
+            lightest = min(shards, key=lambda shard: shard["expected_seconds"])
+            lightest["items"].append(item)
+            lightest["expected_seconds"] += estimates[key(item)]
+        
+        for shard in shards:
+            shard["items"].sort(key=lambda item: positions[id(item)])
+            shard["expected_seconds"] = round(shard["expected_seconds"], 2)
+        return shards
+    
+    @staticmethod
+    def select_shard(items, shard, key=lambda item: item["id"], durations=None):
+        """
+        Lấy phần việc của một shard
+        
+        Args:
+            items: List item cần chia
+            shard: Chuỗi "i/n"
+            key: Hàm lấy test_id của item
+            durations: Dict test_id -> seconds dùng chung cho mọi shard (xem plan_shards)
+        
+        Returns:
+            tuple: (items của shard i, danh sách expected_seconds của tất cả shard)
+        """
+        index, count = TestScheduler.parse_shard(shard)
+        shards = TestScheduler.plan_shards(items, count, key, durations)
+        return shards[index - 1]["items"], [plan["expected_seconds"] for plan in shards]
+    
+    @staticmethod
+    def order(items, mode, key=lambda item: item["id"], durations=None, test_suite=None):
+        """
+        Sắp xếp thứ tự chạy
+        
+        Args:
+            items: List item cần chạy
+            mode: "default" (giữ nguyên), "lpt" (dài nhất trước) hoặc
+                  "failures-first" (test FAILED/ERROR lần trước lên đầu, sau đó dài nhất trước)
+            key: Hàm lấy test_id của item
+            durations: Dict test_id -> seconds (mặc định đọc TestHistory)
+            test_suite: Suite dùng để lọc lịch sử
+        
+        Returns:
+            list: Items theo thứ tự mới
+        """
+        if mode not in TestScheduler.ORDERS:
+            raise ValueError(f"Unknown order '{mode}', expected one of {', '.join(TestScheduler.ORDERS)}")
+        if mode == "default":
+            return list(items)
+        
+        estimates = TestScheduler.estimate([key(item) for item in items], durations, test_suite)
+        failed = set()
+        if mode == "failures-first":
+            statuses = TestHistory.last_statuses(test_suite=test_suite)
+            failed = {test_id for test_id, status in statuses.items() if status in ("FAILED", "ERROR")}
+        return sorted(items, key=lambda item: (key(item) not in failed, -estimates[key(item)], key(item)))
+    
+    @staticmethod
+    def expected_makespan(items, workers=1, key=lambda item: item["id"], durations=None, test_suite=None):
+        """
+        Thời gian dự kiến để chạy xong items theo đúng thứ tự, mỗi item vào worker rảnh sớm nhất
+        (giống cách ThreadPoolExecutor nhận việc)
+        
+        Returns:
+            float: Makespan dự kiến (seconds)
+        """
+        estimates = TestScheduler.estimate([key(item) for item in items], durations, test_suite)
+        finish_times = [0.0] * max(workers, 1)
+        for item in items:
+            earliest = finish_times.index(min(finish_times))
+            finish_times[earliest] += estimates[key(item)]
+        return round(max(finish_times), 2)
@@ -0,0 +1,131 @@
+"""
+Wait policy tập trung: mọi timeout, polling và backoff đi qua đây
+Implicit wait bị tắt để không cộng dồn với explicit wait
+"""
+
+import logging
+import threading
+import time
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from config.settings import *
+from utils.run_metrics import RunMetrics
+from utils.deadline import Deadline
+
+class WaitPolicy:
+    """Chờ điều kiện với polling interval tăng dần và ghi nhận thời gian chờ"""
+    
+    IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+    
+    _local = threading.local()
+    
+    @staticmethod
+    def until(driver, condition, timeout=LOOKUP_TIMEOUT, description="condition", poll_interval=None):
+        """
+        Poll `condition(driver)` tới khi trả về giá trị truthy
+        
+        Args:
+            driver: WebDriver instance
+            condition: Callable nhận driver (ví dụ expected_conditions)
+            timeout: Timeout in seconds (bị giới hạn bởi deadline của test)
+            description: Mô tả điều kiện cho log/exception
+            poll_interval: Interval ban đầu (mặc định WAIT_POLL_INTERVAL)
+        
+        Returns:
+            Giá trị truthy đầu tiên của condition
+        
+        Raises:
+            TimeoutException: Hết timeout mà điều kiện chưa đạt
+        """
+        interval = poll_interval or WAIT_POLL_INTERVAL
+        requested = timeout
+        timeout = Deadline.clamp(timeout, description)
+        start_time = time.time()
+        end_time = start_time + timeout
+        outermost = not getattr(WaitPolicy._local, "waiting", False)
+        WaitPolicy._local.waiting = True
+        
+        try:
+            while True:
+                try:
+                    value = condition(driver)
+                    if value:
+                        return value
+                except WaitPolicy.IGNORED_EXCEPTIONS:
+                    pass
+                
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    if timeout < requested:
+                        Deadline.mark_expired(description)
+                        raise TimeoutException(f"Test deadline reached while waiting for {description}")
+                    raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+                time.sleep(min(interval, remaining))
+                interval = min(interval * WAIT_BACKOFF, WAIT_MAX_POLL_INTERVAL)
+        finally:
+            if outermost:
+                WaitPolicy._local.waiting = False
+                WaitPolicy._record(description, time.time() - start_time)
+    
+    @staticmethod
+    def poll(driver, condition, timeout=LOOKUP_TIMEOUT, description="condition", poll_interval=None):
+        """
+        Giống until() nhưng trả None thay vì raise khi hết timeout
+        
+        Returns:
+            Giá trị truthy của condition, hoặc None
+        """
+        try:
+            return WaitPolicy.until(driver, condition, timeout, description, poll_interval)
+        except TimeoutException:
+            logging.debug(f"Timed out after {timeout}s waiting for {description}")
+            return None
+    
+    @staticmethod
+    def sleep(seconds, reason):
+        """
+        Sleep cố định có chủ ý (không thay được bằng điều kiện), ghi vào sleep ledger
+        
+        Args:
+            seconds: Thời gian sleep
+            reason: Lý do, dùng làm key trong ledger
+        """
+        requested = seconds
+        seconds = Deadline.clamp(seconds, reason)
+        if seconds <= 0:
+            return
+        time.sleep(seconds)
+        Deadline.charge(reason, seconds)
+        if seconds < requested:
+            Deadline.mark_expired(reason)
+        RunMetrics.add("sleep_seconds", seconds)
+        metrics = RunMetrics.current()
+        if metrics is not None:
+            entry = metrics.setdefault("sleep_ledger", {}).setdefault(reason, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] = round(entry["seconds"] + seconds, 3)
+    
+    @staticmethod
+    def _record(description, elapsed):
+        Deadline.charge(description, elapsed)
+        RunMetrics.add("wait_seconds", elapsed)
+        RunMetrics.add("wait_count", 1)
+    
+    @staticmethod
+    def summarize(metrics, execution_time):
+        """
+        Chia thời gian test thành chờ đợi và thao tác
+        
+        Args:
+            metrics: Metrics của test (từ RunMetrics.end())
+            execution_time: Tổng thời gian test (giây)
+            
+        Returns:
+            dict: metrics với wait_seconds, sleep_seconds, act_seconds, wait_count
+        """
+        wait_seconds = metrics.get("wait_seconds", 0.0)
+        sleep_seconds = metrics.get("sleep_seconds", 0.0)
+        metrics["wait_seconds"] = round(wait_seconds, 2)
+        metrics["sleep_seconds"] = round(sleep_seconds, 2)
+        metrics["act_seconds"] = round(max(execution_time - wait_seconds - sleep_seconds, 0.0), 2)
+        metrics.setdefault("wait_count", 0)
+        return metrics